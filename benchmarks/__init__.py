@@ -0,0 +1,41 @@
+"""
+Repository benchmarks, run with ``manage.py run_benchmarks``.
+
+Every module holds one ``Benchmark``: a setup (data comes from
+``project.seeding``) and named cases, each one operation timed with
+``timeit``. Writes happen in a transaction that is rolled back.
+
+* ``api``: the CRUD viewset ``setup_crud_view`` generates (list, 304
+  revalidation, retrieve, create, partial update); pass a model with
+  ``updated_at`` as ``--model`` to measure the 304s;
+* ``serializers``: DRF serialization (``ModelSerializer`` against
+  ``ValuesSerializer``), validation and JSON rendering;
+* ``orm``: ``BulkWriteService`` paths against per-row ``save()``;
+* ``cache``: hit/miss latency of the default cache and ``cached``;
+* ``startup``: cold ``django.setup()``, full and lean.
+
+``--save`` stores the medians as JSON under ``BENCHMARK_RESULTS_DIR``,
+one file per commit; ``--baseline <commit or file>`` compares against
+such a file and fails when a case got slower than
+``BENCHMARK_THRESHOLD``. Compare runs from the same machine: results
+record the environment and the command warns when it differs.
+"""
+
+from typing import List
+
+from .api import CrudViewSetBenchmark
+from .base import Benchmark, Timing
+from .cache import CacheBenchmark
+from .orm import OrmBenchmark
+from .serializers import SerializerBenchmark
+from .startup import StartupBenchmark
+
+BENCHMARKS: List[type[Benchmark]] = [
+    CrudViewSetBenchmark,
+    SerializerBenchmark,
+    OrmBenchmark,
+    CacheBenchmark,
+    StartupBenchmark,
+]
+
+__all__ = ["BENCHMARKS", "Benchmark", "Timing"]
@@ -0,0 +1,240 @@
+import importlib
+import itertools
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from django.apps import apps
+from django.db import models
+from django.template.response import SimpleTemplateResponse
+from rest_framework.test import APIRequestFactory
+
+from custom_commands.management.commands.api_benchmark import (
+    BENCHMARK_RATE,
+)
+from custom_commands.management.commands.setup_crud_view import (
+    Command as CrudGenerator,
+)
+from project.seeding import Seeder
+from project.seeding.factories import (
+    has_relation_constraints,
+    seeded_fields,
+    unique_fields,
+    unique_value,
+)
+from project.testing import field_value
+
+from .base import Benchmark, Operation
+
+# Package the generated modules are imported from.
+PACKAGE: str = "benchmark_crud"
+# Unique values of created rows start here, far from the seeded ones.
+CREATED: int = 10**9
+
+
+def generate_viewset(model: type[models.Model], directory: Path) -> Any:
+    """
+    Write the serializers and viewset ``setup_crud_view`` generates for
+    ``model`` into a package in ``directory`` and import the viewset.
+    """
+    generator = CrudGenerator()
+    plan: Dict[str, Any] = generator.introspect(model, None)
+    resource: str = model._meta.model_name
+    class_name: str = model.__name__
+    options: Dict[str, Any] = {
+        "page_size": 50,
+        "cache_timeout": 0,
+        "use_async": False,
+    }
+    serializers: str = generator.serializer_content(
+        class_name, model.__name__, model.__module__, plan
+    )
+    views: str = generator.view_content(
+        f"{resource}_view",
+        resource,
+        class_name,
+        model.__name__,
+        model.__module__,
+        model._meta.label_lower,
+        plan,
+        options,
+    )
+    files: Dict[str, str] = {
+        "__init__.py": "",
+        "serializers/__init__.py": "",
+        f"serializers/{resource}_serializer.py": serializers,
+        "views/__init__.py": "",
+        f"views/{resource}_view.py": views,
+    }
+    for name, content in files.items():
+        path: Path = directory / PACKAGE / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    module = importlib.import_module(f"{PACKAGE}.views.{resource}_view")
+    return getattr(module, f"{class_name}ViewSet")
+
+
+def related_sets(model: type[models.Model]) -> List[models.Field]:
+    """Required many-to-many fields, which a create has to send."""
+    return [
+        field
+        for field in model._meta.many_to_many
+        if not field.blank and field.remote_field.through._meta.auto_created
+    ]
+
+
+def fixture_counts(
+    model: type[models.Model], rows: int
+) -> Dict[type[models.Model], int]:
+    """
+    ``model`` plus, recursively, the models its required keys and
+    many-to-many fields need.
+    """
+    counts: Dict[type[models.Model], int] = {model: rows}
+    pending = [model]
+    while pending:
+        current: type[models.Model] = pending.pop()
+        for field in [*seeded_fields(current), *related_sets(current)]:
+            related: Optional[type[models.Model]] = field.related_model
+            if field.is_relation and not field.null and related not in counts:
+                counts[related] = max(1, rows // 10)
+                pending.append(related)
+    return counts
+
+
+class CrudViewSetBenchmark(Benchmark):
+    """
+    Requests against the viewset ``setup_crud_view`` generates for
+    ``--model`` (auth.Group by default), called directly with
+    APIRequestFactory: no middleware or URL routing, only the view,
+    its queries and rendering. Models without the viewset's
+    ``last_modified_field`` (``updated_at``; auth.Group has none) skip
+    ``list_not_modified``: the viewset sends no ETag. Models whose unique
+    constraints involve their relations skip ``create``: every new row
+    would need new related rows.
+    """
+
+    name = "api"
+
+    def setup(self) -> None:
+        self.model: type[models.Model] = apps.get_model(
+            self.options["model"]
+        )
+        Seeder(
+            fixture_counts(self.model, self.scaled(10_000)),
+            values="placeholder",
+            seed=1,
+        ).run_all()
+        self.directory = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.directory.name)
+        viewset = generate_viewset(self.model, Path(self.directory.name))
+        self.last_modified_field: str = viewset.last_modified_field
+        # The throttles' bookkeeping is part of every request; their
+        # limits would end the run.
+        viewset.throttle_classes = [
+            type(throttle.__name__, (throttle,), {"rate": BENCHMARK_RATE})
+            for throttle in viewset.throttle_classes
+        ]
+        self.list_view = viewset.as_view({"get": "list", "post": "create"})
+        self.detail_view = viewset.as_view(
+            {"get": "retrieve", "patch": "partial_update"}
+        )
+        self.factory = APIRequestFactory()
+        self.numbers: Iterator[int] = itertools.count(CREATED)
+        self.pk: Any = (
+            self.model._base_manager.order_by("pk")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        response = self.request(self.list_view, self.factory.get("/"))
+        self.etag: Optional[str] = response.get("ETag")
+        self.unique: Set[str] = unique_fields(self.model)
+        # Relations a new or updated row cannot share with existing rows.
+        self.fixed: Set[str] = {
+            field.name
+            for field in seeded_fields(self.model)
+            if field.is_relation
+            and (field.unique or has_relation_constraints(self.model))
+        }
+        self.related: Dict[str, Any] = {
+            field.name: field.related_model._base_manager.values_list(
+                "pk", flat=True
+            ).first()
+            for field in [
+                *seeded_fields(self.model),
+                *related_sets(self.model),
+            ]
+            if field.is_relation
+        }
+
+    def payload(self) -> Dict[str, Any]:
+        """Create/update data: new unique values, existing related rows."""
+        number: int = next(self.numbers)
+        data: Dict[str, Any] = {}
+        for field in seeded_fields(self.model):
+            if field.name in self.fixed:
+                continue
+            if field.is_relation:
+                data[field.name] = self.related[field.name]
+            elif field.name in self.unique or field.primary_key:
+                data[field.name] = unique_value(field, number)
+            else:
+                data[field.name] = field_value(field, number)
+        for field in related_sets(self.model):
+            data[field.name] = [self.related[field.name]]
+        return data
+
+    def request(self, view: Any, request: Any, **kwargs: Any) -> Any:
+        response = view(request, **kwargs)
+        if isinstance(response, SimpleTemplateResponse):
+            response.render()
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{request.method} {request.path} returned "
+                f"{response.status_code}: {response.content[:200]!r}"
+            )
+        return response
+
+    def cases(self) -> Dict[str, Operation]:
+        get = self.factory.get
+        cases: Dict[str, Operation] = {
+            "list": lambda: self.request(self.list_view, get("/")),
+        }
+        if self.etag:
+            # Revalidation: ConditionalGetMixin answers 304 from the ETag.
+            # Timed before any write changes it.
+            cases["list_not_modified"] = lambda: self.request(
+                self.list_view, get("/", HTTP_IF_NONE_MATCH=self.etag)
+            )
+        else:
+            self.skipped["list_not_modified"] = (
+                f"{self.model._meta.label} has no {self.last_modified_field} "
+                "field, so the viewset sends no ETag"
+            )
+        cases["retrieve"] = lambda: self.request(
+            self.detail_view, get("/"), pk=self.pk
+        )
+        if not self.fixed:
+            cases["create"] = lambda: self.request(
+                self.list_view,
+                self.factory.post("/", self.payload(), format="json"),
+            )
+        else:
+            self.skipped["create"] = (
+                "unique constraints involve "
+                f"{', '.join(sorted(self.fixed))}"
+            )
+        cases["partial_update"] = lambda: self.request(
+            self.detail_view,
+            self.factory.patch("/", self.payload(), format="json"),
+            pk=self.pk,
+        )
+        return cases
+
+    def teardown(self) -> None:
+        sys.path.remove(self.directory.name)
+        for name in list(sys.modules):
+            if name == PACKAGE or name.startswith(f"{PACKAGE}."):
+                del sys.modules[name]
+        self.directory.cleanup()
@@ -0,0 +1,87 @@
+import statistics
+import timeit
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, Iterator, Tuple
+
+from django.db import transaction
+
+Operation = Callable[[], Any]
+
+
+@dataclass
+class Timing:
+    """Seconds per operation over ``rounds`` rounds of ``number`` calls."""
+
+    median: float
+    best: float
+    number: int
+    rounds: int
+
+    @property
+    def per_second(self) -> float:
+        return 1 / self.median if self.median else 0.0
+
+
+class Benchmark:
+    """
+    A group of timed cases sharing one setup.
+
+    ``cases()`` maps case names to callables doing one operation each; the
+    runner times them with ``time()``. With ``atomic`` (the default),
+    ``setup()`` and every case run in one transaction that is rolled back,
+    so benchmarks can write to the development database. Subclasses set
+    ``name`` and read what they need from ``options`` (the command's).
+    Cases a setup cannot run go in ``skipped`` with the reason, which the
+    command reports.
+    """
+
+    name: str = ""
+    atomic: bool = True
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options: Dict[str, Any] = options
+        self.skipped: Dict[str, str] = {}
+
+    def scaled(self, count: int) -> int:
+        """``count`` multiplied by ``--scale``, at least 1."""
+        return max(1, int(count * self.options["scale"]))
+
+    def setup(self) -> None:
+        pass
+
+    def cases(self) -> Dict[str, Operation]:
+        raise NotImplementedError
+
+    def teardown(self) -> None:
+        pass
+
+    def time(self, operation: Operation, rounds: int) -> Timing:
+        # autorange picks a call count that takes at least 0.2 s, so fast
+        # operations are not lost in timer resolution.
+        timer = timeit.Timer(operation)
+        number, _ = timer.autorange()
+        samples = [
+            elapsed / number
+            for elapsed in timer.repeat(repeat=rounds, number=number)
+        ]
+        return Timing(statistics.median(samples), min(samples), number, rounds)
+
+    def transaction(self) -> ContextManager[Any]:
+        return transaction.atomic() if self.atomic else nullcontext()
+
+    def run(
+        self, rounds: int, selected: Callable[[str], bool]
+    ) -> Iterator[Tuple[str, Timing]]:
+        """Time every selected case; yields ``(name.case, timing)``."""
+        with self.transaction():
+            self.setup()
+            try:
+                for case, operation in self.cases().items():
+                    name: str = f"{self.name}.{case}"
+                    if selected(name):
+                        yield name, self.time(operation, rounds)
+            finally:
+                self.teardown()
+                if self.atomic:
+                    transaction.set_rollback(True)
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List
+
+from django.core.cache import caches
+
+from project.cache import cached
+
+from .base import Benchmark, Operation
+
+NAMESPACE: str = "benchmarks"
+
+
+class CacheBenchmark(Benchmark):
+    """
+    Hit and miss latency of the default cache (Redis, or the local-memory
+    fallback without REDIS_URL) and of the ``project.cache.cached``
+    wrapper, for a value the size of a rendered list page.
+    """
+
+    name = "cache"
+    atomic = False
+
+    def setup(self) -> None:
+        self.cache = caches["default"]
+        self.value: List[Dict[str, Any]] = [
+            {"id": number, "name": f"row {number}", "active": True}
+            for number in range(50)
+        ]
+        self.keys: List[str] = [f"{NAMESPACE}:key:{n}" for n in range(100)]
+        self.cache.set_many(dict.fromkeys(self.keys, self.value), 300)
+
+        @cached(NAMESPACE, timeout=300)
+        def page(number: int) -> List[Dict[str, Any]]:
+            return self.value
+
+        page(1)
+        self.page = page
+
+    def cases(self) -> Dict[str, Operation]:
+        return {
+            "get_hit": lambda: self.cache.get(self.keys[0]),
+            "get_miss": lambda: self.cache.get(f"{NAMESPACE}:missing"),
+            "set": lambda: self.cache.set(self.keys[1], self.value, 300),
+            "get_many_hit_100": lambda: self.cache.get_many(self.keys),
+            "cached_hit": lambda: self.page(1),
+        }
+
+    def teardown(self) -> None:
+        self.cache.delete_many(self.keys)
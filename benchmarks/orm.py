@@ -0,0 +1,67 @@
+import itertools
+from typing import Dict, Iterator, List
+
+from django.contrib.auth.models import Group
+
+from project.seeding import Seeder
+from project.services import BulkWriteService
+
+from .base import Benchmark, Operation
+
+BATCH: int = 1000
+
+
+class GroupBulkService(BulkWriteService):
+    model = Group
+    unique_fields = ["name"]
+    update_fields = ["name"]
+
+
+class OrmBenchmark(Benchmark):
+    """
+    Write paths of ``BulkWriteService`` against one ``save()`` per row,
+    and reading a seeded table, on auth.Group.
+    """
+
+    name = "orm"
+
+    def setup(self) -> None:
+        self.rows: int = self.scaled(10_000)
+        Seeder(
+            {Group: self.rows}, values="placeholder", m2m=0, seed=1
+        ).run_all()
+        self.service = GroupBulkService(batch_size=BATCH)
+        self.numbers: Iterator[int] = itertools.count()
+        self.batch: List[Group] = list(
+            Group.objects.order_by("pk")[:BATCH]
+        )
+        self.names: List[str] = [group.name for group in self.batch]
+
+    def groups(self) -> Iterator[Group]:
+        start: int = next(self.numbers) * BATCH
+        return (
+            Group(name=f"orm-benchmark-{number}")
+            for number in range(start, start + BATCH)
+        )
+
+    def save_one(self) -> None:
+        Group(name=f"orm-benchmark-save-{next(self.numbers)}").save()
+
+    def cases(self) -> Dict[str, Operation]:
+        return {
+            "save_row": self.save_one,
+            "bulk_create_1000": lambda: self.service.create(self.groups()),
+            # Existing names: every row takes the ON CONFLICT path.
+            "upsert_1000": lambda: self.service.upsert(
+                Group(name=name) for name in self.names
+            ),
+            "bulk_update_1000": lambda: self.service.update(
+                self.batch, ["name"]
+            ),
+            "read_values_10000": lambda: list(
+                Group.objects.values_list("pk", "name")[:10_000]
+            ),
+            "read_instances_10000": lambda: list(
+                Group.objects.all()[:10_000]
+            ),
+        }
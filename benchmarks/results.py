@@ -0,0 +1,135 @@
+import json
+import os
+import platform
+import subprocess
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from .base import Timing
+
+# Differences here make a comparison unreliable, not wrong.
+ENVIRONMENT_KEYS: tuple = ("python", "django", "machine", "cpus", "database")
+
+
+def git(*args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def environment() -> Dict[str, Any]:
+    """Where the results come from: commit, interpreter, machine, backends."""
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        # Uncommitted changes: the results do not belong to the commit.
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "database": connection.vendor,
+        "cache": type(caches["default"]).__name__,
+    }
+
+
+def to_json(timings: Dict[str, Timing]) -> Dict[str, Any]:
+    return {
+        **environment(),
+        "results": {name: asdict(timing) for name, timing in timings.items()},
+    }
+
+
+def results_path(ref: str) -> Path:
+    """
+    A results file: ``ref`` itself if it is a path, else the file saved
+    for the commit ``ref`` names (``HEAD~1``, a branch, a hash).
+    """
+    if ref.endswith(".json"):
+        return Path(ref)
+    commit: Optional[str] = git("rev-parse", "--verify", f"{ref}^{{commit}}")
+    if commit is None:
+        raise ValueError(f"'{ref}' is neither a results file nor a commit.")
+    return Path(settings.BENCHMARK_RESULTS_DIR) / f"{commit}.json"
+
+
+def save(data: Dict[str, Any]) -> Path:
+    if data["commit"] is None:
+        raise ValueError("Not a git checkout: pass --baseline with a path.")
+    directory = Path(settings.BENCHMARK_RESULTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path: Path = directory / f"{data['commit']}.json"
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def load(ref: str) -> Dict[str, Any]:
+    path: Path = results_path(ref)
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        raise ValueError(
+            f"No results in {path}: run the benchmarks with --save on "
+            f"{ref} first."
+        ) from None
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot read the results in {path}: {e}") from None
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Relative change of the time per operation; > 0 is slower."""
+        return self.current / self.baseline - 1
+
+    @property
+    def regressed(self) -> bool:
+        return self.change > self.threshold
+
+
+def compare(
+    baseline: Dict[str, Any],
+    timings: Dict[str, Timing],
+    threshold: float,
+) -> List[Comparison]:
+    """Medians of the cases measured in both runs."""
+    return [
+        Comparison(
+            name,
+            baseline["results"][name]["median"],
+            timing.median,
+            threshold,
+        )
+        for name, timing in timings.items()
+        if name in baseline["results"]
+    ]
+
+
+def mismatches(baseline: Dict[str, Any]) -> List[str]:
+    """Environment keys that differ between ``baseline`` and this run."""
+    current: Dict[str, Any] = environment()
+    return [
+        key
+        for key in ENVIRONMENT_KEYS
+        if baseline.get(key) != current.get(key)
+    ]
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List
+
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from project.api.renderers import ORJSONRenderer
+from project.api.serializers import ValuesSerializer
+from project.seeding import Seeder
+
+from .base import Benchmark, Operation
+
+PAGE: int = 50
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = [
+            "id",
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "is_active",
+            "date_joined",
+        ]
+
+
+class UserValuesSerializer(ValuesSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = UserSerializer.Meta.fields
+
+
+class SerializerBenchmark(Benchmark):
+    """
+    DRF serialization of a list page and of one row, validation of a
+    create payload, and rendering the page with the stock and the
+    project's JSON renderer. Pages are ``PAGE`` rows: rows per second
+    are ``PAGE`` times the operations per second. ``ValuesSerializer``
+    is compared with ``ModelSerializer`` on loaded rows (``*_page``)
+    and including the query that loads them (``*_query_page``).
+    """
+
+    name = "serializers"
+
+    def setup(self) -> None:
+        user_model = get_user_model()
+        Seeder(
+            {user_model: self.scaled(PAGE * 20)}, m2m=0, seed=1
+        ).run_all()
+        self.queryset: Any = user_model.objects.order_by("pk")
+        self.users: List[Any] = list(self.queryset[:PAGE])
+        self.columns: List[str] = UserValuesSerializer.columns()
+        self.rows: List[Dict[str, Any]] = list(
+            self.queryset.values(*self.columns)[:PAGE]
+        )
+        self.tuples: List[Any] = list(
+            self.queryset.values_list(*self.columns)[:PAGE]
+        )
+        self.page: List[Dict[str, Any]] = UserSerializer(
+            self.users, many=True
+        ).data
+        self.payload: Dict[str, Any] = {
+            "username": "serializer-benchmark",
+            "email": "serializer-benchmark@example.com",
+            "first_name": "Serializer",
+            "last_name": "Benchmark",
+        }
+
+    def cases(self) -> Dict[str, Operation]:
+        return {
+            "model_serializer_page": lambda: UserSerializer(
+                self.users, many=True
+            ).data,
+            "model_serializer_row": lambda: UserSerializer(self.users[0]).data,
+            "values_serializer_page": lambda: UserValuesSerializer(
+                self.rows, many=True
+            ).data,
+            "values_tuples_page": lambda: UserValuesSerializer(
+                self.tuples, many=True
+            ).data,
+            "model_query_page": lambda: UserSerializer(
+                self.queryset[:PAGE], many=True
+            ).data,
+            "values_query_page": lambda: UserValuesSerializer(
+                self.queryset.values(*self.columns)[:PAGE], many=True
+            ).data,
+            # Includes the uniqueness query for username.
+            "validate_create": lambda: UserSerializer(
+                data=self.payload
+            ).is_valid(raise_exception=True),
+            "render_json_page": lambda: JSONRenderer().render(self.page),
+            "render_orjson_page": lambda: ORJSONRenderer().render(self.page),
+        }
@@ -0,0 +1,57 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from django.conf import settings
+
+from custom_commands.management.commands.settings_benchmark import (
+    PLACEHOLDERS,
+    SETUP_SCRIPT,
+)
+
+from .base import Benchmark, Operation, Timing
+
+
+class StartupBenchmark(Benchmark):
+    """
+    Cold ``django.setup()`` of the active settings, in a fresh interpreter
+    per sample, with and without lean startup (see
+    project/settings/startup.py). Only setup itself is timed, not the
+    interpreter's start.
+    """
+
+    name = "startup"
+    atomic = False
+
+    def setup_seconds(self, lean: bool) -> float:
+        env: Dict[str, str] = {**PLACEHOLDERS, **os.environ}
+        env["DJANGO_SETTINGS_MODULE"] = os.environ["DJANGO_SETTINGS_MODULE"]
+        env["DJANGO_LEAN_STARTUP"] = "1" if lean else "0"
+        result = subprocess.run(
+            [sys.executable, "-c", SETUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        sample: Dict[str, Any] = json.loads(
+            result.stdout.strip().splitlines()[-1]
+        )
+        return sample["setup_ms"] / 1000
+
+    def cases(self) -> Dict[str, Operation]:
+        return {
+            "django_setup": lambda: self.setup_seconds(lean=False),
+            "django_setup_lean": lambda: self.setup_seconds(lean=True),
+        }
+
+    def time(self, operation: Operation, rounds: int) -> Timing:
+        # Each call is one process measuring itself; timeit would add the
+        # interpreter's start to every sample.
+        samples: List[float] = [operation() for _ in range(rounds)]
+        return Timing(statistics.median(samples), min(samples), 1, rounds)
@@ -0,0 +1,2 @@
+# Fails tests whose query count regressed; see the plugin's docstring.
+pytest_plugins = ["project.instrumentation.pytest_plugin"]
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+
+class NoChecksCommand(BaseCommand):
+    """
+    Base for commands that never serve a request: generators, benchmarks
+    and reports. The system checks import the URLconf and dominate their
+    startup time, so they are skipped.
+    """
+
+    requires_system_checks = []
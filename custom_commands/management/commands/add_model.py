@@ -1,36 +1,109 @@
+import hashlib
 import os
-from django.core.management.base import BaseCommand
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from custom_commands.management.base import NoChecksCommand
 from django.apps import apps
-from typing import Any, List
+from typing import Any, List, Optional
 
+# "title:CharField(max_length=200)"
+FIELD_PATTERN = re.compile(
+    r"^(?P<name>[a-z_][a-z0-9_]*):(?P<definition>[A-Za-z]+\(.*\))$"
+)
 
-class Command(BaseCommand):
+
+def index_name(table_name: str, fields: List[str], condition: str = "") -> str:
+    """
+    Build a deterministic index name within Django's 30 character limit,
+    following the same table/column/hash layout Django uses.
+    """
+    digest: str = hashlib.md5(
+        f"{table_name}:{','.join(fields)}:{condition}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()[:6]
+    column: str = fields[0].lstrip("-")[:7]
+    return f"{table_name[:11]}_{column}_{digest}_idx".lstrip("_0123456789")
+
+
+def parse_fields(value: str) -> List[str]:
+    return [field.strip() for field in value.split(",") if field.strip()]
+
+
+class Command(NoChecksCommand):
     help: str = "Adds a model to the given app"
 
-    def handle(self, *args: Any, **kwargs: Any) -> None:
-        # Get inputs from the user
-        model_name: str = input("Enter Model Name: ").strip()
-        app_name: str = input("Enter App Name: ").strip()
-        table_name: str = input("Enter Table Name: ").strip()
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("app_name", type=str, help="App to add the model to.")
+        parser.add_argument("model_name", type=str, help="Model class name.")
+        parser.add_argument(
+            "--table-name",
+            type=str,
+            default=None,
+            help="Database table name. Defaults to '<app_name>_<modelname>'.",
+        )
+        parser.add_argument(
+            "--field",
+            action="append",
+            default=[],
+            metavar="NAME:FIELD(...)",
+            help="Extra field, e.g. 'title:CharField(max_length=200)'. "
+            "Repeatable.",
+        )
+        parser.add_argument(
+            "--index",
+            action="append",
+            default=[],
+            metavar="FIELDS",
+            help="Composite index as comma separated fields, '-' for "
+            "descending, e.g. --index=status,-created_at. Repeatable.",
+        )
+        parser.add_argument(
+            "--partial-index",
+            action="append",
+            default=[],
+            metavar="FIELDS:CONDITION",
+            help="Partial index as fields and Q() keyword arguments, e.g. "
+            "--partial-index=-created_at:is_active=True. Repeatable.",
+        )
+        parser.add_argument(
+            "--no-migration",
+            action="store_true",
+            help="Do not run makemigrations for the app.",
+        )
+        parser.add_argument(
+            "--no-service",
+            action="store_true",
+            help="Do not add a <Model>BulkService to the app's services.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        model_name: str = options["model_name"].strip()
+        app_name: str = options["app_name"].strip()
 
-        # Check if the required parameters are missing
-        if not model_name or not app_name or not table_name:
+        if not model_name.isidentifier() or not model_name[0].isupper():
             self.stdout.write(
                 self.style.ERROR(
-                    "'model_name', 'app_name', and 'table_name' are required."
+                    "Model name must be a valid class name, e.g. 'Article'."
                 )
             )
             return
 
         # Check if the app exists in the project
         try:
-            apps.get_app_config(app_name)
+            app_config = apps.get_app_config(app_name)
         except LookupError:
             self.stdout.write(self.style.ERROR(f"App '{app_name}' not found."))
             return
 
+        table_name: str = (
+            options["table_name"] or f"{app_name}_{model_name.lower()}"
+        ).strip()
+
         # Path to the models.py file
-        model_file_path: str = os.path.join(app_name, "models.py")
+        model_file_path: str = os.path.join(app_config.path, "models.py")
 
         # Check if models.py exists
         if not os.path.exists(model_file_path):
@@ -41,7 +114,7 @@ class Command(BaseCommand):
             )
             return
 
-        # Read the models.py file and check for the import
+        # Read the models.py file
         try:
             with open(model_file_path, "r") as file:
                 lines: List[str] = file.readlines()
@@ -51,34 +124,62 @@ class Command(BaseCommand):
             )
             return
 
-        # Check if the 'from django.utils.timezone import now' is already present
-        import_statement: str = "from django.utils.timezone import now"
+        if any(line.startswith(f"class {model_name}(") for line in lines):
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Model '{model_name}' already exists in {model_file_path}."
+                )
+            )
+            return
+
+        # Make sure 'from django.db import models' is present
+        import_statement: str = "from django.db import models"
         if not any(line.strip() == import_statement for line in lines):
-            # Add the import at the beginning of the file
             lines.insert(0, f"{import_statement}\n")
 
-        # Content to be added to models.py
+        field_lines: List[str] = []
+        field_names: List[str] = ["created_at", "updated_at"]
+        for spec in options["field"]:
+            match = FIELD_PATTERN.match(spec.strip())
+            if not match:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"Invalid field '{spec}'. Use NAME:FieldType(...)."
+                    )
+                )
+                return
+            field_names.append(match["name"])
+            field_lines.append(
+                f"    {match['name']} = models.{match['definition']}\n"
+            )
+
+        indexes: Optional[List[str]] = self.build_indexes(
+            table_name, field_names, options
+        )
+        if indexes is None:
+            return
+
+        # Content to be added to models.py. auto_now keeps updated_at
+        # current on save() without a custom save hook, and the descending
+        # created_at index serves the default ordering without a sort.
         model_content: str = f"""
+
 class {model_name}(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+{"".join(field_lines)}    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        self.updated_at = now()  # Automatically update the field
-        super().save(*args, **kwargs)
-
     class Meta:
         db_table = "{table_name}"
-        ordering = ['-created_at']
+        ordering = ["-created_at"]
+        indexes = [
+{"".join(indexes)}        ]
 """
 
         # Append the new model content to the file
         try:
             with open(model_file_path, "w") as file:
-                file.writelines(
-                    lines
-                )  # Write the lines back, including the import
-                file.write(model_content)  # Add the new model at the end
+                file.writelines(lines)
+                file.write(model_content)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Model '{model_name}' added successfully to {model_file_path}."
@@ -88,3 +189,131 @@ class {model_name}(models.Model):
             self.stdout.write(
                 self.style.ERROR(f"Error adding model: {str(e)}")
             )
+            return
+
+        if not options["no_service"]:
+            self.add_service(app_config.path, model_name)
+
+        if not options["no_migration"]:
+            self.make_migration(app_name, model_name)
+
+    def add_service(self, app_path: str, model_name: str) -> None:
+        """Append a ``<Model>BulkService`` to the app's services package."""
+        services_path: str = os.path.join(app_path, "services", "__init__.py")
+        if not os.path.exists(services_path):
+            return
+        with open(services_path, "r") as file:
+            lines: List[str] = file.readlines()
+        base_import: str = "from project.services import BulkWriteService"
+        # The startapp template imports it unused until the first service.
+        lines = [
+            f"{base_import}\n" if line.startswith(base_import) else line
+            for line in lines
+        ]
+        if f"{base_import}\n" not in lines:
+            lines.insert(0, f"{base_import}\n")
+        models_import: str = "from ..models import "
+        for index, line in enumerate(lines):
+            if line.startswith(models_import):
+                names: List[str] = sorted(
+                    {*parse_fields(line[len(models_import) :]), model_name}
+                )
+                lines[index] = f"{models_import}{', '.join(names)}\n"
+                break
+        else:
+            lines.insert(
+                lines.index(f"{base_import}\n") + 1,
+                f"\n{models_import}{model_name}\n",
+            )
+        with open(services_path, "w") as file:
+            file.writelines(lines)
+            file.write(
+                f"""
+
+class {model_name}BulkService(BulkWriteService):
+    model = {model_name}
+"""
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Service '{model_name}BulkService' added to {services_path}."
+            )
+        )
+
+    def build_indexes(
+        self, table_name: str, field_names: List[str], options: Any
+    ) -> Optional[List[str]]:
+        """Render Meta.indexes entries; None if a flag is invalid."""
+        specs: List[tuple] = [(["-created_at"], "")]
+        specs += [(parse_fields(value), "") for value in options["index"]]
+        for value in options["partial_index"]:
+            fields, _, condition = value.partition(":")
+            if not condition.strip():
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"Partial index '{value}' needs a condition, "
+                        "e.g. -created_at:is_active=True."
+                    )
+                )
+                return None
+            specs.append((parse_fields(fields), condition.strip()))
+
+        indexes: List[str] = []
+        for fields, condition in specs:
+            unknown: List[str] = [
+                field for field in fields if field.lstrip("-") not in field_names
+            ]
+            if not fields or unknown:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"Invalid index fields {fields}; known fields are "
+                        f"{', '.join(field_names)}."
+                    )
+                )
+                return None
+            rendered_fields: str = ", ".join(f'"{field}"' for field in fields)
+            name: str = index_name(table_name, fields, condition)
+            if condition:
+                indexes.append(
+                    f"            models.Index(\n"
+                    f"                fields=[{rendered_fields}],\n"
+                    f'                name="{name}",\n'
+                    f"                condition=models.Q({condition}),\n"
+                    f"            ),\n"
+                )
+            else:
+                indexes.append(
+                    f"            models.Index(\n"
+                    f"                fields=[{rendered_fields}],\n"
+                    f'                name="{name}",\n'
+                    f"            ),\n"
+                )
+        return indexes
+
+    def make_migration(self, app_name: str, model_name: str) -> None:
+        # The new model is not importable in this process (models.py was
+        # already loaded), so makemigrations runs in a fresh one.
+        manage_py: Path = (
+            Path(__file__).resolve().parent.parent.parent.parent / "manage.py"
+        )
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(manage_py),
+                "makemigrations",
+                app_name,
+                "--name",
+                f"add_{model_name.lower()}",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            self.stdout.write(result.stdout)
+            self.stdout.write(self.style.SUCCESS("Migration created."))
+        else:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"makemigrations failed, run it manually:\n{result.stderr}"
+                )
+            )
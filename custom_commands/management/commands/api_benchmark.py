@@ -0,0 +1,185 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from argparse import ArgumentParser
+from rest_framework import serializers
+from rest_framework.pagination import Cursor, LimitOffsetPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+from project.api.pagination import KeysetCursorPagination
+from project.api.renderers import ORJSONRenderer
+from project.api.throttling import CacheUserRateThrottle
+
+# High enough that neither throttle rejects requests during the run; the
+# point is to measure the bookkeeping cost.
+BENCHMARK_RATE: str = "100000000/day"
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Seeds a large user table (rolled back afterwards) and compares "
+        "list throughput of DRF's stock defaults with the project defaults."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Rows to seed.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per scenario.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=50,
+            help="Items per page.",
+        )
+
+    def build_views(self, size: int) -> Dict[str, Any]:
+        user_model = get_user_model()
+
+        class UserSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = user_model
+                fields = [
+                    "id",
+                    "username",
+                    "email",
+                    "first_name",
+                    "last_name",
+                    "is_active",
+                    "date_joined",
+                ]
+
+        class StockThrottle(UserRateThrottle):
+            rate = BENCHMARK_RATE
+
+        class ProjectThrottle(CacheUserRateThrottle):
+            rate = BENCHMARK_RATE
+
+        class StockPagination(LimitOffsetPagination):
+            default_limit = size
+
+        class ProjectPagination(KeysetCursorPagination):
+            page_size = size
+
+        common: Dict[str, Any] = {
+            "queryset": user_model.objects.order_by("-pk"),
+            "serializer_class": UserSerializer,
+            "authentication_classes": [],
+            "permission_classes": [],
+        }
+        stock = type(
+            "StockViewSet",
+            (ReadOnlyModelViewSet,),
+            {
+                **common,
+                "pagination_class": StockPagination,
+                "renderer_classes": [JSONRenderer],
+                "throttle_classes": [StockThrottle],
+            },
+        )
+        project = type(
+            "ProjectViewSet",
+            (ReadOnlyModelViewSet,),
+            {
+                **common,
+                "pagination_class": ProjectPagination,
+                "renderer_classes": [ORJSONRenderer],
+                "throttle_classes": [ProjectThrottle],
+            },
+        )
+        return {
+            "stock": stock.as_view({"get": "list"}),
+            "project": project.as_view({"get": "list"}),
+            "paginator": ProjectPagination,
+        }
+
+    def seed(self, rows: int) -> Tuple[int, int]:
+        model = get_user_model()
+        batch: List[Any] = []
+        for number in range(rows):
+            batch.append(
+                model(
+                    username=f"benchmark-{number}",
+                    email=f"benchmark-{number}@example.com",
+                    first_name="Bench",
+                    last_name=f"User {number}",
+                )
+            )
+            if len(batch) == 5000:
+                model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+        ids = model.objects.filter(username__startswith="benchmark-")
+        return (
+            ids.order_by("pk").values_list("pk", flat=True).first(),
+            ids.count(),
+        )
+
+    def measure(self, view: Any, path: str, requests: int) -> float:
+        factory = APIRequestFactory()
+        started: float = perf_counter()
+        for _ in range(requests):
+            response = view(factory.get(path))
+            response.render()
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+        return requests / (perf_counter() - started)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        page_size: int = options["page_size"]
+        views: Dict[str, Any] = self.build_views(page_size)
+
+        # APIRequestFactory requests come from "testserver".
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+            self.stdout.write(f"Seeding {options['rows']} rows...")
+            first_pk, total = self.seed(options["rows"])
+
+            # A page near the end of the table: an OFFSET for the stock
+            # paginator, a cursor positioned at the same rows for keyset.
+            deep_offset: int = max(total - page_size * 2, 0)
+            paginator = views["paginator"]()
+            paginator.base_url = "/"
+            deep_cursor: str = paginator.encode_cursor(
+                Cursor(
+                    offset=0, reverse=False, position=first_pk + page_size * 2
+                )
+            )
+
+            scenarios: List[Tuple[str, str, str]] = [
+                ("first page", "/", "/"),
+                ("deep page", f"/?offset={deep_offset}", deep_cursor),
+            ]
+            self.stdout.write(
+                f"{'scenario':<12}{'stock req/s':>14}{'project req/s':>16}"
+                f"{'speedup':>10}"
+            )
+            for label, stock_path, project_path in scenarios:
+                stock: float = self.measure(
+                    views["stock"], stock_path, options["requests"]
+                )
+                project: float = self.measure(
+                    views["project"], project_path, options["requests"]
+                )
+                self.stdout.write(
+                    f"{label:<12}{stock:>14.0f}{project:>16.0f}"
+                    f"{project / stock:>9.2f}x"
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
@@ -0,0 +1,312 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from django.test.utils import override_settings
+from django.urls import path
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+
+from project import http
+from project.http import StubResponse, StubServer
+
+MODES: Dict[str, str] = {
+    "wsgi-sync": "WSGI, sync view",
+    "asgi-sync": "ASGI, sync view",
+    "asgi-async": "ASGI, async view",
+}
+
+SILK_MIDDLEWARE: str = "silk.middleware.SilkyMiddleware"
+
+# Set by handle() before any request is served.
+IO: Dict[str, Any] = {"kind": "sleep", "delay": 0.05, "url": ""}
+# Most threads alive at the end of a request during the current mode.
+PEAK_THREADS: List[int] = [0]
+
+
+def sample_threads() -> None:
+    PEAK_THREADS[0] = max(PEAK_THREADS[0], threading.active_count())
+
+
+def sync_view(request: Any) -> JsonResponse:
+    if IO["kind"] == "http":
+        http.request("GET", IO["url"]).raise_for_status()
+    else:
+        time.sleep(IO["delay"])
+    return JsonResponse({"ok": True})
+
+
+async def async_view(request: Any) -> JsonResponse:
+    if IO["kind"] == "http":
+        (await http.arequest("GET", IO["url"])).raise_for_status()
+    else:
+        await asyncio.sleep(IO["delay"])
+    return JsonResponse({"ok": True})
+
+
+# ROOT_URLCONF while the benchmark runs.
+urlpatterns = [
+    path("sync", sync_view),
+    path("async", async_view),
+]
+
+
+def wsgi_environ(path: str) -> Dict[str, Any]:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "SCRIPT_NAME": "",
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def asgi_scope(path: str) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+
+
+def run_wsgi(path: str, requests: int, threads: int) -> List[float]:
+    handler = WSGIHandler()
+    statuses: List[str] = []
+
+    def start_response(status: str, headers: list, *args: Any) -> None:
+        statuses.append(status)
+
+    def one(_: int) -> float:
+        started: float = time.perf_counter()
+        response: Any = handler(wsgi_environ(path), start_response)
+        b"".join(response)
+        response.close()
+        sample_threads()
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies: List[float] = list(pool.map(one, range(requests)))
+    failed: List[str] = [s for s in statuses if not s.startswith("200")]
+    if failed:
+        raise RuntimeError(f"{len(failed)} requests failed: {failed[0]}")
+    return latencies
+
+
+async def asgi_request(handler: ASGIHandler, path: str) -> int:
+    status: List[int] = []
+    received: bool = False
+    never: asyncio.Event = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Django listens for a disconnect until the response is sent.
+        await never.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await handler(asgi_scope(path), receive, send)
+    return status[0]
+
+
+def run_asgi(path: str, requests: int, concurrency: int) -> List[float]:
+    async def main() -> List[float]:
+        handler = ASGIHandler()
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one() -> float:
+            async with limit:
+                started: float = time.perf_counter()
+                code: int = await asgi_request(handler, path)
+                if code != 200:
+                    raise RuntimeError(f"Request failed with {code}.")
+                sample_threads()
+                return time.perf_counter() - started
+
+        return list(await asyncio.gather(*(one() for _ in range(requests))))
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Load-tests the same I/O-bound endpoint as a sync view behind "
+        "Django's WSGI handler and as a sync and an async view behind its "
+        "ASGI handler, in process through the project's middleware, and "
+        "reports throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--io",
+            choices=["sleep", "http"],
+            default="sleep",
+            help="What the view waits on: a sleep (time.sleep / "
+            "asyncio.sleep), or a delayed local HTTP stub called through "
+            "project.http (request / arequest).",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.05,
+            help="Seconds each request waits on I/O.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per mode.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help="Requests in flight at once for the ASGI modes.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="WSGI worker threads, like gunicorn --threads for one "
+            "worker process.",
+        )
+        parser.add_argument(
+            "--middleware",
+            choices=["settings", "project", "none"],
+            default="settings",
+            help="Middleware chain: MIDDLEWARE as configured, only the "
+            "project's own (async-capable) middleware, or none. Django's "
+            "MiddlewareMixin classes run each hook in a thread under ASGI.",
+        )
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(MODES),
+            default=list(MODES),
+            help="Modes to run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # Percentiles need at least two samples.
+        minimums: Dict[str, int] = {
+            "requests": 2,
+            "concurrency": 1,
+            "threads": 1,
+        }
+        for name, minimum in minimums.items():
+            if options[name] < minimum:
+                self.stdout.write(
+                    self.style.ERROR(f"--{name} must be >= {minimum}.")
+                )
+                return
+
+        middleware: List[str] = {
+            "settings": list(settings.MIDDLEWARE),
+            "project": [
+                name
+                for name in settings.MIDDLEWARE
+                if name.startswith("project.")
+            ],
+            "none": [],
+        }[options["middleware"]]
+        if SILK_MIDDLEWARE in middleware:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Silk records every request synchronously and skews the "
+                    "ASGI modes; set SILK_ENABLED=0 for representative "
+                    "numbers."
+                )
+            )
+
+        IO["kind"] = options["io"]
+        IO["delay"] = options["delay"]
+        stub: Optional[StubServer] = None
+        if options["io"] == "http":
+            stub = StubServer().start()
+            stub.add("GET", "/io", StubResponse(delay=options["delay"]))
+            IO["url"] = stub.url("/io")
+
+        runners: Dict[str, Callable[[], List[float]]] = {
+            "wsgi-sync": lambda: run_wsgi(
+                "/sync", options["requests"], options["threads"]
+            ),
+            "asgi-sync": lambda: run_asgi(
+                "/sync", options["requests"], options["concurrency"]
+            ),
+            "asgi-async": lambda: run_asgi(
+                "/async", options["requests"], options["concurrency"]
+            ),
+        }
+        self.stdout.write(
+            f"{options['requests']} requests per mode, each waiting "
+            f"{options['delay'] * 1000:.0f} ms on {options['io']}; "
+            f"{options['threads']} WSGI threads, {options['concurrency']} "
+            f"concurrent ASGI requests, {options['middleware']} middleware."
+        )
+        self.stdout.write(
+            f"{'mode':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'threads':>10}"
+        )
+        try:
+            with override_settings(
+                ROOT_URLCONF=__name__,
+                MIDDLEWARE=middleware,
+                ALLOWED_HOSTS=["localhost"],
+                SECURE_SSL_REDIRECT=False,
+            ):
+                for mode in options["modes"]:
+                    PEAK_THREADS[0] = 0
+                    started: float = time.perf_counter()
+                    try:
+                        latencies: List[float] = runners[mode]()
+                    except RuntimeError as e:
+                        self.stdout.write(self.style.ERROR(f"{mode}: {e}"))
+                        return
+                    elapsed: float = time.perf_counter() - started
+                    cuts: List[float] = statistics.quantiles(
+                        latencies, n=100
+                    )
+                    self.stdout.write(
+                        f"{MODES[mode]:<20}"
+                        f"{len(latencies) / elapsed:>10.0f}"
+                        f"{cuts[49] * 1000:>10.1f}"
+                        f"{cuts[94] * 1000:>10.1f}"
+                        f"{cuts[98] * 1000:>10.1f}"
+                        f"{PEAK_THREADS[0]:>10}"
+                    )
+        finally:
+            if stub is not None:
+                stub.stop()
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
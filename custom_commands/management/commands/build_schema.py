@@ -0,0 +1,82 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Callable
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from project.version import code_version
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Builds the OpenAPI schema for the current code version into the "
+        "cache (and API_SCHEMA_DIR), so no request has to generate it."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--formats",
+            nargs="+",
+            choices=["yaml", "json"],
+            default=["yaml", "json"],
+            help="Schema formats to build.",
+        )
+
+    def timed(self, func: Callable[[], Any]) -> tuple:
+        started: float = perf_counter()
+        result: Any = func()
+        return result, (perf_counter() - started) * 1000
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not apps.is_installed("drf_spectacular"):
+            self.stdout.write(
+                self.style.ERROR(
+                    "drf_spectacular is not installed in this profile "
+                    "(API_DOCS_ENABLED)."
+                )
+            )
+            return
+
+        from drf_spectacular.views import SpectacularAPIView
+
+        from project.api.schema import CachedSpectacularAPIView, get_document
+
+        factory = RequestFactory()
+        generate = SpectacularAPIView.as_view()
+        cached = CachedSpectacularAPIView.as_view()
+
+        self.stdout.write(f"Code version: {code_version()}")
+        # RequestFactory requests come from "testserver".
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for fmt in options["formats"]:
+
+                def build() -> bytes:
+                    response = generate(
+                        factory.get("/api/schema/", {"format": fmt})
+                    )
+                    response.render()
+                    return response.content
+
+                document, built_ms = self.timed(
+                    lambda: get_document(fmt, None, None, build, refresh=True)
+                )
+                response, served_ms = self.timed(
+                    lambda: cached(
+                        factory.get(
+                            "/api/schema/",
+                            {"format": fmt},
+                            headers={"if-none-match": document.etag},
+                        )
+                    )
+                )
+                self.stdout.write(
+                    f"{fmt:<5} {len(document.content):>9} bytes  "
+                    f"built in {built_ms:.0f} ms, revalidated "
+                    f"({response.status_code}) in {served_ms:.1f} ms, "
+                    f"ETag {document.etag}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Schema built."))
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Callable, Iterator, List
+
+from project.services import BulkWriteService
+
+PREFIX: str = "bulk-benchmark-"
+
+
+class GroupBulkService(BulkWriteService):
+    model = Group
+    unique_fields = ["name"]
+    # Group has no other column; rewriting the name still exercises the
+    # ON CONFLICT DO UPDATE path.
+    update_fields = ["name"]
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compares per-row save() with BulkWriteService create/update/upsert "
+        "at several row counts, using auth.Group as the target table."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000],
+            help="Row counts to benchmark.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BulkWriteService.batch_size,
+            help="BulkWriteService batch size.",
+        )
+        parser.add_argument(
+            "--per-row-limit",
+            type=int,
+            default=10_000,
+            help="Rows actually saved one by one; larger counts are "
+            "extrapolated from this sample.",
+        )
+
+    def rows(self, count: int) -> Iterator[Group]:
+        return (Group(name=f"{PREFIX}{number}") for number in range(count))
+
+    def timed(self, func: Callable[[], Any]) -> float:
+        started: float = perf_counter()
+        func()
+        return perf_counter() - started
+
+    def cleanup(self) -> None:
+        Group.objects.filter(name__startswith=PREFIX).delete()
+
+    def per_row_save(self, count: int) -> None:
+        for group in self.rows(count):
+            group.save()
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        service = GroupBulkService(batch_size=options["batch_size"])
+        limit: int = options["per_row_limit"]
+        self.cleanup()
+
+        self.stdout.write(
+            f"{'rows':>10}{'save() s':>12}{'bulk create s':>15}"
+            f"{'upsert s':>11}{'bulk update s':>15}{'speedup':>10}"
+        )
+        for count in options["rows"]:
+            sample: int = min(count, limit)
+            saved: float = self.timed(lambda: self.per_row_save(sample))
+            self.cleanup()
+            per_row: float = saved * count / sample
+
+            created: float = self.timed(
+                lambda: service.create(self.rows(count))
+            )
+            # Same names again: every row conflicts, so this measures the
+            # ON CONFLICT DO UPDATE path.
+            upserted: float = self.timed(
+                lambda: service.upsert(self.rows(count))
+            )
+            pks: List[int] = list(
+                Group.objects.filter(name__startswith=PREFIX).values_list(
+                    "pk", flat=True
+                )
+            )
+            updated: float = self.timed(
+                lambda: service.update(
+                    (Group(pk=pk, name=f"{PREFIX}u{pk}") for pk in pks),
+                    ["name"],
+                )
+            )
+            self.cleanup()
+
+            marker: str = "*" if sample < count else " "
+            self.stdout.write(
+                f"{count:>10}{per_row:>11.2f}{marker}{created:>15.2f}"
+                f"{upserted:>11.2f}{updated:>15.2f}"
+                f"{per_row / created:>9.1f}x"
+            )
+        self.stdout.write(
+            f"* extrapolated from {limit} per-row saves (--per-row-limit)."
+        )
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
@@ -0,0 +1,139 @@
+from django.core.management.base import BaseCommand
+from argparse import ArgumentParser
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from time import perf_counter
+from typing import Any, Dict, List
+import asyncio
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Load-tests the configured channel layer: group broadcast throughput "
+        "and fan-out latency from group_send to each receiver."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--receivers",
+            type=int,
+            default=50,
+            help="Number of channels subscribed to the group.",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=200,
+            help="Number of group broadcasts.",
+        )
+        parser.add_argument(
+            "--payload-size",
+            type=int,
+            default=256,
+            help="Payload size in bytes.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=5.0,
+            help="Seconds a receiver waits before counting a message as lost.",
+        )
+        parser.add_argument(
+            "--layer",
+            default="default",
+            help="CHANNEL_LAYERS alias to benchmark.",
+        )
+
+    async def _receive(
+        self,
+        layer: Any,
+        channel: str,
+        options: Dict[str, Any],
+        latencies: List[float],
+    ) -> None:
+        for _ in range(options["messages"]):
+            try:
+                message = await asyncio.wait_for(
+                    layer.receive(channel), options["timeout"]
+                )
+            except asyncio.TimeoutError:
+                return
+            latencies.append(perf_counter() - message["sent"])
+
+    async def _run(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        layer = get_channel_layer(options["layer"])
+        group: str = "benchmark"
+        payload: str = "x" * options["payload_size"]
+        latencies: List[float] = []
+
+        channels: List[str] = [
+            await layer.new_channel() for _ in range(options["receivers"])
+        ]
+        for channel in channels:
+            await layer.group_add(group, channel)
+
+        receivers = [
+            asyncio.create_task(
+                self._receive(layer, channel, options, latencies)
+            )
+            for channel in channels
+        ]
+
+        started: float = perf_counter()
+        for _ in range(options["messages"]):
+            # Group sends silently skip full channels; those show up as
+            # lost deliveries below.
+            await layer.group_send(
+                group,
+                {
+                    "type": "benchmark.message",
+                    "sent": perf_counter(),
+                    "payload": payload,
+                },
+            )
+            # Let receivers drain between broadcasts, as live consumers do.
+            await asyncio.sleep(0)
+        send_elapsed: float = perf_counter() - started
+        await asyncio.gather(*receivers)
+        elapsed: float = perf_counter() - started
+
+        for channel in channels:
+            await layer.group_discard(group, channel)
+
+        return {
+            "backend": f"{type(layer).__module__}.{type(layer).__name__}",
+            "latencies": latencies,
+            "send_elapsed": send_elapsed,
+            "elapsed": elapsed,
+        }
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["receivers"] < 1 or options["messages"] < 1:
+            self.stdout.write(
+                self.style.ERROR("--receivers and --messages must be >= 1.")
+            )
+            return
+
+        result: Dict[str, Any] = async_to_sync(self._run)(options)
+
+        latencies: List[float] = sorted(result["latencies"])
+        expected: int = options["receivers"] * options["messages"]
+        delivered: int = len(latencies)
+        self.stdout.write(
+            f"Layer:              {result['backend']}\n"
+            f"Broadcasts:         {options['messages']} x "
+            f"{options['receivers']} receivers\n"
+            f"Delivered:          {delivered}/{expected} "
+            f"({expected - delivered} lost)\n"
+            f"Broadcasts/sec:     "
+            f"{options['messages'] / result['send_elapsed']:.0f}\n"
+            f"Deliveries/sec:     {delivered / result['elapsed']:.0f}"
+        )
+        if latencies:
+            self.stdout.write(
+                f"Fan-out latency:    "
+                f"p50 {latencies[delivered // 2] * 1000:.2f} ms  "
+                f"p99 {latencies[int(delivered * 0.99)] * 1000:.2f} ms  "
+                f"max {latencies[-1] * 1000:.2f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, List, Optional, Set
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Simulates request cycles against a database alias and reports how "
+        "often connections are opened versus reused."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Number of simulated requests.",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=3,
+            help="Queries executed per simulated request.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to benchmark.",
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=None,
+            help="Override CONN_MAX_AGE for this run, e.g. 0 for a baseline.",
+        )
+
+    def _backend_id(self, connection: Any) -> Optional[Any]:
+        # Server-side session id; only psycopg exposes it (backend_pid).
+        info = getattr(connection.connection, "info", None)
+        return getattr(info, "backend_pid", None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 1:
+            self.stdout.write(self.style.ERROR("--requests must be >= 1."))
+            return
+
+        alias: str = options["database"]
+        connection = connections[alias]
+
+        if options["conn_max_age"] is not None:
+            connection.settings_dict["CONN_MAX_AGE"] = options["conn_max_age"]
+        connection.close()
+
+        opened: List[int] = []
+
+        def count_connection(sender: Any, connection: Any, **kwargs: Any):
+            if connection.alias == alias:
+                opened.append(1)
+
+        connection_created.connect(count_connection)
+
+        sessions: Set[Any] = set()
+        timings: List[float] = []
+        try:
+            for _ in range(options["requests"]):
+                started: float = perf_counter()
+                # Fire the same signals the handler does, so CONN_MAX_AGE,
+                # health checks and pool returns behave as in production.
+                request_started.send(sender=self.__class__)
+                for _ in range(options["queries"]):
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                        cursor.fetchone()
+                backend_id = self._backend_id(connection)
+                if backend_id is not None:
+                    sessions.add(backend_id)
+                request_finished.send(sender=self.__class__)
+                timings.append(perf_counter() - started)
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+
+        total: int = len(timings)
+        connects: int = len(opened)
+        timings.sort()
+        self.stdout.write(
+            f"Engine:               {connection.settings_dict['ENGINE']}\n"
+            f"CONN_MAX_AGE:         {connection.settings_dict['CONN_MAX_AGE']}\n"
+            f"Pool:                 {'pool' in connection.settings_dict['OPTIONS']}\n"
+            f"Requests:             {total}\n"
+            f"Connections opened:   {connects}\n"
+            f"Server sessions used: {len(sessions) or 'n/a'}\n"
+            f"Reuse ratio:          {1 - connects / total:.1%}\n"
+            f"Mean per request:     {sum(timings) / total * 1000:.3f} ms\n"
+            f"p50 per request:      {timings[total // 2] * 1000:.3f} ms\n"
+            f"p99 per request:      {timings[int(total * 0.99)] * 1000:.3f} ms"
+        )
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
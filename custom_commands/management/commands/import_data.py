@@ -0,0 +1,122 @@
+import sys
+from argparse import ArgumentParser
+from typing import Any, Optional, TextIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from project.transfer import get_resource, guess_format, import_stream
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Upserts a CSV or JSON Lines file into a django-import-export "
+        "resource in batches, in constant memory."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "resource",
+            type=str,
+            help="Model label (blog.Article) or dotted path to a "
+            "ModelResource (blog.resources.ArticleResource).",
+        )
+        parser.add_argument(
+            "path",
+            type=str,
+            help="File to read, '-' for stdin. With --async, a name in the "
+            "default storage.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            default=None,
+            help="Defaults to the extension of the file, else csv.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows per upsert and transaction. Defaults to "
+            "IMPORT_EXPORT_CHUNK_SIZE.",
+        )
+        parser.add_argument(
+            "--skip-m2m",
+            action="store_true",
+            help="Leave many-to-many columns out instead of replacing the "
+            "relations of every row with them.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Enqueue the import for `manage.py run_workers` instead.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        fmt: Optional[str] = options["format"]
+        batch_size: int = (
+            options["batch_size"] or settings.IMPORT_EXPORT_CHUNK_SIZE
+        )
+        try:
+            resource = get_resource(options["resource"])
+            fmt = (fmt or "csv") if path == "-" else guess_format(path, fmt)
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        if options["run_async"]:
+            if path == "-":
+                self.stdout.write(
+                    self.style.ERROR("--async needs a file in the storage.")
+                )
+                return
+            from project.transfer.tasks import import_from_storage
+
+            message = import_from_storage.enqueue(
+                (options["resource"], path, fmt, batch_size),
+                {"skip_m2m": options["skip_m2m"]},
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Import queued as task {message.id}.")
+            )
+            return
+
+        stream: TextIO = (
+            sys.stdin
+            if path == "-"
+            else open(path, encoding="utf-8", newline="")
+        )
+        try:
+            result = import_stream(
+                resource,
+                stream,
+                fmt=fmt,
+                batch_size=batch_size,
+                skip_m2m=options["skip_m2m"],
+            )
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f"Import failed: {e}"))
+            return
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for number, error in result.errors:
+            self.stdout.write(self.style.WARNING(f"Row {number}: {error}"))
+        if result.error_count > len(result.errors):
+            self.stdout.write(
+                f"... and {result.error_count - len(result.errors)} more."
+            )
+        if result.ignored_columns:
+            self.stdout.write(
+                "Ignored many-to-many columns: "
+                f"{', '.join(result.ignored_columns)}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.written} of {result.rows} rows "
+                f"({result.error_count} skipped)."
+            )
+        )
@@ -0,0 +1,109 @@
+from django.core.management.base import BaseCommand
+from argparse import ArgumentParser
+from logging.handlers import QueueListener
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List
+import logging
+import queue
+import tempfile
+
+from project.log.handlers import AsyncQueueHandler
+
+# Same layout as the "verbose" formatter in project/log/config.py.
+VERBOSE_FORMAT: str = "{name} {levelname} {asctime} {module} {message}"
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compares per-request logging overhead of a synchronous FileHandler "
+        "with the queued handler used by the settings."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Number of simulated requests.",
+        )
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=20,
+            help="Log records emitted per request (e.g. one per SQL query).",
+        )
+        parser.add_argument(
+            "--directory",
+            default=None,
+            help="Where to write the log files; defaults to a temp directory."
+            " Point it at the real log volume for representative numbers.",
+        )
+
+    def _run(self, logger: logging.Logger, options: Dict[str, Any]) -> List[float]:
+        timings: List[float] = []
+        for request_number in range(options["requests"]):
+            started: float = perf_counter()
+            for record_number in range(options["records"]):
+                logger.debug(
+                    "(0.001) SELECT * FROM app_table WHERE id = %s; args=(%s,)",
+                    request_number,
+                    record_number,
+                )
+            timings.append(perf_counter() - started)
+        return timings
+
+    def _report(self, label: str, timings: List[float]) -> None:
+        timings.sort()
+        total: int = len(timings)
+        self.stdout.write(
+            f"{label:<12} mean {sum(timings) / total * 1e6:9.1f} us  "
+            f"p50 {timings[total // 2] * 1e6:9.1f} us  "
+            f"p99 {timings[int(total * 0.99)] * 1e6:9.1f} us"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 1:
+            self.stdout.write(self.style.ERROR("--requests must be >= 1."))
+            return
+
+        formatter = logging.Formatter(VERBOSE_FORMAT, style="{")
+
+        with tempfile.TemporaryDirectory(dir=options["directory"]) as directory:
+            logger: logging.Logger = logging.getLogger("benchmark.logging")
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+
+            # Before: the FileHandler formats and writes on the caller.
+            file_handler = logging.FileHandler(Path(directory) / "sync.log")
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+            sync_timings: List[float] = self._run(logger, options)
+            logger.removeHandler(file_handler)
+            file_handler.close()
+
+            # After: the caller only enqueues, the listener does the rest.
+            target = logging.FileHandler(Path(directory) / "async.log")
+            target.setFormatter(formatter)
+            queue_handler = AsyncQueueHandler(queue.Queue())
+            queue_handler.listener = QueueListener(
+                queue_handler.queue, target, respect_handler_level=True
+            )
+            logger.addHandler(queue_handler)
+            async_timings: List[float] = self._run(logger, options)
+
+            # Production default: DEBUG records are dropped by the level
+            # check before any formatting or queueing happens.
+            logger.setLevel(logging.INFO)
+            info_timings: List[float] = self._run(logger, options)
+            logger.removeHandler(queue_handler)
+            queue_handler.listener.stop()
+            target.close()
+
+        self.stdout.write(
+            f"{options['requests']} requests x {options['records']} records"
+        )
+        self._report("FileHandler", sync_timings)
+        self._report("Queued", async_timings)
+        self._report("Queued INFO", info_timings)
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
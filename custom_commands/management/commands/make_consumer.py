@@ -0,0 +1,102 @@
+from custom_commands.management.base import NoChecksCommand
+from django.apps import apps
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+
+class Command(NoChecksCommand):
+    help: str = "Creates a WebSocket consumer with group broadcast support."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "app_name", type=str, help="App the consumer belongs to."
+        )
+        parser.add_argument(
+            "consumer_name",
+            type=str,
+            help="Consumer module name, e.g. 'room_consumer'.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        app_name: str = options["app_name"].strip().lower()
+        consumer_name: str = options["consumer_name"].strip().lower()
+
+        try:
+            app_config = apps.get_app_config(app_name)
+        except LookupError:
+            self.stdout.write(self.style.ERROR(f"App '{app_name}' not found."))
+            return
+
+        if not consumer_name.isidentifier():
+            self.stdout.write(
+                self.style.ERROR(
+                    "Consumer name must be a valid Python identifier."
+                )
+            )
+            return
+
+        if not consumer_name.endswith("_consumer"):
+            consumer_name = f"{consumer_name}_consumer"
+
+        consumers_directory: Path = Path(app_config.path) / "consumers"
+        consumer_path: Path = consumers_directory / f"{consumer_name}.py"
+
+        if consumer_path.exists():
+            self.stdout.write(
+                self.style.ERROR(f"Consumer '{consumer_name}' already exists.")
+            )
+            return
+
+        class_name: str = "".join(
+            word.capitalize() for word in consumer_name.split("_")
+        )
+        route_name: str = consumer_name.replace("_consumer", "")
+
+        content: str = f"""from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+
+class {class_name}(AsyncJsonWebsocketConsumer):
+    # Route: path("ws/{route_name}/<str:group>/", {class_name}.as_asgi())
+
+    async def connect(self):
+        self.group_name = f"{route_name}.{{self.scope['url_route']['kwargs']['group']}}"
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(
+            self.group_name, self.channel_name
+        )
+
+    async def receive_json(self, content, **kwargs):
+        # Broadcast every incoming message to the whole group.
+        await self.channel_layer.group_send(
+            self.group_name, {{"type": "group.message", "payload": content}}
+        )
+
+    async def group_message(self, event):
+        await self.send_json(event["payload"])
+"""
+
+        try:
+            consumers_directory.mkdir(parents=True, exist_ok=True)
+            init_file: Path = consumers_directory / "__init__.py"
+            if not init_file.exists():
+                init_file.touch()
+            with consumer_path.open("w") as consumer_file:
+                consumer_file.write(content)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"Failed to create consumer: {str(e)}")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS("Consumer created successfully.")
+        )
+        self.stdout.write(
+            "Register it in project/routing.py:\n"
+            f"    from {app_name}.consumers.{consumer_name} import {class_name}\n"
+            f'    path("ws/{route_name}/<str:group>/", {class_name}.as_asgi()),'
+        )
@@ -1,11 +1,11 @@
-from django.core.management.base import BaseCommand
+from custom_commands.management.base import NoChecksCommand
 from pathlib import Path
 import os
 from argparse import ArgumentParser
 from typing import Any
 
 
-class Command(BaseCommand):
+class Command(NoChecksCommand):
     help: str = "Allows to create a custom command"
 
     def add_arguments(self, parser: ArgumentParser) -> None:
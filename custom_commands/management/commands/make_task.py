@@ -0,0 +1,87 @@
+from custom_commands.management.base import NoChecksCommand
+from django.apps import apps
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+
+class Command(NoChecksCommand):
+    help: str = "Creates a background task run by 'manage.py run_workers'."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "app_name", type=str, help="App the task belongs to."
+        )
+        parser.add_argument(
+            "task_name",
+            type=str,
+            help="Task function name, e.g. 'send_welcome_email'.",
+        )
+        parser.add_argument(
+            "--queue",
+            type=str,
+            default="default",
+            help="Queue the task is enqueued on.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        app_name: str = options["app_name"].strip().lower()
+        task_name: str = options["task_name"].strip().lower()
+        queue: str = options["queue"].strip()
+
+        try:
+            app_config = apps.get_app_config(app_name)
+        except LookupError:
+            self.stdout.write(self.style.ERROR(f"App '{app_name}' not found."))
+            return
+
+        if not task_name.isidentifier():
+            self.stdout.write(
+                self.style.ERROR("Task name must be a valid Python identifier.")
+            )
+            return
+
+        if not queue:
+            self.stdout.write(self.style.ERROR("Please provide a queue name."))
+            return
+
+        tasks_directory: Path = Path(app_config.path) / "tasks"
+        task_path: Path = tasks_directory / f"{task_name}_task.py"
+
+        if task_path.exists():
+            self.stdout.write(
+                self.style.ERROR(f"Task '{task_name}' already exists.")
+            )
+            return
+
+        content: str = f"""from project.tasks import task
+
+
+@task(queue="{queue}")
+def {task_name}(*args, **kwargs):
+    # Runs on a worker; arguments arrive as JSON, so take ids rather than
+    # model instances and fetch what you need here. A raised exception is
+    # retried with exponential backoff (TASK_MAX_RETRIES).
+    pass
+"""
+
+        try:
+            tasks_directory.mkdir(parents=True, exist_ok=True)
+            init_file: Path = tasks_directory / "__init__.py"
+            if not init_file.exists():
+                init_file.touch()
+            with task_path.open("w") as task_file:
+                task_file.write(content)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"Failed to create task: {str(e)}")
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS("Task created successfully."))
+        self.stdout.write(
+            "Enqueue it (after the transaction commits) with:\n"
+            f"    from {app_name}.tasks.{task_name}_task import {task_name}\n"
+            f"    transaction.on_commit(lambda: {task_name}.delay(...))\n"
+            f"Run it with: python manage.py run_workers --queues {queue}"
+        )
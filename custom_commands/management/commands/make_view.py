@@ -1,12 +1,21 @@
-from django.core.management.base import BaseCommand
+from custom_commands.management.base import NoChecksCommand
 from django.apps import apps
+from argparse import ArgumentParser
 import os
 from typing import Any
 
 
-class Command(BaseCommand):
+class Command(NoChecksCommand):
     help: str = "Allows to create a view"
 
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help="Start an async view module for the ASGI request path.",
+        )
+
     def handle(self, *args: Any, **options: Any) -> None:
         app_name: str = input("Enter the app name\n").strip()
         if not app_name:
@@ -35,6 +44,14 @@ class Command(BaseCommand):
         content: str = """from django.shortcuts import render
 
 # Create your views here.
+"""
+        if options["use_async"]:
+            content = """from django.http import JsonResponse
+
+# Create your views here. They run on the event loop under ASGI, so await
+# I/O instead of blocking: the async ORM (aget, acreate, async for),
+# project.http.arequest, cache.aget. Wrap unavoidable blocking calls in
+# asgiref.sync.sync_to_async.
 """
 
         try:
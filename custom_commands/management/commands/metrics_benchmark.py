@@ -0,0 +1,122 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+
+from project.metrics import REGISTRY
+from project.metrics.middleware import MetricsMiddleware
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Measures the per-request overhead of MetricsMiddleware, with values "
+        "in memory and in a METRICS_DIR mmap file."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20000,
+            help="Number of simulated requests per run.",
+        )
+        parser.add_argument(
+            "--views",
+            type=int,
+            default=20,
+            help="Distinct URL names the requests are spread over.",
+        )
+        parser.add_argument(
+            "--budget-us",
+            type=float,
+            default=50.0,
+            help="Fail when the mean overhead exceeds this many microseconds.",
+        )
+
+    def _run(
+        self, handler: Callable, requests: List[Any]
+    ) -> List[float]:
+        timings: List[float] = []
+        for request in requests:
+            started: float = perf_counter()
+            handler(request)
+            timings.append(perf_counter() - started)
+        return timings
+
+    def _stats(self, timings: List[float]) -> Dict[str, float]:
+        timings = sorted(timings)
+        total: int = len(timings)
+        return {
+            "mean": sum(timings) / total * 1e6,
+            "p50": timings[total // 2] * 1e6,
+            "p99": timings[int(total * 0.99)] * 1e6,
+        }
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 1 or options["views"] < 1:
+            self.stdout.write(
+                self.style.ERROR("--requests and --views must be >= 1.")
+            )
+            return
+
+        factory = RequestFactory()
+        requests: List[Any] = []
+        for number in range(options["requests"]):
+            request = factory.get(f"/bench/{number}/")
+            # What URL resolution leaves on the request for a named route.
+            request.resolver_match = ResolverMatch(
+                lambda request: None,
+                (),
+                {},
+                url_name=f"bench-{number % options['views']}",
+            )
+            requests.append(request)
+
+        def view(request: Any) -> HttpResponse:
+            return HttpResponse()
+
+        middleware = MetricsMiddleware(view)
+        baseline: Dict[str, float] = self._stats(self._run(view, requests))
+        self.stdout.write(
+            f"{options['requests']} requests over {options['views']} views\n"
+            f"{'no middleware':<14} mean {baseline['mean']:7.1f} us  "
+            f"p50 {baseline['p50']:7.1f} us  p99 {baseline['p99']:7.1f} us"
+        )
+
+        worst: float = 0.0
+        with tempfile.TemporaryDirectory() as directory:
+            for label, target in (("memory", ""), ("mmap file", directory)):
+                REGISTRY.configure(target)
+                # Warm up: first observations allocate their entries.
+                self._run(middleware, requests[: options["views"]])
+                stats: Dict[str, float] = self._stats(
+                    self._run(middleware, requests)
+                )
+                overhead: float = stats["mean"] - baseline["mean"]
+                worst = max(worst, overhead)
+                self.stdout.write(
+                    f"{label:<14} mean {stats['mean']:7.1f} us  "
+                    f"p50 {stats['p50']:7.1f} us  p99 {stats['p99']:7.1f} us"
+                    f"  overhead {overhead:6.1f} us"
+                )
+            REGISTRY.configure(None)
+
+        if worst > options["budget_us"]:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Overhead {worst:.1f} us exceeds the "
+                    f"{options['budget_us']:g} us budget."
+                )
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Overhead {worst:.1f} us is within the "
+                f"{options['budget_us']:g} us budget."
+            )
+        )
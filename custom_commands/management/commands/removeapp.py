@@ -41,33 +41,23 @@ class Command(BaseCommand):
         # Create the app directory path
         app_directory: Path = root_directory / app_name
 
-        # List of settings files
-        settings_files: List[Path] = [
-            root_directory / "project" / "settings" / "local.py",
-            root_directory / "project" / "settings" / "dev.py",
-            root_directory / "project" / "settings" / "qa.py",
-            root_directory / "project" / "settings" / "production.py",
-        ]
+        # Every profile shares PROJECT_APPS in base.py
+        settings_file: Path = (
+            root_directory / "project" / "settings" / "base.py"
+        )
+        app_lines: List[str] = [f'    "{app_name}",\n', f"    '{app_name}',\n"]
 
-        # Remove the app from settings files
-        for settings_file in settings_files:
-            if settings_file.exists():
-                try:
-                    with settings_file.open("r") as file:
-                        lines = file.readlines()
-                    with settings_file.open("w") as file:
-                        for line in lines:
-                            # Remove the app from the INSTALLED_APPS list
-                            if app_name in line:
-                                continue
-                            file.write(line)
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"Error while modifying {settings_file}: {e}"
-                        )
-                    )
-                    return
+        # Remove the app from PROJECT_APPS
+        try:
+            with settings_file.open("r") as file:
+                lines: List[str] = file.readlines()
+            with settings_file.open("w") as file:
+                file.writelines(line for line in lines if line not in app_lines)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"Error while modifying {settings_file}: {e}")
+            )
+            return
 
         # Remove the app directory recursively
         if app_directory.exists():
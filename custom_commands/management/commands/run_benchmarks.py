@@ -0,0 +1,185 @@
+from argparse import ArgumentParser
+from typing import Any, Dict, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks import BENCHMARKS, Timing
+from benchmarks.results import (
+    Comparison,
+    compare,
+    load,
+    mismatches,
+    save,
+    to_json,
+)
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Runs the benchmarks in benchmarks/ (API, serializers, ORM bulk "
+        "paths, cache, startup), optionally saving the results for this "
+        "commit and failing on slowdowns against a baseline."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "only",
+            nargs="*",
+            help="Benchmarks (api) or cases (api.list) to run. Default: "
+            "all.",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Timed rounds per case; the median is reported.",
+        )
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplies the rows every benchmark seeds.",
+        )
+        parser.add_argument(
+            "--model",
+            default="auth.Group",
+            help="Model the api benchmark generates its viewset for.",
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Store the results as the baseline of the current commit "
+            "in BENCHMARK_RESULTS_DIR.",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=None,
+            help="Commit (HEAD~1, main, a hash) saved with --save, or a "
+            "results file, to compare against.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=None,
+            help="Fail when a case is slower than the baseline by more "
+            "than this fraction. Defaults to BENCHMARK_THRESHOLD.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        only: List[str] = options["only"]
+        threshold: float = (
+            options["threshold"]
+            if options["threshold"] is not None
+            else settings.BENCHMARK_THRESHOLD
+        )
+        # A CI gate: anything that keeps it from comparing fails the run.
+        try:
+            apps.get_model(options["model"])
+        except (LookupError, ValueError):
+            raise CommandError(
+                f"Model '{options['model']}' not found. Use "
+                "'app_label.ModelName'."
+            ) from None
+        baseline: Optional[Dict[str, Any]] = None
+        if options["baseline"]:
+            try:
+                baseline = load(options["baseline"])
+            except ValueError as e:
+                raise CommandError(str(e)) from None
+            for key in mismatches(baseline):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"The baseline ran with a different {key}; "
+                        "differences may not be regressions."
+                    )
+                )
+
+        def selected(name: str) -> bool:
+            return not only or any(
+                name == item or name.startswith(f"{item}.") for item in only
+            )
+
+        timings: Dict[str, Timing] = {}
+        self.stdout.write(
+            f"{'case':<36}{'median ms':>11}{'best ms':>10}{'ops/s':>11}"
+        )
+        # DEBUG would record every query in connection.queries, which is
+        # not what production pays; APIRequestFactory uses "testserver".
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=["*"]):
+            for benchmark_class in BENCHMARKS:
+                # Skip the setup of benchmarks with no selected case.
+                if only and benchmark_class.name not in {
+                    item.split(".")[0] for item in only
+                }:
+                    continue
+                benchmark = benchmark_class(options)
+                for name, timing in benchmark.run(options["rounds"], selected):
+                    timings[name] = timing
+                    self.stdout.write(
+                        f"{name:<36}{timing.median * 1000:>11.3f}"
+                        f"{timing.best * 1000:>10.3f}"
+                        f"{timing.per_second:>11.0f}"
+                    )
+                for case, reason in benchmark.skipped.items():
+                    name = f"{benchmark.name}.{case}"
+                    if selected(name):
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f"{name:<36}skipped: {reason}"
+                            )
+                        )
+
+        if not timings:
+            raise CommandError("No benchmark case matched.")
+        if options["save"]:
+            try:
+                path = save(to_json(timings))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not save the results: {e}") from e
+            self.stdout.write(f"Saved {path}.")
+        if baseline is None:
+            self.stdout.write(self.style.SUCCESS("Benchmarks completed."))
+            return
+        self.compare(baseline, timings, threshold)
+
+    def compare(
+        self,
+        baseline: Dict[str, Any],
+        timings: Dict[str, Timing],
+        threshold: float,
+    ) -> None:
+        commit: str = (baseline.get("commit") or "?")[:12]
+        self.stdout.write(
+            f"\nAgainst {commit}{' (dirty)' if baseline.get('dirty') else ''}"
+            f", failing above +{threshold:.0%}:"
+        )
+        self.stdout.write(
+            f"{'case':<36}{'baseline ms':>13}{'now ms':>10}{'change':>9}"
+        )
+        comparisons: List[Comparison] = compare(baseline, timings, threshold)
+        if not comparisons:
+            raise CommandError(
+                "The baseline has none of the cases measured here."
+            )
+        for item in comparisons:
+            line: str = (
+                f"{item.name:<36}{item.baseline * 1000:>13.3f}"
+                f"{item.current * 1000:>10.3f}{item.change:>+9.1%}"
+            )
+            self.stdout.write(
+                self.style.ERROR(line) if item.regressed else line
+            )
+        regressed: List[Comparison] = [
+            item for item in comparisons if item.regressed
+        ]
+        if regressed:
+            # A non-zero exit status, so CI fails the build.
+            raise CommandError(
+                f"{len(regressed)} case(s) slower than the baseline by more "
+                f"than {threshold:.0%}: "
+                + ", ".join(item.name for item in regressed)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
@@ -0,0 +1,99 @@
+from argparse import ArgumentParser
+from typing import Any
+import os
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from project.tasks import get_queue
+from project.tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Runs queued tasks (see project/tasks) in a pool of worker "
+        "processes until stopped with SIGTERM or Ctrl-C."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--queues",
+            nargs="+",
+            default=["default"],
+            help="Queues to consume, highest priority first.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Worker processes. Defaults to TASK_WORKER_CONCURRENCY, "
+            "or one per CPU.",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=float,
+            default=None,
+            help="Seconds before a task of a dead worker is handed out "
+            "again. Defaults to TASK_VISIBILITY_TIMEOUT.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Longest wait between polls of empty queues, in seconds.",
+        )
+        parser.add_argument(
+            "--max-tasks-per-child",
+            type=int,
+            default=None,
+            help="Replace a worker process after this many tasks, to cap "
+            "memory growth.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no task is due instead of waiting for more.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        concurrency: int = (
+            options["concurrency"]
+            or settings.TASK_WORKER_CONCURRENCY
+            or os.cpu_count()
+            or 1
+        )
+        if concurrency < 1:
+            self.stdout.write(self.style.ERROR("--concurrency must be >= 1."))
+            return
+
+        if settings.TASK_BACKEND == "memory":
+            self.stdout.write(
+                self.style.WARNING(
+                    "TASK_BACKEND=memory: only tasks enqueued by this "
+                    "process are visible."
+                )
+            )
+
+        worker = Worker(
+            get_queue(),
+            options["queues"],
+            concurrency=concurrency,
+            visibility_timeout=(
+                options["visibility_timeout"]
+                or settings.TASK_VISIBILITY_TIMEOUT
+            ),
+            poll_interval=options["poll_interval"],
+            max_tasks_per_child=options["max_tasks_per_child"],
+        )
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        self.stdout.write(
+            f"Consuming {', '.join(options['queues'])} from the "
+            f"{settings.TASK_BACKEND} backend with {concurrency} processes."
+        )
+        processed: int = worker.run(burst=options["burst"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Workers stopped after {processed} tasks.")
+        )
@@ -0,0 +1,173 @@
+from argparse import ArgumentParser
+from typing import Any, Dict, List
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections, models, router
+
+from project.seeding import SeedResult, Seeder, resolve_models
+from project.seeding.factories import VALUES
+from project.services import BulkWriteService
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Fills the models of the given apps with generated rows for "
+        "performance work: factories derived from the models, batched "
+        "bulk_create in foreign key order, reproducible from --seed and "
+        "spread over --processes."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "targets",
+            nargs="+",
+            help="App labels (blog) and/or model labels (blog.Article).",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Rows per model.",
+        )
+        parser.add_argument(
+            "--count",
+            action="append",
+            default=[],
+            metavar="LABEL=ROWS",
+            help="Rows for one model, e.g. --count blog.Tag=50. Repeatable.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Same seed, chunk size and starting data: same rows.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Processes building and inserting chunks. Defaults to one "
+            "per CPU; always 1 on SQLite, which has a single writer.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="Rows per task handed to a process.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BulkWriteService.batch_size,
+            help="Rows per bulk_create and transaction.",
+        )
+        parser.add_argument(
+            "--m2m",
+            type=int,
+            default=2,
+            help="Links per new row for each many-to-many field (0: none).",
+        )
+        parser.add_argument(
+            "--values",
+            choices=VALUES,
+            default="faker",
+            help="faker: realistic values via django-seed; placeholder: "
+            "numbered values, several times faster.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the models in seeding order and stop.",
+        )
+
+    def counts(self, options: Dict[str, Any]) -> Dict[type, int]:
+        counts: Dict[type[models.Model], int] = dict.fromkeys(
+            resolve_models(options["targets"]), options["rows"]
+        )
+        for spec in options["count"]:
+            label, _, rows = spec.partition("=")
+            try:
+                model: type[models.Model] = apps.get_model(label)
+                counts[model] = int(rows)
+            except (LookupError, ValueError):
+                raise ValueError(
+                    f"--count {spec}: expected LABEL=ROWS, e.g. blog.Tag=50."
+                ) from None
+        return counts
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if min(options["chunk_size"], options["batch_size"]) < 1:
+            self.stdout.write(
+                self.style.ERROR("--chunk-size and --batch-size must be >= 1.")
+            )
+            return
+        try:
+            counts: Dict[type[models.Model], int] = self.counts(options)
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        processes: int = options["processes"] or os.cpu_count() or 1
+        if processes > 1 and any(
+            connections[router.db_for_write(model)].vendor == "sqlite"
+            for model in counts
+        ):
+            self.stdout.write(
+                self.style.WARNING(
+                    "SQLite allows one writer at a time: using 1 process."
+                )
+            )
+            processes = 1
+
+        seeder = Seeder(
+            counts,
+            seed=options["seed"],
+            values=options["values"],
+            processes=processes,
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+            m2m=options["m2m"],
+        )
+        try:
+            order: List[type[models.Model]] = seeder.order()
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+        self.stdout.write(
+            f"Seeding {', '.join(model._meta.label for model in order)} "
+            f"(seed {seeder.seed}, {processes} processes, "
+            f"{options['values']} values)."
+        )
+        if options["dry_run"]:
+            for model in order:
+                self.stdout.write(
+                    f"{model._meta.label:<40}{counts[model]:>12}"
+                )
+            return
+
+        self.stdout.write(
+            f"{'model':<40}{'rows':>12}{'seconds':>10}{'rows/s':>12}"
+        )
+        try:
+            for result in seeder.run():
+                self.report(result)
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+        self.stdout.write(self.style.SUCCESS("Seeding completed."))
+
+    def report(self, result: SeedResult) -> None:
+        rate: float = result.rows / result.seconds if result.seconds else 0
+        self.stdout.write(
+            f"{result.label:<40}{result.rows:>12}{result.seconds:>10.2f}"
+            f"{rate:>12.0f}"
+        )
+        if result.rows < result.requested:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  {result.requested} requested: one-to-one targets "
+                    "ran out or generated keys repeated."
+                )
+            )
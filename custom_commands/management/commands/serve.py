@@ -0,0 +1,220 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from argparse import ArgumentParser
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, List
+import os
+import shlex
+import sys
+
+from project.metrics.registry import FILE_SUFFIX
+from project.server import ServerConfig, available_cpus, default_workers
+from project.server.config import MODES, SERVERS
+from project.settings.profiles import PROFILES
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Runs the production server: gunicorn (WSGI, or ASGI with uvicorn "
+        "workers) or uvicorn, with workers derived from the available CPUs, "
+        "preloading, worker recycling and keep-alive from the SERVER_* "
+        "settings. The settings profile must be named."
+    )
+    # Replaced by the server process; nothing is served from here.
+    requires_system_checks = []
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--profile",
+            required=True,
+            choices=list(PROFILES),
+            help="Settings profile the server runs with.",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            default="wsgi",
+            help="wsgi: project/wsgi.py; asgi: project/asgi.py (async "
+            "views, WebSockets).",
+        )
+        parser.add_argument(
+            "--server",
+            choices=SERVERS,
+            default="gunicorn",
+            help="uvicorn runs ASGI only and cannot preload.",
+        )
+        parser.add_argument(
+            "--bind",
+            default=None,
+            help="host:port or unix:/path. Defaults to SERVER_BIND.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes. Defaults to SERVER_WORKERS, or "
+            "2 x CPUs + 1 (WSGI) / one per CPU (ASGI).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=None,
+            help="Threads per WSGI worker. Defaults to SERVER_THREADS.",
+        )
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=None,
+            help="Recycle a worker after this many requests (0: never). "
+            "Defaults to SERVER_MAX_REQUESTS.",
+        )
+        parser.add_argument(
+            "--max-requests-jitter",
+            type=int,
+            default=None,
+            help="Random extra requests per worker, so workers are not "
+            "recycled all at once. Defaults to SERVER_MAX_REQUESTS_JITTER.",
+        )
+        parser.add_argument(
+            "--keepalive",
+            type=int,
+            default=None,
+            help="Seconds an idle keep-alive connection stays open. "
+            "Defaults to SERVER_KEEPALIVE.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=None,
+            help="Seconds before a silent worker is killed and replaced. "
+            "Defaults to SERVER_TIMEOUT.",
+        )
+        parser.add_argument(
+            "--graceful-timeout",
+            type=int,
+            default=None,
+            help="Seconds workers get to finish requests on shutdown or "
+            "reload. Defaults to SERVER_GRACEFUL_TIMEOUT.",
+        )
+        parser.add_argument(
+            "--no-preload",
+            action="store_true",
+            help="Import the app in every worker instead of once in the "
+            "master (no copy-on-write sharing).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the server command instead of running it.",
+        )
+
+    def option(self, options: dict, name: str) -> Any:
+        """The command-line value of ``name``, or ``SERVER_<NAME>``."""
+        if options[name] is not None:
+            return options[name]
+        return getattr(settings, f"SERVER_{name.upper()}")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        mode: str = options["mode"]
+        server: str = options["server"]
+        if server == "uvicorn" and mode != "asgi":
+            self.stdout.write(
+                self.style.ERROR("uvicorn only serves --mode asgi.")
+            )
+            return
+        required: List[str] = [server]
+        if mode == "asgi":
+            required.append("uvicorn")
+        missing: List[str] = [
+            name for name in dict.fromkeys(required) if find_spec(name) is None
+        ]
+        if missing:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Not installed: {', '.join(missing)}. Install the "
+                    "project's dependencies (pyproject.toml)."
+                )
+            )
+            return
+
+        cpus: int = available_cpus()
+        config = ServerConfig(
+            mode=mode,
+            server=server,
+            profile=options["profile"],
+            bind=self.option(options, "bind"),
+            workers=(
+                options["workers"]
+                or settings.SERVER_WORKERS
+                or default_workers(mode, cpus)
+            ),
+            threads=self.option(options, "threads"),
+            preload=server == "gunicorn" and not options["no_preload"],
+            max_requests=self.option(options, "max_requests"),
+            max_requests_jitter=self.option(options, "max_requests_jitter"),
+            keepalive=self.option(options, "keepalive"),
+            timeout=self.option(options, "timeout"),
+            graceful_timeout=self.option(options, "graceful_timeout"),
+            pidfile=settings.SERVER_PIDFILE,
+        )
+        if config.workers < 1 or config.threads < 1:
+            self.stdout.write(
+                self.style.ERROR("--workers and --threads must be >= 1.")
+            )
+            return
+
+        if PROFILES[config.profile].debug:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"The {config.profile} profile runs with DEBUG on; use "
+                    "--profile production for real traffic."
+                )
+            )
+        if server == "uvicorn":
+            self.stdout.write(
+                self.style.WARNING(
+                    "uvicorn imports the app in every worker (no preload) "
+                    "and does not recycle with jitter; prefer gunicorn "
+                    "where it runs."
+                )
+            )
+        if settings.METRICS_DIR and not options["dry_run"]:
+            self.clear_metrics(settings.METRICS_DIR)
+        elif settings.METRICS_ENABLED and config.workers > 1:
+            self.stdout.write(
+                self.style.WARNING(
+                    "METRICS_DIR is not set: /metrics will only show the "
+                    "worker that answers the scrape."
+                )
+            )
+
+        units: str = (
+            f"{config.workers} x {config.threads} threads"
+            if config.worker_class == "gthread"
+            else f"{config.workers} workers"
+        )
+        kind: str = (
+            f"{mode}, {config.worker_class}" if server == "gunicorn" else mode
+        )
+        self.stdout.write(
+            f"{server} ({kind}) with {units} on "
+            f"{config.bind}, {config.profile} profile, {cpus} CPUs "
+            "available."
+        )
+        argv: List[str] = config.argv()
+        if options["dry_run"]:
+            self.stdout.write(
+                f"DJANGO_SETTINGS_MODULE=project.settings.{config.profile} "
+                f"DJANGO_PROFILE={config.profile} {shlex.join(argv)}"
+            )
+            return
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execve(argv[0], argv, config.environ())
+
+    def clear_metrics(self, directory: str) -> None:
+        # Counts of exited workers are kept in the aggregate file until
+        # the next start; a new server starts from zero.
+        for path in Path(directory).glob(f"*{FILE_SUFFIX}"):
+            path.unlink(missing_ok=True)
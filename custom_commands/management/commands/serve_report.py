@@ -0,0 +1,85 @@
+from django.conf import settings
+from argparse import ArgumentParser
+from typing import Any, List, Optional
+
+from custom_commands.management.base import NoChecksCommand
+from project.server import ProcessMemory, children, process_memory
+from project.server.config import read_pidfile
+from project.server.memory import supported
+
+MB: int = 1024 * 1024
+
+
+class Command(NoChecksCommand):
+    help: str = (
+        "Reports the memory of a running server started with "
+        "'manage.py serve': RSS, PSS (shared pages split between their "
+        "users) and private memory of the master and each worker."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--pid",
+            type=int,
+            default=None,
+            help="Master process id. Defaults to the one in SERVER_PIDFILE.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not supported():
+            self.stdout.write(
+                self.style.ERROR("The memory report needs Linux's /proc.")
+            )
+            return
+        master: Optional[int] = options["pid"] or read_pidfile(
+            settings.SERVER_PIDFILE
+        )
+        if master is None:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"No server pid in {settings.SERVER_PIDFILE}; pass --pid."
+                )
+            )
+            return
+        master_usage: Optional[ProcessMemory] = process_memory(master)
+        if master_usage is None:
+            self.stdout.write(
+                self.style.ERROR(f"Process {master} is not running.")
+            )
+            return
+
+        workers: List[ProcessMemory] = [
+            usage
+            for usage in map(process_memory, children(master))
+            if usage is not None
+        ]
+        self.stdout.write(
+            f"{'pid':>8}  {'role':<8}{'RSS MB':>10}{'PSS MB':>10}"
+            f"{'private MB':>12}{'shared MB':>11}{'swap MB':>9}"
+        )
+        for role, usage in [("master", master_usage)] + [
+            ("worker", usage) for usage in workers
+        ]:
+            self.stdout.write(
+                f"{usage.pid:>8}  {role:<8}{usage.rss / MB:>10.1f}"
+                f"{usage.pss / MB:>10.1f}{usage.uss / MB:>12.1f}"
+                f"{usage.shared / MB:>11.1f}{usage.swap / MB:>9.1f}"
+            )
+
+        total: float = (
+            master_usage.pss + sum(usage.pss for usage in workers)
+        ) / MB
+        self.stdout.write(f"Total (sum of PSS): {total:.1f} MB")
+        if workers:
+            private: float = sum(usage.uss for usage in workers) / MB
+            rss: float = sum(usage.rss for usage in workers) / MB
+            self.stdout.write(
+                f"Per worker: {private / len(workers):.1f} MB private; "
+                f"{100 * (1 - private / rss):.0f}% of worker RSS is shared "
+                "(copy-on-write pages from --preload, libraries)."
+            )
+            self.stdout.write(
+                f"An extra worker costs about {private / len(workers):.1f} "
+                f"MB: kill -TTIN {master} adds one, kill -TTOU {master} "
+                "removes one."
+            )
@@ -1,10 +1,10 @@
-from django.core.management.base import BaseCommand
+from custom_commands.management.base import NoChecksCommand
 from django.core.management.utils import get_random_secret_key
 from pathlib import Path
 from typing import List
 
 
-class Command(BaseCommand):
+class Command(NoChecksCommand):
     help: str = "Generates and sets a random secret key in the .env file."
 
     def handle(self, *args: object, **options: object) -> None:
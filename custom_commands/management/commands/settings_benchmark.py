@@ -0,0 +1,108 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List
+
+from custom_commands.management.base import NoChecksCommand
+from project.settings.profiles import PROFILES
+
+# Runs in a fresh interpreter per sample so every measurement is a cold
+# start, the way a new worker or a cron'd management command starts.
+SETUP_SCRIPT: str = """
+import json, sys, time
+modules = len(sys.modules)
+started = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "setup_ms": elapsed * 1000,
+    "modules": len(sys.modules) - modules,
+    "apps": len(settings.INSTALLED_APPS),
+}))
+"""
+
+# Enough for every profile to import without real services; nothing
+# connects during setup.
+PLACEHOLDERS: Dict[str, str] = {
+    "DJANGO_SECRET_KEY": "settings-benchmark",
+    "REDIS_URL": "redis://localhost:6379/0",
+}
+
+
+class Command(NoChecksCommand):
+    help: str = (
+        "Reports cold-start django.setup() time and the number of modules "
+        "it imports for each settings profile."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            choices=list(PROFILES),
+            default=list(PROFILES),
+            help="Profiles to measure.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Fresh processes per profile.",
+        )
+
+    def sample(self, profile: str, root: Path) -> Dict[str, Any]:
+        env: Dict[str, str] = {**PLACEHOLDERS, **os.environ}
+        env["DJANGO_SETTINGS_MODULE"] = f"project.settings.{profile}"
+        env.pop("DJANGO_PROFILE", None)
+
+        started: float = perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", SETUP_SCRIPT],
+            cwd=root,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        sample: Dict[str, Any] = json.loads(
+            result.stdout.strip().splitlines()[-1]
+        )
+        sample["process_ms"] = (perf_counter() - started) * 1000
+        return sample
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        root: Path = Path(__file__).resolve().parent.parent.parent.parent
+
+        self.stdout.write(
+            f"{'profile':<12}{'setup ms':>10}{'min ms':>9}{'process ms':>12}"
+            f"{'modules':>9}{'apps':>6}"
+        )
+        for profile in options["profiles"]:
+            try:
+                samples: List[Dict[str, Any]] = [
+                    self.sample(profile, root) for _ in range(options["runs"])
+                ]
+            except RuntimeError as e:
+                self.stdout.write(
+                    self.style.ERROR(f"{profile:<12}failed: {e}")
+                )
+                continue
+
+            setup: List[float] = [sample["setup_ms"] for sample in samples]
+            process: float = statistics.median(
+                sample["process_ms"] for sample in samples
+            )
+            self.stdout.write(
+                f"{profile:<12}{statistics.median(setup):>10.1f}"
+                f"{min(setup):>9.1f}{process:>12.1f}"
+                f"{samples[-1]['modules']:>9}{samples[-1]['apps']:>6}"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
@@ -1,18 +1,144 @@
-from django.core.management.base import BaseCommand
+from custom_commands.management.base import NoChecksCommand
+from django.apps import apps
+from django.db import models
+from argparse import ArgumentParser
 from pathlib import Path
-from typing import Optional
-
-
-class Command(BaseCommand):
-    help: str = "Setup a view and its serializers for CRUD operations."
+from typing import Any, Dict, List, Optional
+
+# Columns that are usually large and not needed on list pages; they are
+# left out of the list serializer (and therefore not selected).
+HEAVY_FIELD_TYPES = (models.TextField, models.JSONField, models.BinaryField)
+
+
+def format_list(items: List[str], indent: int, start: int) -> str:
+    """
+    Render a list literal of strings starting at column ``start`` of a line
+    indented by ``indent``, one item per line when it would not fit.
+    """
+    inline: str = "[" + ", ".join(f'"{item}"' for item in items) + "]"
+    if start + len(inline) <= 79:
+        return inline
+    padding: str = " " * (indent + 4)
+    lines: str = "".join(f'{padding}"{item}",\n' for item in items)
+    return f"[\n{lines}{' ' * indent}]"
+
+
+class Command(NoChecksCommand):
+    help: str = (
+        "Setup a query-optimized ModelViewSet, its serializers and a "
+        "query-count test for a model."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "model",
+            type=str,
+            help="Model to expose, as 'app_label.ModelName'.",
+        )
+        parser.add_argument(
+            "--view-name",
+            type=str,
+            default=None,
+            help="View module name ending with '_view'. Defaults to "
+            "'<model_name>_view'.",
+        )
+        parser.add_argument(
+            "--list-fields",
+            type=str,
+            default=None,
+            help="Comma separated fields for the list serializer. Defaults "
+            "to every field except large text/JSON/binary columns.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=50,
+            help="Cursor pagination page size.",
+        )
+        parser.add_argument(
+            "--cache-timeout",
+            type=int,
+            default=0,
+            help="Cache list/retrieve responses for this many seconds "
+            "(0 disables response caching).",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help="Generate an async viewset and serializers (see "
+            "project/api/async_views.py) for the ASGI request path.",
+        )
 
-    def handle(self, *args: object, **options: object) -> None:
-        view_name: str = input("Enter your view name:\n").strip().lower()
+    def introspect(
+        self, model: type[models.Model], list_fields: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Collect the fields and relations the serializers will touch."""
+        concrete: List[models.Field] = list(model._meta.concrete_fields)
+        many_to_many: List[models.Field] = list(model._meta.many_to_many)
+
+        if list_fields is None:
+            list_fields = [
+                field.name
+                for field in concrete
+                if not isinstance(field, HEAVY_FIELD_TYPES)
+            ] + [field.name for field in many_to_many]
+
+        m2m_names: List[str] = [field.name for field in many_to_many]
+        has_created_at: bool = any(
+            field.name == "created_at" for field in concrete
+        )
+        has_updated_at: bool = any(
+            field.name == "updated_at" for field in concrete
+        )
+        field_names = {field.name for field in concrete} | set(m2m_names)
+        unknown: List[str] = [f for f in list_fields if f not in field_names]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        return {
+            "list_fields": list_fields,
+            # Many-to-many fields of list rows: one query each per page.
+            "list_many_to_many": [
+                field for field in many_to_many if field.name in list_fields
+            ],
+            "select_related": [
+                field.name for field in concrete if field.is_relation
+            ],
+            "prefetch_related": m2m_names,
+            "ordering": (
+                '("-created_at", "-pk")' if has_created_at else '("-pk",)'
+            ),
+            # ConditionalGetMixin derives ETags from it.
+            "has_updated_at": has_updated_at,
+        }
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["use_async"] and options["cache_timeout"]:
+            self.stdout.write(
+                self.style.ERROR(
+                    "--cache-timeout is not supported with --async: "
+                    "cache_response wraps sync actions only."
+                )
+            )
+            return
 
-        if not view_name:
-            self.stdout.write(self.style.ERROR("View name is required"))
+        try:
+            model: type[models.Model] = apps.get_model(options["model"])
+        except (LookupError, ValueError):
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Model '{options['model']}' not found. Use "
+                    "'app_label.ModelName'."
+                )
+            )
             return
 
+        view_name: str = (
+            (options["view_name"] or f"{model._meta.model_name}_view")
+            .strip()
+            .lower()
+        )
         if "_" not in view_name or not view_name.endswith("_view"):
             self.stdout.write(
                 self.style.ERROR(
@@ -21,29 +147,30 @@ class Command(BaseCommand):
             )
             return
 
-        app_name: str = input("Enter your app name:\n").strip().lower()
-        if not app_name:
-            self.stdout.write(self.style.ERROR("App name is required"))
+        list_fields: Optional[List[str]] = (
+            [f.strip() for f in options["list_fields"].split(",") if f.strip()]
+            if options["list_fields"]
+            else None
+        )
+        try:
+            plan: Dict[str, Any] = self.introspect(model, list_fields)
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
             return
 
-        # Define root directory and paths
-        root_directory: Path = (
-            Path(__file__).resolve().parent.parent.parent.parent
-        )
-        app_directory: Path = root_directory / app_name
+        # Define paths
+        app_config = apps.get_app_config(model._meta.app_label)
+        app_directory: Path = Path(app_config.path)
+        resource_name: str = view_name.replace("_view", "")
         view_path: Path = app_directory / "views" / f"{view_name}.py"
         serializer_path: Path = (
-            app_directory
-            / "serializers"
-            / f"{view_name.replace('_view', '')}_serializer.py"
+            app_directory / "serializers" / f"{resource_name}_serializer.py"
         )
-
-        # Check if the app exists
-        if not app_directory.exists():
-            self.stdout.write(
-                self.style.ERROR(f"App '{app_name}' does not exist.")
-            )
-            return
+        tests_directory: Path = app_directory / "tests"
+        if not tests_directory.is_dir() and (app_directory / "tests.py").exists():
+            # A tests.py module and a tests/ package cannot coexist.
+            tests_directory = app_directory
+        test_path: Path = tests_directory / f"test_{view_name}.py"
 
         # Check if the view already exists
         if view_path.exists():
@@ -53,83 +180,323 @@ class Command(BaseCommand):
             return
 
         # Generate class names
-        viewset_name: str = "".join(
-            word.capitalize() for word in view_name.split("_")
+        class_name: str = "".join(
+            word.capitalize() for word in resource_name.split("_")
         )
-        class_name: str = viewset_name.replace("View", "")
+        model_name: str = model.__name__
+        model_module: str = model.__module__
+        namespace: str = model._meta.label_lower
 
-        # Serializer content (generic placeholder)
-        serializer_content: str = f"""from rest_framework import serializers
+        serializer_content: str = self.serializer_content(
+            class_name, model_name, model_module, plan, options["use_async"]
+        )
+        view_content: str = self.view_content(
+            view_name,
+            resource_name,
+            class_name,
+            model_name,
+            model_module,
+            namespace,
+            plan,
+            options,
+        )
+        test_content: str = self.test_content(
+            view_name,
+            class_name,
+            model_name,
+            model_module,
+            app_config,
+            plan,
+            options["use_async"],
+            bool(options["cache_timeout"]),
+        )
 
+        try:
+            for path, content in (
+                (serializer_path, serializer_content),
+                (view_path, view_content),
+                (test_path, test_content),
+            ):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                init_file: Path = path.parent / "__init__.py"
+                if not init_file.exists():
+                    init_file.touch()
+                with path.open("w") as file:
+                    file.write(content)
 
-class {class_name}ListSerializer(serializers.BaseSerializer):
-    pass
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"ViewSet, serializers and tests for '{view_name}' created successfully."
+                )
+            )
+            self.stdout.write(
+                "Register it with a router, e.g.:\n"
+                f'    router.register("{resource_name}", {class_name}ViewSet)'
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Creation failed: {e}"))
+
+    def serializer_content(
+        self,
+        class_name: str,
+        model_name: str,
+        model_module: str,
+        plan: Dict[str, Any],
+        use_async: bool = False,
+    ) -> str:
+        labels: str = "".join(
+            f"    {name}_label = serializers.StringRelatedField(\n"
+            f'        source="{name}", read_only=True\n'
+            f"    )\n"
+            for name in plan["select_related"]
+        )
+        if labels:
+            labels = (
+                "    # Labels of related objects; the viewset joins them with\n"
+                "    # select_related.\n" + labels + "\n"
+            )
+        # Create/update go through the async ORM; list and retrieve only
+        # serialize rows the viewset already loaded.
+        write_base: str = (
+            "AsyncModelSerializer"
+            if use_async
+            else "serializers.ModelSerializer"
+        )
+        async_import: str = (
+            "from project.api.async_views import AsyncModelSerializer\n"
+            if use_async
+            else ""
+        )
+        return f"""from rest_framework import serializers
+
+{async_import}from project.api.serializers import ValuesSerializer
+from {model_module} import {model_name}
 
 
-class Create{class_name}Serializer(serializers.BaseSerializer):
-    pass
+class {class_name}ListSerializer(ValuesSerializer):
+    # Renders .values() rows, without model instances. Relations are
+    # rendered as primary keys, so list rows need no joins.
+    class Meta:
+        model = {model_name}
+        fields = {format_list(plan["list_fields"], 8, 17)}
 
 
-class Retrieve{class_name}Serializer(serializers.BaseSerializer):
-    pass
+class Create{class_name}Serializer({write_base}):
+    class Meta:
+        model = {model_name}
+        fields = "__all__"
 
 
-class Update{class_name}Serializer(serializers.BaseSerializer):
-    pass
+class Retrieve{class_name}Serializer(serializers.ModelSerializer):
+{labels}    class Meta:
+        model = {model_name}
+        fields = "__all__"
 
 
-class Destroy{class_name}Serializer(serializers.BaseSerializer):
-    pass
+class Update{class_name}Serializer({write_base}):
+    class Meta:
+        model = {model_name}
+        fields = "__all__"
 """
 
-        # View content with serializer imports
-        view_content: str = f"""from rest_framework.viewsets import ViewSet
-from rest_framework.response import Response
-from rest_framework import status
-from django.shortcuts import get_object_or_404
+    def view_content(
+        self,
+        view_name: str,
+        resource_name: str,
+        class_name: str,
+        model_name: str,
+        model_module: str,
+        namespace: str,
+        plan: Dict[str, Any],
+        options: Dict[str, Any],
+    ) -> str:
+        cache_timeout: int = options["cache_timeout"]
+        # ConditionalGetMixin is a CacheInvalidationMixin: writes drop the
+        # cached responses and list ETags together.
+        cache_imports: str = (
+            "from project.cache import cache_response\n"
+            if cache_timeout
+            else ""
+        )
+        cached_actions: str = (
+            f"""
+    @cache_response(namespace=cache_namespace, timeout={cache_timeout})
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(namespace=cache_namespace, timeout={cache_timeout})
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+"""
+            if cache_timeout
+            else ""
+        )
+        cache_namespace: str = (
+            f'    cache_namespace = "{namespace}"\n' if cache_timeout else ""
+        )
+
+        if options["use_async"]:
+            base_import: str = (
+                "from project.api.async_views import AsyncModelViewSet\n"
+                "from project.api.conditional import "
+                "AsyncConditionalGetMixin\n"
+            )
+            bases: str = "AsyncConditionalGetMixin, AsyncModelViewSet"
+        else:
+            base_import = (
+                "from project.api.conditional import ConditionalGetMixin\n"
+            )
+            bases = "ConditionalGetMixin, ModelViewSet"
+        third_party: str = (
+            ""
+            if options["use_async"]
+            else "from rest_framework.viewsets import ModelViewSet\n"
+        )
+        if third_party:
+            third_party += "\n"
+
+        return f"""{third_party}{base_import}from project.api.pagination import KeysetCursorPagination
+{cache_imports}from {model_module} import {model_name}
 
 # Import serializers
-from ..serializers.{view_name.replace('_view', '')}_serializer import (
+from ..serializers.{resource_name}_serializer import (
     {class_name}ListSerializer,
     Create{class_name}Serializer,
     Retrieve{class_name}Serializer,
     Update{class_name}Serializer,
-    Destroy{class_name}Serializer,
 )
 
 
-class {viewset_name}ViewSet(ViewSet):
-    def list(self, request):
-        pass
-
-    def create(self, request):
-        pass
-
-    def retrieve(self, request, pk):
-        pass
+class {class_name}CursorPagination(KeysetCursorPagination):
+    ordering = {plan["ordering"]}
+    page_size = {options["page_size"]}
+    max_page_size = {options["page_size"] * 4}
+
+
+class {class_name}ViewSet({bases}):
+    queryset = {model_name}.objects.all()
+    pagination_class = {class_name}CursorPagination
+{cache_namespace}    # Clients revalidate every request; unchanged data is answered with 304.
+    cache_control = {{"private": True, "no_cache": True}}
+    # GET requests read from DB_REPLICAS, if any (see project/db/replicas).
+    use_read_replica = True
+    serializer_class = Retrieve{class_name}Serializer
+    serializer_classes = {{
+        "list": {class_name}ListSerializer,
+        "create": Create{class_name}Serializer,
+        "retrieve": Retrieve{class_name}Serializer,
+        "update": Update{class_name}Serializer,
+        "partial_update": Update{class_name}Serializer,
+    }}
+
+    # Columns read by {class_name}ListSerializer, and the cursor's.
+    list_columns = {class_name}ListSerializer.columns(
+        *{class_name}CursorPagination.ordering
+    )
+    # Relations read by Retrieve{class_name}Serializer.
+    select_related_fields = {format_list(plan["select_related"], 4, 28)}
+    prefetch_related_fields = {format_list(plan["prefetch_related"], 4, 30)}
+
+    def get_serializer_class(self):
+        return self.serializer_classes.get(self.action, self.serializer_class)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            return queryset.values(*self.list_columns)
+        if self.action == "retrieve":
+            return queryset.select_related(
+                *self.select_related_fields
+            ).prefetch_related(*self.prefetch_related_fields)
+        return queryset
+{cached_actions}"""
+
+    def test_content(
+        self,
+        view_name: str,
+        class_name: str,
+        model_name: str,
+        model_module: str,
+        app_config: Any,
+        plan: Dict[str, Any],
+        use_async: bool = False,
+        cached: bool = False,
+    ) -> str:
+        # ConditionalGetMixin's list ETag is read from the cache, not the
+        # database.
+        list_queries: int = 1 + len(plan["list_many_to_many"])
+        # The cache outlives each test's transaction: start every test on
+        # a fresh version of the namespace.
+        cache_import: str = (
+            "from project.cache import bump_version\n" if cached else ""
+        )
+        cache_reset: str = (
+            f"        bump_version({class_name}ViewSet.cache_namespace)\n"
+            if cached
+            else ""
+        )
+        retrieve_queries: int = 1 + len(plan["prefetch_related"])
+        # Async views return coroutines; async_to_sync runs them while
+        # their ORM calls come back to this thread and its test
+        # transaction.
+        run_sync: str = (
+            "        view = async_to_sync(view)\n" if use_async else ""
+        )
+        async_import: str = (
+            "from asgiref.sync import async_to_sync\n" if use_async else ""
+        )
+        conditional_test: str = (
+            f"""
+    def test_unchanged_list_is_not_modified(self):
+        view = {class_name}ViewSet.as_view(
+            {{"get": "list"}}, throttle_classes=[]
+        )
+{run_sync}        response = view(self.factory.get("/"))
+        # Nothing is queried or serialized.
+        with self.assertNumQueries(0):
+            response = view(
+                self.factory.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+            )
+        self.assertEqual(response.status_code, 304)
+"""
+            if plan["has_updated_at"]
+            else ""
+        )
+        return f"""{async_import}from django.test import TestCase
+from rest_framework.test import APIRequestFactory
 
-    def update(self, request):
-        pass
+{cache_import}from project.testing import make_instance
+from {model_module} import {model_name}
+from {app_config.name}.views.{view_name} import {class_name}ViewSet
 
-    def destroy(self, request):
-        pass
-"""
 
-        try:
-            # Write the serializer file
-            serializer_path.parent.mkdir(parents=True, exist_ok=True)
-            with serializer_path.open("w") as serializer_file:
-                serializer_file.write(serializer_content)
+class {class_name}ViewSetQueryCountTest(TestCase):
+    # Query counts must not grow with the number of rows; if one of these
+    # fails after a serializer change, update the viewset's
+    # select_related_fields / prefetch_related_fields.
 
-            # Write the view file
-            view_path.parent.mkdir(parents=True, exist_ok=True)
-            with view_path.open("w") as view_file:
-                view_file.write(view_content)
+    @classmethod
+    def setUpTestData(cls):
+        cls.instances = [make_instance({model_name}) for _ in range(5)]
 
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"ViewSet and serializers for '{view_name}' created successfully."
-                )
-            )
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Creation failed: {e}"))
+    def setUp(self):
+        self.factory = APIRequestFactory()
+{cache_reset}
+    def test_list_query_count(self):
+        view = {class_name}ViewSet.as_view(
+            {{"get": "list"}}, throttle_classes=[]
+        )
+{run_sync}        with self.assertNumQueries({list_queries}):
+            response = view(self.factory.get("/"))
+            response.render()
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_query_count(self):
+        view = {class_name}ViewSet.as_view(
+            {{"get": "retrieve"}}, throttle_classes=[]
+        )
+{run_sync}        with self.assertNumQueries({retrieve_queries}):
+            response = view(self.factory.get("/"), pk=self.instances[0].pk)
+            response.render()
+        self.assertEqual(response.status_code, 200)
+{conditional_test}"""
@@ -1,9 +1,9 @@
-from django.core.management.base import BaseCommand
+from custom_commands.management.base import NoChecksCommand
 from pathlib import Path
 
 
-class Command(BaseCommand):
-    help = "Create a new Django app with a custom structure and add it to all settings files."
+class Command(NoChecksCommand):
+    help = "Create a new Django app with a custom structure and add it to PROJECT_APPS."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -49,10 +49,19 @@ class {app_name.capitalize()}Config(AppConfig):
     name = "{app_name}"
 """,
             "models.py": "from django.db import models\n\n# Create your models here.\n",
-            "tests.py": "from django.test import TestCase\n\n# Create your tests here.\n",
+            "tests/__init__.py": "",
             "views/__init__.py": "",
             "serializers/__init__.py": "",
-            "services/__init__.py": "",
+            "services/__init__.py": """from project.services import BulkWriteService  # noqa: F401
+
+# Add your services here. `manage.py add_model` appends a BulkWriteService
+# subclass for every model it creates; set unique_fields to upsert():
+#
+# class ArticleBulkService(BulkWriteService):
+#     model = Article
+#     unique_fields = ["slug"]
+#     batch_size = 2000
+""",
             "migrations/__init__.py": "",
         }
 
@@ -69,74 +78,55 @@ class {app_name.capitalize()}Config(AppConfig):
             )
         )
 
-        # Settings file paths
-        settings_files = [
-            root_directory / "project" / "settings" / "local.py",
-            root_directory / "project" / "settings" / "dev.py",
-            root_directory / "project" / "settings" / "qa.py",
-            root_directory / "project" / "settings" / "production.py",
-        ]
-
-        # Add app to INSTALLED_APPS in settings files
-        for settings_file in settings_files:
-            if not settings_file.exists():
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"Settings file '{settings_file.name}' not found."
-                    )
-                )
-                continue
+        # Every profile shares PROJECT_APPS in base.py
+        settings_file = root_directory / "project" / "settings" / "base.py"
+        app_line = f'    "{app_name}",\n'
 
+        try:
+            with settings_file.open("r") as file:
+                settings_content = file.readlines()
+
+            # Locate the PROJECT_APPS block
             try:
-                with settings_file.open("r") as file:
-                    settings_content = file.readlines()
-
-                # Locate the INSTALLED_APPS block
-                try:
-                    start_index = next(
-                        i
-                        for i, line in enumerate(settings_content)
-                        if "INSTALLED_APPS" in line
-                    )
-                    end_index = next(
-                        i
-                        for i in range(start_index, len(settings_content))
-                        if settings_content[i].strip().endswith("]")
-                    )
+                start_index = next(
+                    i
+                    for i, line in enumerate(settings_content)
+                    if line.startswith("PROJECT_APPS")
+                )
+                end_index = next(
+                    i
+                    for i in range(start_index, len(settings_content))
+                    if settings_content[i].strip().endswith("]")
+                )
 
-                    # Check if app is already in INSTALLED_APPS
-                    if (
-                        f"    '{app_name}',\n"
-                        not in settings_content[start_index:end_index]
-                    ):
-                        settings_content.insert(
-                            end_index, f"    '{app_name}',\n"
-                        )
-                        with settings_file.open("w") as file:
-                            file.writelines(settings_content)
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Added '{app_name}' to INSTALLED_APPS in '{settings_file.name}'."
-                            )
-                        )
-                    else:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"'{app_name}' is already present in INSTALLED_APPS in '{settings_file.name}'."
-                            )
+                # Check if app is already in PROJECT_APPS
+                if app_line not in settings_content[start_index:end_index]:
+                    settings_content.insert(end_index, app_line)
+                    with settings_file.open("w") as file:
+                        file.writelines(settings_content)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Added '{app_name}' to PROJECT_APPS in '{settings_file.name}'."
                         )
-                except StopIteration:
+                    )
+                else:
                     self.stdout.write(
                         self.style.WARNING(
-                            f"Could not locate INSTALLED_APPS in '{settings_file.name}'. Add the app manually."
+                            f"'{app_name}' is already present in PROJECT_APPS in '{settings_file.name}'."
                         )
                     )
-            except Exception as e:
+            except StopIteration:
                 self.stdout.write(
-                    self.style.ERROR(
-                        f"Error updating '{settings_file.name}': {str(e)}"
+                    self.style.WARNING(
+                        f"Could not locate PROJECT_APPS in '{settings_file.name}'. Add the app manually."
                     )
                 )
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Error updating '{settings_file.name}': {str(e)}"
+                )
+            )
 
         self.stdout.write(
             self.style.SUCCESS(f"App '{app_name}' setup completed.")
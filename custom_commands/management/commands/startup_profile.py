@@ -0,0 +1,189 @@
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.apps import apps
+
+from custom_commands.management.base import NoChecksCommand
+
+SETUP_SCRIPT: str = "import django; django.setup()"
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    parent: Optional[str] = None
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parse ``python -X importtime`` output. Children are printed before
+    their parent, one indentation level deeper, so a record's parent is the
+    next record with a smaller depth.
+    """
+    records: List[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        stripped: str = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=stripped.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped)) // 2,
+            )
+        )
+    pending: List[ImportRecord] = []
+    for record in records:
+        while pending and pending[-1].depth > record.depth:
+            pending.pop().parent = record.module
+        pending.append(record)
+    return records
+
+
+class Command(NoChecksCommand):
+    help: str = (
+        "Runs django.setup() (or a management command) under "
+        "'python -X importtime' and ranks import time by package and app."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "target",
+            nargs="*",
+            help="Management command (and arguments) to profile, e.g. "
+            "'check'. Defaults to a bare django.setup().",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Rows per table.",
+        )
+        parser.add_argument(
+            "--compare-lean",
+            action="store_true",
+            help="Also profile with DJANGO_LEAN_STARTUP=1 and compare.",
+        )
+
+    def run(
+        self, target: List[str], lean: Optional[bool]
+    ) -> Tuple[List[ImportRecord], float]:
+        root: Path = Path(__file__).resolve().parent.parent.parent.parent
+        command: List[str] = [sys.executable, "-X", "importtime"]
+        command += (
+            [str(root / "manage.py"), *target]
+            if target
+            else ["-c", SETUP_SCRIPT]
+        )
+        env: Dict[str, str] = dict(os.environ)
+        env.pop("DJANGO_LEAN_STARTUP", None)
+        if lean is not None:
+            env["DJANGO_LEAN_STARTUP"] = "1" if lean else "0"
+
+        started: float = perf_counter()
+        result = subprocess.run(
+            command, cwd=root, env=env, capture_output=True, text=True
+        )
+        elapsed: float = perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        return parse_importtime(result.stderr), elapsed
+
+    def app_owners(self) -> Dict[str, str]:
+        owners: Dict[str, List[str]] = defaultdict(list)
+        for app_config in apps.get_app_configs():
+            owners[app_config.name.split(".")[0]].append(app_config.label)
+        return {
+            package: ", ".join(labels)
+            if len(labels) <= 3
+            else f"{', '.join(labels[:3])}, +{len(labels) - 3}"
+            for package, labels in owners.items()
+        }
+
+    def report(self, records: List[ImportRecord], elapsed: float, top: int):
+        owners: Dict[str, str] = self.app_owners()
+        by_package: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for record in records:
+            by_package[record.package][0] += record.self_us
+            by_package[record.package][1] += 1
+        total_us: int = sum(record.self_us for record in records)
+
+        self.stdout.write(
+            f"{len(records)} modules, {total_us / 1000:.0f} ms importing, "
+            f"{elapsed * 1000:.0f} ms wall clock.\n"
+        )
+        self.stdout.write(
+            f"{'package':<28}{'self ms':>9}{'share':>7}{'modules':>9}  app"
+        )
+        ranked = sorted(by_package.items(), key=lambda item: -item[1][0])
+        for package, (self_us, count) in ranked[:top]:
+            self.stdout.write(
+                f"{package:<28}{self_us / 1000:>9.1f}"
+                f"{self_us / total_us:>7.0%}{count:>9}  "
+                f"{owners.get(package, '-')}"
+            )
+
+        # The import that first pulls a package in is what to defer.
+        self.stdout.write(
+            f"\n{'entry point':<40}{'cumul ms':>9}  imported by"
+        )
+        entries: List[ImportRecord] = [
+            record
+            for record in records
+            if record.parent is None
+            or record.parent.split(".")[0] != record.package
+        ]
+        entries.sort(key=lambda record: -record.cumulative_us)
+        for record in entries[:top]:
+            self.stdout.write(
+                f"{record.module:<40}{record.cumulative_us / 1000:>9.1f}  "
+                f"{record.parent or '-'}"
+            )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        target: List[str] = options["target"]
+        try:
+            records, elapsed = self.run(
+                target, False if options["compare_lean"] else None
+            )
+        except RuntimeError as e:
+            self.stdout.write(self.style.ERROR(f"Profiling failed: {e}"))
+            return
+        self.report(records, elapsed, options["top"])
+
+        if options["compare_lean"]:
+            try:
+                lean_records, lean_elapsed = self.run(target, True)
+            except RuntimeError as e:
+                self.stdout.write(self.style.ERROR(f"Profiling failed: {e}"))
+                return
+            full_ms: float = sum(r.self_us for r in records) / 1000
+            lean_ms: float = sum(r.self_us for r in lean_records) / 1000
+            self.stdout.write(
+                f"\n{'':<8}{'modules':>9}{'import ms':>11}{'wall ms':>9}"
+            )
+            self.stdout.write(
+                f"{'full':<8}{len(records):>9}{full_ms:>11.0f}"
+                f"{elapsed * 1000:>9.0f}"
+            )
+            self.stdout.write(
+                f"{'lean':<8}{len(lean_records):>9}{lean_ms:>11.0f}"
+                f"{lean_elapsed * 1000:>9.0f}"
+            )
+        self.stdout.write(self.style.SUCCESS("Profile completed."))
@@ -0,0 +1,176 @@
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from argparse import SUPPRESS, ArgumentParser
+from typing import Any, Dict, List, Optional
+import os
+import subprocess
+import sys
+import tempfile
+
+import tablib
+from import_export import resources
+
+from project.services import BulkWriteService
+from project.transfer import StreamingExport, import_stream
+
+PREFIX: str = "transfer-benchmark-"
+
+MODES: Dict[str, str] = {
+    "startup": "django.setup() only",
+    "stream-export": "StreamingExport",
+    "tablib-export": "resource.export()",
+    "chunked-import": "import_stream()",
+    "tablib-import": "resource.import_data()",
+}
+
+# Runs argv[1:] and prints its exit code and peak RSS (ru_maxrss).
+LAUNCHER: str = """
+import os, subprocess, sys
+child = subprocess.Popen(sys.argv[1:], stdout=subprocess.DEVNULL)
+_, status, usage = os.wait4(child.pid, 0)
+print(os.waitstatus_to_exitcode(status), usage.ru_maxrss)
+"""
+
+
+class GroupResource(resources.ModelResource):
+    class Meta:
+        model = Group
+        fields = ("id", "name")
+
+
+class GroupBulkService(BulkWriteService):
+    model = Group
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compares the peak RSS of streamed export / chunked import with "
+        "django-import-export's in-memory export() / import_data() at "
+        "several row counts, using auth.Group as the table. Every case "
+        "runs in a fresh process."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000],
+            help="Row counts to benchmark.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Export chunk and import batch size.",
+        )
+        parser.add_argument(
+            "--baseline-limit",
+            type=int,
+            default=20_000,
+            help="Largest row count for import_data(), which saves row by "
+            "row and is too slow beyond that.",
+        )
+        # Internal: run one case in this (fresh) process.
+        parser.add_argument("--child", choices=list(MODES), help=SUPPRESS)
+        parser.add_argument("--file", type=str, help=SUPPRESS)
+
+    def queryset(self) -> Any:
+        return Group.objects.filter(name__startswith=PREFIX).order_by("pk")
+
+    def cleanup(self) -> None:
+        Group.objects.filter(name__startswith=PREFIX).delete()
+
+    def run_child(self, mode: str, path: str, chunk_size: int) -> None:
+        if mode == "stream-export":
+            with open(path, "w", newline="") as file:
+                StreamingExport(
+                    GroupResource(), self.queryset(), chunk_size=chunk_size
+                ).write_to(file)
+        elif mode == "tablib-export":
+            dataset: tablib.Dataset = GroupResource().export(self.queryset())
+            with open(path, "w", newline="") as file:
+                file.write(dataset.csv)
+        elif mode == "chunked-import":
+            with open(path, newline="") as file:
+                import_stream(GroupResource(), file, batch_size=chunk_size)
+        elif mode == "tablib-import":
+            with open(path, newline="") as file:
+                dataset = tablib.Dataset().load(file.read(), format="csv")
+            GroupResource().import_data(dataset, raise_errors=True)
+
+    def peak_rss(
+        self, mode: str, path: str, chunk_size: int
+    ) -> Optional[float]:
+        """Peak RSS in MB of ``mode`` run in a child process."""
+        # A child's peak RSS includes what it inherited at fork, so the
+        # case is started from a small launcher rather than from this
+        # process, which has grown while seeding.
+        launcher = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                LAUNCHER,
+                sys.executable,
+                sys.argv[0],
+                "transfer_benchmark",
+                "--child",
+                mode,
+                "--file",
+                path,
+                "--chunk-size",
+                str(chunk_size),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        exit_code, max_rss = launcher.stdout.split()
+        if int(exit_code):
+            self.stderr.write(launcher.stderr)
+            return None
+        # Kilobytes on Linux, bytes on macOS.
+        divisor: int = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return int(max_rss) / divisor
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size: int = options["chunk_size"]
+        if options["child"]:
+            self.run_child(options["child"], options["file"], chunk_size)
+            return
+
+        self.cleanup()
+        startup: Optional[float] = self.peak_rss("startup", "", chunk_size)
+        self.stdout.write(f"Peak RSS in MB; {MODES['startup']}: {startup:.0f}")
+        columns: List[str] = list(MODES)[1:]
+        self.stdout.write(
+            f"{'rows':>10}" + "".join(f"{MODES[mode]:>24}" for mode in columns)
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "groups.csv")
+            for count in options["rows"]:
+                GroupBulkService(batch_size=chunk_size).create(
+                    Group(name=f"{PREFIX}{number}") for number in range(count)
+                )
+                results: List[str] = []
+                for mode in columns:
+                    if mode == "tablib-import" and (
+                        count > options["baseline_limit"]
+                    ):
+                        results.append("-")
+                        continue
+                    if mode.endswith("import"):
+                        self.cleanup()
+                    rss: Optional[float] = self.peak_rss(
+                        mode, path, chunk_size
+                    )
+                    results.append("failed" if rss is None else f"{rss:.0f}")
+                self.cleanup()
+                self.stdout.write(
+                    f"{count:>10}"
+                    + "".join(f"{result:>24}" for result in results)
+                )
+        self.stdout.write(
+            f"- skipped above {options['baseline_limit']} rows "
+            "(--baseline-limit)."
+        )
+        self.stdout.write(self.style.SUCCESS("Benchmark completed."))
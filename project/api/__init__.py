@@ -0,0 +1,14 @@
+"""
+Project-wide Django REST framework building blocks.
+
+They are wired in as defaults through ``REST_FRAMEWORK`` in the settings:
+keyset pagination (``pagination``), cache-backed throttles
+(``throttling``) and orjson rendering/parsing (``renderers``/``parsers``).
+
+Generated view sets add conditional GET (``conditional``), answered with
+304s even on ``cache_response`` hits; their list pages render
+``.values()`` rows with ``serializers.ValuesSerializer``. The OpenAPI
+schema is served from a per-deploy cache (``schema``).
+``setup_crud_view --async`` generates view sets on ``async_views``, which
+keep ASGI requests on the event loop.
+"""
@@ -0,0 +1,248 @@
+"""
+Async viewsets for the ASGI request path.
+
+DRF's views are synchronous: under ASGI, Django runs each of them in a
+worker thread, one per in-flight request. ``AsyncModelViewSet`` keeps the
+request on the event loop instead:
+
+* ``dispatch`` is a coroutine. Authentication, permission and throttle
+  checks (``initial``) may do blocking I/O (sessions, the cache), so they
+  run in a single ``sync_to_async`` call.
+* Actions use the async ORM (``aget``, ``acreate``, ``asave``,
+  ``adelete``, ``async for``), and serializers subclass
+  ``AsyncModelSerializer``, whose ``ais_valid``, ``asave`` and ``adata``
+  never touch the database from the event loop. List serializers with
+  an ``adata`` of their own (``project.api.serializers``, whose
+  many-to-many fields query while rendering) are awaited the same way.
+
+The async ORM still runs queries in a thread, so per-request latency does
+not improve; the gain is concurrency while requests wait on I/O, e.g.
+``project.http.arequest`` or ``await asyncio.sleep``. Compare with
+``manage.py asgi_benchmark``. Serve with ``project.asgi`` (uvicorn,
+daphne): under WSGI these views run through ``async_to_sync`` per request.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import mixins, serializers, status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSetMixin
+
+
+async def adata(serializer: Any) -> Any:
+    """``serializer.data``, through its ``adata`` if it has one."""
+    if hasattr(serializer, "adata"):
+        return await serializer.adata()
+    return serializer.data
+
+
+class AsyncAPIView(APIView):
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Any:
+        return markcoroutinefunction(super().as_view(**initkwargs))
+
+    async def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler: Any = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response: Any = handler(request, *args, **kwargs)
+            if hasattr(response, "__await__"):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, GenericAPIView):
+    async def aget_object(self) -> Any:
+        queryset: Any = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs: Dict[str, Any] = {
+            self.lookup_field: self.kwargs[lookup_url_kwarg]
+        }
+        try:
+            instance: Any = await queryset.aget(**filter_kwargs)
+        except (
+            queryset.model.DoesNotExist,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise Http404
+        await self.acheck_object_permissions(self.request, instance)
+        return instance
+
+    async def acheck_object_permissions(
+        self, request: Any, instance: Any
+    ) -> None:
+        # BasePermission allows every object; only real checks (which may
+        # query) are worth a thread hop.
+        if any(
+            type(permission).has_object_permission
+            is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        ):
+            await sync_to_async(self.check_object_permissions)(
+                request, instance
+            )
+
+    async def apaginate_queryset(self, queryset: Any) -> Optional[List[Any]]:
+        if self.paginator is None:
+            return None
+        return await sync_to_async(self.paginate_queryset)(queryset)
+
+
+class AsyncViewSetMixin(ViewSetMixin):
+    @classmethod
+    def as_view(cls, actions: Any = None, **initkwargs: Any) -> Any:
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
+
+
+class AsyncGenericViewSet(AsyncViewSetMixin, AsyncGenericAPIView):
+    pass
+
+
+class AsyncModelViewSet(AsyncGenericViewSet):
+    """
+    ``ModelViewSet`` with coroutine actions. Write actions expect an
+    ``AsyncModelSerializer``; override the ``aperform_*`` hooks rather
+    than DRF's ``perform_*``.
+    """
+
+    async def list(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        queryset: Any = self.filter_queryset(self.get_queryset())
+        page: Optional[List[Any]] = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer: Any = self.get_serializer(page, many=True)
+            return self.get_paginated_response(await adata(serializer))
+        objects: List[Any] = [instance async for instance in queryset]
+        return Response(await adata(self.get_serializer(objects, many=True)))
+
+    async def retrieve(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        instance: Any = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+    async def create(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        serializer: Any = self.get_serializer(data=request.data)
+        await serializer.ais_valid(raise_exception=True)
+        await self.aperform_create(serializer)
+        data: Any = await serializer.adata()
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED,
+            headers=self.get_success_headers(data),
+        )
+
+    async def aperform_create(self, serializer: Any) -> None:
+        await serializer.asave()
+
+    get_success_headers = mixins.CreateModelMixin.get_success_headers
+
+    async def update(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        partial: bool = kwargs.pop("partial", False)
+        instance: Any = await self.aget_object()
+        serializer: Any = self.get_serializer(
+            instance, data=request.data, partial=partial
+        )
+        await serializer.ais_valid(raise_exception=True)
+        await self.aperform_update(serializer)
+        return Response(await serializer.adata())
+
+    async def aperform_update(self, serializer: Any) -> None:
+        await serializer.asave()
+
+    async def partial_update(
+        self, request: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        kwargs["partial"] = True
+        return await self.update(request, *args, **kwargs)
+
+    async def destroy(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        instance: Any = await self.aget_object()
+        await self.aperform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def aperform_destroy(self, instance: Any) -> None:
+        await instance.adelete()
+
+
+class AsyncModelSerializer(serializers.ModelSerializer):
+    """
+    ``ModelSerializer`` with async counterparts of ``is_valid``, ``save``
+    and ``data``. Validation and representation may query (related
+    fields, unique validators), so they run in a thread; the writes use
+    the async ORM.
+    """
+
+    async def ais_valid(self, raise_exception: bool = False) -> bool:
+        return await sync_to_async(self.is_valid)(
+            raise_exception=raise_exception
+        )
+
+    async def adata(self) -> Any:
+        return await sync_to_async(lambda: self.data)()
+
+    async def asave(self, **kwargs: Any) -> Any:
+        assert hasattr(self, "_errors"), "Call `.ais_valid()` before saving."
+        assert not self.errors, "Cannot save a serializer with errors."
+        validated_data: Dict[str, Any] = {**self.validated_data, **kwargs}
+        if self.instance is None:
+            self.instance = await self.acreate(validated_data)
+        else:
+            self.instance = await self.aupdate(self.instance, validated_data)
+        return self.instance
+
+    def _pop_many_to_many(
+        self, validated_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        info: Any = model_meta.get_field_info(self.Meta.model)
+        return {
+            name: validated_data.pop(name)
+            for name, relation in info.relations.items()
+            if relation.to_many and name in validated_data
+        }
+
+    async def acreate(self, validated_data: Dict[str, Any]) -> Any:
+        raise_errors_on_nested_writes("create", self, validated_data)
+        many_to_many: Dict[str, Any] = self._pop_many_to_many(validated_data)
+        instance: Any = await self.Meta.model._default_manager.acreate(
+            **validated_data
+        )
+        for name, value in many_to_many.items():
+            await getattr(instance, name).aset(value)
+        return instance
+
+    async def aupdate(
+        self, instance: Any, validated_data: Dict[str, Any]
+    ) -> Any:
+        raise_errors_on_nested_writes("update", self, validated_data)
+        many_to_many: Dict[str, Any] = self._pop_many_to_many(validated_data)
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        await instance.asave()
+        for name, value in many_to_many.items():
+            await getattr(instance, name).aset(value)
+        return instance
@@ -0,0 +1,242 @@
+"""
+Conditional GET for model viewsets.
+
+``ConditionalGetMixin`` derives validators from the model's
+``last_modified_field`` (``updated_at`` on every model ``add_model``
+creates) and answers matching ``If-None-Match`` / ``If-Modified-Since``
+requests with 304 before anything is serialized:
+
+* ``retrieve``: ETag from the primary key and ``updated_at``, and
+  ``Last-Modified`` from ``updated_at``.
+* ``list``: ETag from the version of the viewset's cache namespace (see
+  ``project.cache``) and the full path (page, filters). Reading it is one
+  cache lookup and no query, so the keyset pagination's point of never
+  counting the table holds; a hit skips the page query and the
+  serialization. No ``Last-Modified``: there is no date to give.
+
+The mixin is a ``CacheInvalidationMixin``: creates, updates and deletes
+through the viewset bump the namespace version. Code that writes the
+model elsewhere (the admin, imports, other viewsets) must call
+``bump_version`` on the namespace too, as it must for ``cache_response``,
+or list ETags keep validating the old pages.
+
+ETags also cover the negotiated media type, the user and the code version,
+so a new serializer never validates an old cached body. Changes to related
+rows do not touch ``updated_at``; set ``last_modified_field = None`` on
+viewsets whose representation embeds them.
+
+``cache_control`` is applied to GET/HEAD responses as keyword arguments
+of ``django.utils.cache.patch_cache_control``. The default makes clients
+revalidate every time, which the 304 path makes cheap.
+
+``cache_response`` wraps the mixin's actions, so its hits answer 304s
+themselves from the stored validators; other responses that carry
+validators but skip the mixin are turned into 304s by
+``project.api.middleware.ConditionalGetMiddleware``.
+"""
+
+import functools
+import hashlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from project.cache import CacheInvalidationMixin, get_version
+from project.version import code_version
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[int]:
+    return int(value.timestamp()) if value else None
+
+
+class ConditionalGetMixin(CacheInvalidationMixin):
+    last_modified_field: Optional[str] = "updated_at"
+    cache_control: Dict[str, Any] = {"private": True, "no_cache": True}
+
+    def conditional_enabled(self) -> bool:
+        if not self.last_modified_field:
+            return False
+        if self.request.method not in ("GET", "HEAD"):
+            return False
+        try:
+            self.get_queryset().model._meta.get_field(self.last_modified_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def make_etag(self, *parts: Any) -> str:
+        request = self.request
+        raw: str = "|".join(
+            str(part)
+            for part in (
+                *parts,
+                request.accepted_media_type,
+                getattr(request.user, "pk", None),
+                code_version(),
+            )
+        )
+        digest: str = hashlib.sha256(raw.encode()).hexdigest()[:32]
+        # Weak: equal ETags mean the same data, not byte-identical bodies.
+        return f'W/"{digest}"'
+
+    def not_modified(
+        self, request: Any, etag: str, last_modified: Optional[datetime]
+    ) -> Optional[HttpResponseBase]:
+        return get_conditional_response(
+            request, etag=etag, last_modified=_timestamp(last_modified)
+        )
+
+    def add_validators(
+        self,
+        response: HttpResponseBase,
+        etag: str,
+        last_modified: Optional[datetime],
+    ) -> HttpResponseBase:
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            timestamp: Optional[int] = _timestamp(last_modified)
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def conditional_response(
+        self,
+        request: Any,
+        etag: str,
+        last_modified: Optional[datetime],
+        action: Callable[[], HttpResponseBase],
+    ) -> HttpResponseBase:
+        response: Optional[HttpResponseBase] = self.not_modified(
+            request, etag, last_modified
+        )
+        if response is None:
+            response = action()
+        return self.add_validators(response, etag, last_modified)
+
+    def list_etag(self, request: Any, version: int) -> str:
+        return self.make_etag(
+            self.get_cache_namespace(), version, request.get_full_path()
+        )
+
+    def instance_etag(self, instance: Any) -> Tuple[str, Optional[datetime]]:
+        last_modified: Optional[datetime] = getattr(
+            instance, self.last_modified_field
+        )
+        etag: str = self.make_etag(
+            instance._meta.label,
+            instance.pk,
+            last_modified.isoformat() if last_modified else "",
+        )
+        return etag, last_modified
+
+    def list(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        action = functools.partial(super().list, request, *args, **kwargs)
+        if not self.conditional_enabled():
+            return action()
+
+        version: int = get_version(
+            self.get_cache_namespace(), self.cache_alias
+        )
+        etag: str = self.list_etag(request, version)
+        return self.conditional_response(request, etag, None, action)
+
+    def retrieve(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if not self.conditional_enabled():
+            return super().retrieve(request, *args, **kwargs)
+
+        # Loaded once: permissions are checked before any 304, and the
+        # same instance is serialized on a miss.
+        instance = self.get_object()
+        etag, last_modified = self.instance_etag(instance)
+        return self.conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def finalize_response(
+        self, request: Any, response: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            self.cache_control
+            and request.method in ("GET", "HEAD")
+            and response.status_code in (200, 304)
+            and not response.has_header("Cache-Control")
+        ):
+            patch_cache_control(response, **self.cache_control)
+        return response
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    ``ConditionalGetMixin`` for the async viewsets of
+    ``project.api.async_views``: the object lookup uses the async ORM, the
+    namespace version is read and bumped in a thread, and the wrapped
+    actions are awaited.
+    """
+
+    async def aperform_create(self, serializer: Any) -> None:
+        await super().aperform_create(serializer)
+        await sync_to_async(self.invalidate_cache)()
+
+    async def aperform_update(self, serializer: Any) -> None:
+        await super().aperform_update(serializer)
+        await sync_to_async(self.invalidate_cache)()
+
+    async def aperform_destroy(self, instance: Any) -> None:
+        await super().aperform_destroy(instance)
+        await sync_to_async(self.invalidate_cache)()
+
+    async def aconditional_response(
+        self,
+        request: Any,
+        etag: str,
+        last_modified: Optional[datetime],
+        action: Callable[[], Awaitable[HttpResponseBase]],
+    ) -> HttpResponseBase:
+        response: Optional[HttpResponseBase] = self.not_modified(
+            request, etag, last_modified
+        )
+        if response is None:
+            response = await action()
+        return self.add_validators(response, etag, last_modified)
+
+    async def list(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        # Skip ConditionalGetMixin's sync list for the async base action.
+        action = functools.partial(
+            super(ConditionalGetMixin, self).list, request, *args, **kwargs
+        )
+        if not self.conditional_enabled():
+            return await action()
+
+        version: int = await sync_to_async(get_version)(
+            self.get_cache_namespace(), self.cache_alias
+        )
+        etag: str = self.list_etag(request, version)
+        return await self.aconditional_response(request, etag, None, action)
+
+    async def retrieve(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if not self.conditional_enabled():
+            return await super(ConditionalGetMixin, self).retrieve(
+                request, *args, **kwargs
+            )
+
+        instance = await self.aget_object()
+        etag, last_modified = self.instance_etag(instance)
+
+        async def serialize() -> HttpResponseBase:
+            return Response(self.get_serializer(instance).data)
+
+        return await self.aconditional_response(
+            request, etag, last_modified, serialize
+        )
@@ -0,0 +1,55 @@
+from typing import Any, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+
+class ConditionalGetMiddleware:
+    """
+    Answer GET/HEAD requests with 304 when the response's own ``ETag`` or
+    ``Last-Modified`` matches the request's validators.
+
+    Unlike ``django.middleware.http.ConditionalGetMiddleware`` it never
+    hashes response bodies: only validators set by views (see
+    ``project.api.conditional``) or restored from ``cache_response`` are
+    used, so responses without them cost nothing extra. Under ASGI the
+    check runs on the event loop, without a thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request: Any) -> Any:
+        return self.process_response(
+            request, await self.get_response(request)
+        )
+
+    def process_response(self, request: Any, response: Any) -> Any:
+        if request.method not in ("GET", "HEAD"):
+            return response
+        if response.status_code != 200:
+            return response
+
+        etag: Optional[str] = response.get("ETag")
+        last_modified: Optional[str] = response.get("Last-Modified")
+        if not etag and not last_modified:
+            return response
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                parse_http_date_safe(last_modified) if last_modified else None
+            ),
+            response=response,
+        )
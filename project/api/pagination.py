@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination suited to large tables.
+
+    Pages are fetched with ``WHERE <ordering column> < <cursor>`` instead of
+    ``OFFSET``, so page 10,000 costs the same as page 1, and no
+    ``COUNT(*)`` is issued. The default ordering is the primary key, which
+    is always indexed and unique (a unique ordering also keeps DRF from
+    falling back to offsets within a position). Subclasses that order by
+    another column should index it and add ``"-pk"`` as a tie-breaker.
+    """
+
+    ordering = ("-pk",)
+    page_size_query_param = "page_size"
+    max_page_size = 200
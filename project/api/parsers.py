@@ -0,0 +1,26 @@
+from typing import Any, Mapping, Optional
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` backed by orjson."""
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        parser_context = parser_context or {}
+        encoding: str = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data: bytes = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding).encode()
+            return orjson.loads(data)
+        except (ValueError, UnicodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
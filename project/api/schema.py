@@ -0,0 +1,203 @@
+"""
+OpenAPI schema served from a cache instead of regenerated per request.
+
+drf-spectacular walks every view to build the schema, which gets slow as
+endpoints pile up. ``CachedSpectacularAPIView`` renders each format (and
+API version / language) once per code version, keeps the bytes in the
+cache and optionally in ``API_SCHEMA_DIR`` on disk, and answers repeat
+requests with ``ETag``/``Last-Modified`` and 304s.
+
+Entries are keyed by ``project.version.code_version()``, so a deploy never
+serves a stale schema. Build them ahead of traffic with
+``manage.py build_schema``, otherwise the first request builds them.
+Settings:
+
+* ``API_SCHEMA_DIR``: directory for the on-disk copy (empty: cache only).
+* ``API_SCHEMA_CACHE_TIMEOUT``: seconds an entry lives in the cache.
+
+Schemas that depend on the user (``SERVE_PUBLIC = False``) are never
+cached. Only versions in ``REST_FRAMEWORK["ALLOWED_VERSIONS"]`` and
+languages in ``LANGUAGES`` get their own entry: any other ``?version=``
+or ``?lang=`` is served the default schema, so crawlers cannot make the
+view build (and store) one schema per made-up value.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.settings import api_settings
+
+from project.cache import make_key
+from project.version import code_version
+
+NAMESPACE: str = "openapi-schema"
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    content: bytes
+    etag: str
+    last_modified: float
+
+    @classmethod
+    def from_content(
+        cls, content: bytes, last_modified: Optional[float] = None
+    ) -> "SchemaDocument":
+        digest: str = hashlib.sha256(content).hexdigest()[:32]
+        return cls(
+            content=content,
+            etag=f'"{digest}"',
+            last_modified=last_modified or time.time(),
+        )
+
+
+def _key(fmt: str, version: Optional[str], lang: Optional[str]) -> str:
+    return make_key(
+        NAMESPACE, code_version(), fmt, version or "", lang or ""
+    )
+
+
+def _path(
+    fmt: str, version: Optional[str], lang: Optional[str]
+) -> Optional[Path]:
+    directory: str = getattr(settings, "API_SCHEMA_DIR", "")
+    if not directory:
+        return None
+    # Hashed: nothing from the request ends up in the file name.
+    digest: str = hashlib.sha256(
+        f"{fmt}|{version or ''}|{lang or ''}".encode()
+    ).hexdigest()[:16]
+    root: Path = Path(directory).resolve()
+    name: str = f"schema-{digest}.{fmt}"
+    path: Path = (root / code_version() / name).resolve()
+    if not path.is_relative_to(root):
+        raise SuspiciousFileOperation(
+            f"Schema path {path} is outside API_SCHEMA_DIR."
+        )
+    return path
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Other workers may read the file at any moment: never expose a
+    # partially written one.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".schema-")
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(content)
+    os.replace(tmp_name, path)
+
+
+def get_document(
+    fmt: str,
+    version: Optional[str],
+    lang: Optional[str],
+    build: Callable[[], bytes],
+    refresh: bool = False,
+) -> SchemaDocument:
+    """
+    Return the schema document, looking in the cache, then on disk, then
+    calling ``build``. Whatever is found is copied to the faster tiers.
+    """
+    cache = caches["default"]
+    key: str = _key(fmt, version, lang)
+    path: Optional[Path] = _path(fmt, version, lang)
+
+    document: Optional[SchemaDocument] = None if refresh else cache.get(key)
+    if document is not None:
+        return document
+
+    if not refresh and path is not None and path.exists():
+        document = SchemaDocument.from_content(
+            path.read_bytes(), last_modified=path.stat().st_mtime
+        )
+    else:
+        document = SchemaDocument.from_content(build())
+        if path is not None:
+            _write_atomic(path, document.content)
+
+    cache.set(
+        key,
+        document,
+        timeout=getattr(settings, "API_SCHEMA_CACHE_TIMEOUT", None),
+    )
+    return document
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """``SpectacularAPIView`` backed by ``get_document``."""
+
+    def _get_version_parameter(self, request: Any) -> Optional[str]:
+        # drf-spectacular accepts any ?version= when ALLOWED_VERSIONS is
+        # not set; without configured versions there is one schema.
+        if not api_settings.ALLOWED_VERSIONS:
+            return None
+        return super()._get_version_parameter(request)
+
+    def _get_language(self, request: Any) -> Optional[str]:
+        lang: Optional[str] = request.GET.get("lang")
+        if not settings.USE_I18N or lang not in dict(settings.LANGUAGES):
+            # Unknown languages fall back to the default translation.
+            return None
+        return translation.get_language()
+
+    def _get_schema_response(self, request: Any) -> HttpResponse:
+        if not self.serve_public:
+            return super()._get_schema_response(request)
+
+        version: Optional[str] = (
+            self.api_version
+            or request.version
+            or self._get_version_parameter(request)
+        )
+        renderer = request.accepted_renderer
+
+        def build() -> bytes:
+            response = super(
+                CachedSpectacularAPIView, self
+            )._get_schema_response(request)
+            return renderer.render(
+                response.data,
+                request.accepted_media_type,
+                self.get_renderer_context(),
+            )
+
+        document: SchemaDocument = get_document(
+            renderer.format,
+            version,
+            self._get_language(request),
+            build,
+        )
+
+        response: Optional[HttpResponse] = get_conditional_response(
+            request,
+            etag=document.etag,
+            last_modified=int(document.last_modified),
+        )
+        if response is None:
+            content_type: str = request.accepted_media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(
+                document.content, content_type=content_type
+            )
+            response["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, version)}"'
+            )
+        response["ETag"] = document.etag
+        response["Last-Modified"] = http_date(document.last_modified)
+        # Always revalidate: answering with a 304 is nearly free.
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,311 @@
+"""
+Read-only serializers for list pages, rendered from ``.values()`` rows.
+
+``ModelSerializer`` builds a model instance per row, then runs a
+``get_attribute`` / ``to_representation`` pair per field; on large pages
+that is most of the request's CPU time. ``ValuesSerializer`` works out
+once per class which columns it reads and which of them need converting
+(dates, decimals, UUIDs, files), then renders each row with one
+``itemgetter`` call and one dict::
+
+    class AuthorSerializer(ValuesSerializer):
+        class Meta:
+            model = Author
+            fields = ["id", "name"]
+
+
+    class ArticleListSerializer(ValuesSerializer):
+        author = AuthorSerializer()
+
+        class Meta:
+            model = Article
+            fields = ["id", "title", "author", "tags", "created_at"]
+
+
+    rows = Article.objects.values(*ArticleListSerializer.columns())
+    ArticleListSerializer(rows, many=True).data
+
+Rows are dicts from ``values(*columns())`` or tuples from
+``values_list(*columns())``. The output matches a ``ModelSerializer``
+with the same fields: forward relations and many-to-many fields render
+primary keys. A forward relation declared as a nested
+``ValuesSerializer`` renders the related row instead, read through the
+same query's join (``author__name``). Many-to-many fields cost one query
+per page, like ``prefetch_related``, and list the related keys in the
+related model's ``Meta.ordering`` (then by key). File fields render
+relative URLs: there is no request to make them absolute. Writes are not
+supported.
+"""
+
+import functools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+
+# DRF fields whose representation is the value ``.values()`` returns.
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+)
+
+
+def _getter(keys: Sequence[Any]) -> Callable[[Any], Tuple[Any, ...]]:
+    """``itemgetter`` that returns a tuple even for a single key."""
+    if len(keys) == 1:
+        key: Any = keys[0]
+        return lambda row: (row[key],)
+    return itemgetter(*keys)
+
+
+def _converter(
+    model_field: models.Field, drf_field: serializers.Field
+) -> Callable[[Any], Any]:
+    if isinstance(model_field, models.FileField):
+        # .values() returns the file name; DRF expects a FieldFile.
+        return lambda name: drf_field.to_representation(
+            model_field.attr_class(None, model_field, name)
+        )
+    return drf_field.to_representation
+
+
+@dataclass
+class Plan:
+    """What a ``ValuesSerializer`` class reads and how it renders it."""
+
+    # Output keys in Meta.fields order and the lookup read for each.
+    keys: List[str] = field(default_factory=list)
+    lookups: List[str] = field(default_factory=list)
+    converters: List[Tuple[str, Callable[[Any], Any]]] = field(
+        default_factory=list
+    )
+    nested: List[Tuple[str, "Plan"]] = field(default_factory=list)
+    # (key, through model, owner column, related column, ordering)
+    many: List[Tuple[str, type[models.Model], str, str, List[str]]] = field(
+        default_factory=list
+    )
+    columns: List[str] = field(default_factory=list)
+    # Row getters by lookup (dict rows) and by position (tuple rows).
+    by_name: Callable[[Any], Tuple[Any, ...]] = tuple
+    by_index: Callable[[Any], Tuple[Any, ...]] = tuple
+
+    def bind(self, columns: List[str]) -> None:
+        positions: Dict[str, int] = {
+            column: index for index, column in enumerate(columns)
+        }
+        self.by_name = _getter(self.lookups)
+        self.by_index = _getter([positions[name] for name in self.lookups])
+        for _, plan in self.nested:
+            plan.bind(columns)
+
+    def represent(
+        self, rows: Sequence[Any], by_index: bool
+    ) -> List[Dict[str, Any]]:
+        get: Callable[[Any], Tuple[Any, ...]] = (
+            self.by_index if by_index else self.by_name
+        )
+        keys: List[str] = self.keys
+        items: List[Dict[str, Any]] = [
+            dict(zip(keys, get(row))) for row in rows
+        ]
+        for key, convert in self.converters:
+            for item in items:
+                value: Any = item[key]
+                if value is not None:
+                    item[key] = convert(value)
+        for key, plan in self.nested:
+            for item, child in zip(items, plan.represent(rows, by_index)):
+                # The key holds the foreign key until here; null stays.
+                if item[key] is not None:
+                    item[key] = child
+        if self.many and items:
+            pks: List[Any] = [
+                row[0] if by_index else row["pk"] for row in rows
+            ]
+            for key, through, owner, related, ordering in self.many:
+                values: Dict[Any, List[Any]] = defaultdict(list)
+                for pk, value in (
+                    through._base_manager.filter(**{f"{owner}__in": pks})
+                    .order_by(*ordering)
+                    .values_list(owner, related)
+                ):
+                    values[pk].append(value)
+                for item, pk in zip(items, pks):
+                    item[key] = values.get(pk, [])
+        return items
+
+
+def _through_ordering(related: models.ForeignKey) -> List[str]:
+    """
+    ``order_by()`` arguments for a through table that list the related
+    rows in their model's ``Meta.ordering``, as the related manager a
+    ``ModelSerializer`` reads does; then by primary key, so pages render
+    the same on every database.
+    """
+    ordering: List[str] = []
+    for item in related.related_model._meta.ordering:
+        # Expressions and "?" have no through-table spelling.
+        if not isinstance(item, str) or item == "?":
+            continue
+        descending: str = "-" if item.startswith("-") else ""
+        ordering.append(f"{descending}{related.name}__{item.lstrip('-')}")
+    ordering.append(related.attname)
+    return ordering
+
+
+def _compile(serializer_class: type, prefix: str = "") -> Plan:
+    name: str = serializer_class.__name__
+    meta: Any = getattr(serializer_class, "Meta", None)
+    model: Any = getattr(meta, "model", None)
+    if model is None or not getattr(meta, "fields", None):
+        raise ImproperlyConfigured(
+            f"{name}.Meta needs a model and a list of fields."
+        )
+    declared: Dict[str, ValuesSerializer] = serializer_class.nested()
+    builder = serializers.ModelSerializer()
+    plan = Plan()
+    for key in meta.fields:
+        child: Any = declared.get(key)
+        source: str = getattr(child, "source", None) or key
+        try:
+            model_field: Any = (
+                model._meta.pk
+                if source == "pk"
+                else model._meta.get_field(source)
+            )
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"{name}: {model.__name__} has no field '{source}'."
+            )
+        lookup: str = prefix + source
+        if not model_field.concrete:
+            raise ImproperlyConfigured(
+                f"{name}: reverse relation '{source}' is not supported."
+            )
+        if model_field.many_to_many:
+            if prefix or child is not None:
+                raise ImproperlyConfigured(
+                    f"{name}: many-to-many field '{source}' can only be "
+                    "rendered as primary keys of the top-level rows."
+                )
+            through: type[models.Model] = model_field.remote_field.through
+            related: models.Field = through._meta.get_field(
+                model_field.m2m_reverse_field_name()
+            )
+            plan.many.append(
+                (
+                    key,
+                    through,
+                    through._meta.get_field(
+                        model_field.m2m_field_name()
+                    ).attname,
+                    related.attname,
+                    _through_ordering(related),
+                )
+            )
+            # Replaced with the primary keys once the page is rendered.
+            lookup = "pk"
+        elif child is not None:
+            if not model_field.is_relation:
+                raise ImproperlyConfigured(
+                    f"{name}: '{source}' is not a relation; only forward "
+                    "relations can be nested."
+                )
+            if child.Meta.model is not model_field.related_model:
+                raise ImproperlyConfigured(
+                    f"{name}: {type(child).__name__} does not serialize "
+                    f"{model_field.related_model.__name__}."
+                )
+            plan.nested.append((key, _compile(type(child), f"{lookup}__")))
+        elif not model_field.is_relation:
+            field_class, kwargs = builder.build_standard_field(
+                source, model_field
+            )
+            drf_field: serializers.Field = field_class(**kwargs)
+            if not isinstance(drf_field, PLAIN_FIELDS):
+                plan.converters.append(
+                    (key, _converter(model_field, drf_field))
+                )
+        plan.keys.append(key)
+        plan.lookups.append(lookup)
+    return plan
+
+
+def _lookups(plan: Plan) -> List[str]:
+    return [
+        *plan.lookups,
+        *(name for _, nested in plan.nested for name in _lookups(nested)),
+    ]
+
+
+@functools.cache
+def get_plan(serializer_class: type) -> Plan:
+    """The compiled ``Plan`` of a ``ValuesSerializer`` class."""
+    plan: Plan = _compile(serializer_class)
+    # "pk" first: many-to-many fields group their rows by it.
+    plan.columns = list(dict.fromkeys(["pk", *_lookups(plan)]))
+    plan.bind(plan.columns)
+    return plan
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    def to_representation(self, data: Any) -> List[Dict[str, Any]]:
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        rows: List[Any] = list(data)
+        by_index: bool = bool(rows) and not isinstance(rows[0], Mapping)
+        return get_plan(type(self.child)).represent(rows, by_index)
+
+    async def adata(self) -> Any:
+        """``data`` for async views: many-to-many fields query."""
+        if get_plan(type(self.child)).many:
+            return await sync_to_async(lambda: self.data)()
+        return self.data
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer of ``Meta.model`` rows from ``.values()``;
+    ``Meta.fields`` lists the model fields to render and nested
+    serializers are declared as class attributes, as with
+    ``ModelSerializer``.
+    """
+
+    @classmethod
+    def columns(cls, *extra: str) -> List[str]:
+        """
+        Lookups to select with ``values()`` / ``values_list()``, followed
+        by ``extra`` ones (ordering fields for a cursor paginator, say;
+        a leading ``-`` is dropped).
+        """
+        columns: List[str] = get_plan(cls).columns
+        return list(
+            dict.fromkeys([*columns, *(name.lstrip("-") for name in extra)])
+        )
+
+    @classmethod
+    def nested(cls) -> Dict[str, "ValuesSerializer"]:
+        return {
+            name: value
+            for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, ValuesSerializer)
+        }
+
+    @classmethod
+    def many_init(cls, *args: Any, **kwargs: Any) -> ValuesListSerializer:
+        kwargs["child"] = cls()
+        return ValuesListSerializer(*args, **kwargs)
+
+    def to_representation(self, instance: Any) -> Dict[str, Any]:
+        by_index: bool = not isinstance(instance, Mapping)
+        return get_plan(type(self)).represent([instance], by_index)[0]
@@ -0,0 +1,94 @@
+"""
+Tests for ``ValuesSerializer``: its output must match a ``ModelSerializer``
+with the same fields, many-to-many order included.
+
+``auth.Permission`` orders by content type and codename, ``auth.Group``
+has no ordering, so they cover both ways the related keys are ordered.
+"""
+
+from typing import Any, Dict, List
+
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from rest_framework import serializers
+
+from project.api.serializers import ValuesSerializer
+
+
+class GroupValuesSerializer(ValuesSerializer):
+    class Meta:
+        model = Group
+        fields = ["id", "name", "permissions"]
+
+
+class GroupModelSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ["id", "name", "permissions"]
+
+
+class UserValuesSerializer(ValuesSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "username", "groups"]
+
+
+@pytest.fixture
+def groups(db: None) -> List[Group]:
+    # Added against Permission's ordering, so insertion order would show.
+    permissions: List[Permission] = list(
+        Permission.objects.order_by("-content_type__app_label", "-codename")
+    )
+    created: List[Group] = []
+    for number in range(3):
+        group = Group.objects.create(name=f"group{number}")
+        group.permissions.add(*permissions[number::3][:8])
+        created.append(group)
+    Group.objects.create(name="empty")
+    return created
+
+
+def test_many_to_many_matches_model_serializer(groups: List[Group]):
+    queryset = Group.objects.order_by("pk")
+    expected: List[Dict[str, Any]] = GroupModelSerializer(
+        queryset, many=True
+    ).data
+    columns: List[str] = GroupValuesSerializer.columns()
+    assert (
+        GroupValuesSerializer(queryset.values(*columns), many=True).data
+        == expected
+    )
+    assert (
+        GroupValuesSerializer(queryset.values_list(*columns), many=True).data
+        == expected
+    )
+
+
+def test_many_to_many_follows_the_related_ordering(groups: List[Group]):
+    [item] = GroupValuesSerializer(
+        Group.objects.filter(pk=groups[0].pk).values(
+            *GroupValuesSerializer.columns()
+        ),
+        many=True,
+    ).data
+    assert item["permissions"] == list(
+        groups[0].permissions.values_list("pk", flat=True)
+    )
+    assert item["permissions"] != sorted(item["permissions"])
+
+
+def test_many_to_many_without_ordering_is_by_key(groups: List[Group]):
+    user = User.objects.create(username="user")
+    user.groups.add(*reversed(groups))
+    [item] = UserValuesSerializer(
+        User.objects.values(*UserValuesSerializer.columns()), many=True
+    ).data
+    assert item["groups"] == [group.pk for group in groups]
+
+
+def test_one_query_per_many_to_many_field(
+    groups: List[Group], django_assert_num_queries: Any
+):
+    rows = list(Group.objects.values(*GroupValuesSerializer.columns()))
+    with django_assert_num_queries(1):
+        GroupValuesSerializer(rows, many=True).data
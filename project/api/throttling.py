@@ -0,0 +1,118 @@
+"""
+Fixed-window rate-limit throttles backed by the shared cache.
+
+DRF's ``SimpleRateThrottle`` keeps a list of request timestamps per client
+and rewrites the whole list on every request, which grows with the rate
+and races between workers. These throttles keep one integer counter per
+client and window, updated with the cache's atomic ``add``/``incr``, so
+a check is O(1) and consistent across every worker sharing Redis.
+
+When the cache is unreachable (django-redis with ``IGNORE_EXCEPTIONS``
+returns ``None``), requests are allowed: an outage of the rate limiter
+should not take the API down with it.
+"""
+
+import logging
+from typing import Any, Optional
+
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRateThrottle(SimpleRateThrottle):
+    """Base class; subclasses implement ``get_cache_key`` like DRF's."""
+
+    cache_alias: str = "default"
+
+    def __init__(self) -> None:
+        self.cache = caches[self.cache_alias]
+        super().__init__()
+
+    def allow_request(self, request: Any, view: Any) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window: int = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        window_key: str = f"{self.key}:{window}"
+
+        count: Optional[int]
+        if self.cache.add(window_key, 1, self.duration):
+            count = 1
+        else:
+            try:
+                count = self.cache.incr(window_key)
+            except ValueError:
+                # The window expired between add() and incr().
+                self.cache.add(window_key, 1, self.duration)
+                count = 1
+
+        if count is None:
+            # Fail open: the cache swallowed an error.
+            logger.warning(
+                "Throttle cache unavailable; allowing %s.", self.key
+            )
+            return True
+        self.count = count
+        if self.count > self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def wait(self) -> Optional[float]:
+        return max(0.0, self.window_end - self.now)
+
+
+class CacheAnonRateThrottle(CacheRateThrottle):
+    """Limits anonymous clients by IP, using the ``anon`` rate."""
+
+    scope = "anon"
+
+    def get_cache_key(self, request: Any, view: Any) -> Optional[str]:
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class CacheUserRateThrottle(CacheRateThrottle):
+    """Limits authenticated users by id (anonymous by IP), ``user`` rate."""
+
+    scope = "user"
+
+    def get_cache_key(self, request: Any, view: Any) -> Optional[str]:
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class CacheScopedRateThrottle(CacheUserRateThrottle):
+    """
+    Applies the rate named by the view's ``throttle_scope``, if any.
+
+    Views without ``throttle_scope`` are not limited by this throttle.
+    """
+
+    scope_attr: str = "throttle_scope"
+
+    def __init__(self) -> None:
+        # The rate depends on the view, so it is resolved in allow_request.
+        self.cache = caches[self.cache_alias]
+
+    def allow_request(self, request: Any, view: Any) -> bool:
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
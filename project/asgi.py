@@ -2,15 +2,46 @@
 ASGI config for project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP is served by Django, WebSocket connections are routed to the consumers
+listed in ``project.routing``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+https://channels.readthedocs.io/en/latest/topics/routing.html
 """
 
 import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings.local")
+# Servers import this module: default to production, so a deploy that
+# forgets DJANGO_SETTINGS_MODULE never serves DEBUG settings. manage.py
+# (runserver included) picks the local settings before getting here.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings.production")
 
-application = get_asgi_application()
+# Set up Django (and the app registry) before importing consumers, which
+# usually import models.
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import (  # noqa: E402
+    AllowedHostsOriginValidator,
+)
+from django.conf import settings  # noqa: E402
+
+from project.metrics.channels import ChannelsMetricsMiddleware  # noqa: E402
+from project.routing import websocket_urlpatterns  # noqa: E402
+
+websocket_application = AllowedHostsOriginValidator(
+    AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+)
+if settings.METRICS_ENABLED:
+    websocket_application = ChannelsMetricsMiddleware(websocket_application)
+
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        "websocket": websocket_application,
+    }
+)
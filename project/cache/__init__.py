@@ -0,0 +1,20 @@
+"""
+Caching helpers shared by every app in the project.
+
+Low-level results are cached with ``cached``, DRF viewset actions with
+``cache_response``, and writes invalidate a whole namespace at once by
+bumping its version (see ``keys.bump_version``).
+"""
+
+from .decorators import cache_response, cached
+from .keys import bump_version, get_version, make_key
+from .mixins import CacheInvalidationMixin
+
+__all__ = [
+    "CacheInvalidationMixin",
+    "bump_version",
+    "cache_response",
+    "cached",
+    "get_version",
+    "make_key",
+]
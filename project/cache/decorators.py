@@ -0,0 +1,165 @@
+import functools
+import inspect
+from typing import Any, Callable, List, Optional
+
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from project.metrics import CACHE_REQUESTS
+
+from .keys import make_key
+
+# Sentinel so that ``None`` can be cached like any other value.
+_MISSING = object()
+
+# Kept with cached responses so hits can still be answered with a 304.
+VALIDATOR_HEADERS: tuple = ("ETag", "Last-Modified")
+
+
+def _check_key_part(func: Callable, value: Any) -> None:
+    """
+    Refuse arguments whose repr is ``object.__repr__``: it holds the
+    object's address, so every call would miss and store a new entry.
+    """
+    if isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            _check_key_part(func, item)
+    elif isinstance(value, dict):
+        for item in value.items():
+            _check_key_part(func, item)
+    elif type(value).__repr__ is object.__repr__:
+        raise TypeError(
+            f"{func.__qualname__}() was called with a "
+            f"{type(value).__name__}, which has no stable repr to build a "
+            "cache key from; pass key_func to cached()."
+        )
+
+
+def cached(
+    namespace: str,
+    timeout: Optional[int] = None,
+    alias: str = "default",
+    key_func: Optional[Callable[..., Any]] = None,
+) -> Callable:
+    """
+    Cache the return value of a function in ``namespace``.
+
+    The key is built from the function's qualified name and the reprs of
+    its arguments unless ``key_func`` is given, in which case it receives
+    the same arguments and returns the key suffix. The ``self`` or ``cls``
+    of a method is left out of the default key (the qualified name names
+    the method), so instances share entries; use ``key_func`` when the
+    result depends on the instance. Other arguments without a repr of
+    their own raise ``TypeError`` instead of caching under their address.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        hits = CACHE_REQUESTS.labels(namespace, "hit")
+        misses = CACHE_REQUESTS.labels(namespace, "miss")
+        parameters: List[str] = list(inspect.signature(func).parameters)
+        bound: int = int(bool(parameters) and parameters[0] in ("self", "cls"))
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            suffix: Any
+            if key_func:
+                suffix = key_func(*args, **kwargs)
+            else:
+                suffix = (args[bound:], sorted(kwargs.items()))
+                _check_key_part(func, suffix)
+            key: str = make_key(
+                namespace, func.__module__, func.__qualname__, suffix,
+                alias=alias,
+            )
+            cache = caches[alias]
+            value: Any = cache.get(key, _MISSING)
+            if value is _MISSING:
+                misses.inc()
+                value = func(*args, **kwargs)
+                cache.set(key, value, timeout)
+            else:
+                hits.inc()
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def cache_response(
+    namespace: str,
+    timeout: Optional[int] = None,
+    alias: str = "default",
+) -> Callable:
+    """
+    Cache successful ``GET`` responses of a DRF viewset action.
+
+    Only ``response.data``, the status code and the validators are stored;
+    the body is rendered with whatever renderer the client negotiates.
+    Keys vary on the negotiated media type and the user, like the ETags of
+    ``project.api.conditional``, and a hit whose validators match the
+    request is answered with 304 before anything is rendered. Combine with
+    ``CacheInvalidationMixin`` (``ConditionalGetMixin`` is one) so writes
+    drop stale pages.
+    """
+
+    def decorator(action: Callable) -> Callable:
+        hits = CACHE_REQUESTS.labels(namespace, "hit")
+        misses = CACHE_REQUESTS.labels(namespace, "miss")
+
+        @functools.wraps(action)
+        def wrapper(view: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+            if request.method not in ("GET", "HEAD"):
+                return action(view, request, *args, **kwargs)
+
+            key: str = make_key(
+                namespace,
+                action.__name__,
+                request.get_full_path(),
+                getattr(request, "accepted_media_type", None),
+                getattr(request.user, "pk", None),
+                alias=alias,
+            )
+
+            cache = caches[alias]
+            hit: Any = cache.get(key)
+            if hit is not None:
+                hits.inc()
+                data, status_code, *rest = hit
+                headers: dict = rest[0] if rest else {}
+                response = Response(data, status=status_code, headers=headers)
+                if not headers:
+                    return response
+                last_modified: Optional[str] = headers.get("Last-Modified")
+                return get_conditional_response(
+                    request,
+                    etag=headers.get("ETag"),
+                    last_modified=(
+                        parse_http_date_safe(last_modified)
+                        if last_modified
+                        else None
+                    ),
+                    response=response,
+                )
+
+            misses.inc()
+            response = action(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                headers = {
+                    name: response[name]
+                    for name in VALIDATOR_HEADERS
+                    if response.has_header(name)
+                }
+                cache.set(
+                    key,
+                    (response.data, response.status_code, headers),
+                    timeout,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,62 @@
+import hashlib
+import logging
+from typing import Any, Optional
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Keys longer than this (or containing whitespace) are hashed so they stay
+# portable across backends and never leak raw query strings into the key
+# space.
+MAX_RAW_KEY_LENGTH: int = 200
+
+
+def _version_key(namespace: str) -> str:
+    return f"ns-version:{namespace}"
+
+
+def get_version(namespace: str, alias: str = "default") -> int:
+    """Return the current version of ``namespace``, creating it if needed."""
+    cache = caches[alias]
+    version_key: str = _version_key(namespace)
+    version = cache.get(version_key)
+    if version is None:
+        # ``add`` is atomic, so concurrent workers agree on the first value.
+        cache.add(version_key, 1, timeout=None)
+        version = cache.get(version_key, 1)
+    return int(version)
+
+
+def bump_version(namespace: str, alias: str = "default") -> Optional[int]:
+    """
+    Invalidate every key of ``namespace`` by moving it to a new version.
+
+    Old entries are never deleted explicitly, they simply stop being read
+    and expire with their timeout. Returns ``None`` when the cache is
+    unreachable (django-redis with ``IGNORE_EXCEPTIONS``): callers run
+    after the database write has committed, and a cache outage must not
+    turn it into an error response.
+    """
+    cache = caches[alias]
+    version_key: str = _version_key(namespace)
+    try:
+        version: Optional[int] = cache.incr(version_key)
+    except ValueError:
+        # The version key is missing (never read, or evicted).
+        cache.add(version_key, 2, timeout=None)
+        version = cache.get(version_key, 2)
+    if version is None:
+        logger.warning(
+            "Cache unavailable; namespace %s was not invalidated.", namespace
+        )
+        return None
+    return int(version)
+
+
+def make_key(namespace: str, *parts: Any, alias: str = "default") -> str:
+    """Build a versioned key such as ``articles:v3:list:page=2``."""
+    raw: str = ":".join(str(part) for part in parts)
+    if len(raw) > MAX_RAW_KEY_LENGTH or any(c.isspace() for c in raw):
+        raw = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"{namespace}:v{get_version(namespace, alias)}:{raw}"
@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from .keys import bump_version
+
+
+class CacheInvalidationMixin:
+    """
+    Invalidate ``cache_namespace`` after every successful write.
+
+    Meant for DRF generic viewsets; ``cache_namespace`` defaults to the
+    model's label, e.g. ``"articles.article"``.
+    """
+
+    cache_namespace: Optional[str] = None
+    cache_alias: str = "default"
+
+    def get_cache_namespace(self) -> str:
+        if self.cache_namespace:
+            return self.cache_namespace
+        return self.get_queryset().model._meta.label_lower
+
+    def invalidate_cache(self) -> None:
+        bump_version(self.get_cache_namespace(), self.cache_alias)
+
+    def perform_create(self, serializer: Any) -> None:
+        super().perform_create(serializer)
+        self.invalidate_cache()
+
+    def perform_update(self, serializer: Any) -> None:
+        super().perform_update(serializer)
+        self.invalidate_cache()
+
+    def perform_destroy(self, instance: Any) -> None:
+        super().perform_destroy(instance)
+        self.invalidate_cache()
@@ -0,0 +1,99 @@
+"""Tests for the keys ``cached`` builds; the cache is the test profile's."""
+
+from typing import Any, List
+
+import pytest
+
+from project.cache import bump_version, cached
+
+NAMESPACE: str = "tests"
+
+
+@pytest.fixture(autouse=True)
+def fresh_namespace() -> None:
+    bump_version(NAMESPACE)
+
+
+class Repository:
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+
+    @cached(NAMESPACE)
+    def find(self, number: int) -> int:
+        self.calls.append(number)
+        return number * 2
+
+
+class Filter:
+    pass
+
+
+def test_arguments_are_part_of_the_key():
+    calls: List[Any] = []
+
+    @cached(NAMESPACE)
+    def double(number: int, *, scale: int = 1) -> int:
+        calls.append(number)
+        return number * 2 * scale
+
+    assert [double(1), double(1), double(2), double(1, scale=3)] == [
+        2,
+        2,
+        4,
+        6,
+    ]
+    assert calls == [1, 2, 1]
+
+
+def test_methods_hit_on_every_instance():
+    first, second = Repository(), Repository()
+    assert [first.find(1), first.find(1), second.find(1)] == [2, 2, 2]
+    assert first.calls == [1]
+    assert second.calls == []
+
+
+def test_arguments_without_a_repr_are_refused():
+    @cached(NAMESPACE)
+    def search(filters: Any) -> int:
+        return 0
+
+    with pytest.raises(TypeError, match="key_func"):
+        search(Filter())
+    with pytest.raises(TypeError, match="key_func"):
+        search({"filter": [Filter()]})
+
+
+def test_key_func_takes_any_argument():
+    calls: List[Any] = []
+
+    @cached(NAMESPACE, key_func=lambda filters: type(filters).__name__)
+    def search(filters: Any) -> int:
+        calls.append(filters)
+        return len(calls)
+
+    assert [search(Filter()), search(Filter())] == [1, 1]
+
+
+def test_none_is_cached():
+    calls: List[Any] = []
+
+    @cached(NAMESPACE)
+    def nothing() -> None:
+        calls.append(None)
+
+    nothing()
+    nothing()
+    assert calls == [None]
+
+
+def test_bump_version_drops_every_entry():
+    calls: List[Any] = []
+
+    @cached(NAMESPACE)
+    def value() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert value() == 1
+    bump_version(NAMESPACE)
+    assert value() == 2
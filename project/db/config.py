@@ -0,0 +1,168 @@
+"""
+Builds ``DATABASES`` entries from environment variables.
+
+This module is imported from the settings files, so it must not import
+anything that needs configured settings.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+import environ
+
+POSTGRESQL: str = "django.db.backends.postgresql"
+MYSQL: str = "django.db.backends.mysql"  # MySQL and MariaDB
+ORACLE: str = "django.db.backends.oracle"
+SQLITE: str = "django.db.backends.sqlite3"
+MSSQL: str = "sql_server.pyodbc"
+MONGODB: str = "djongo"
+
+# Used when {prefix}_PORT is unset; "" leaves it to the driver.
+DEFAULT_PORTS: Dict[str, str] = {
+    POSTGRESQL: "5432",
+    MYSQL: "3306",
+    MSSQL: "1433",
+    ORACLE: "1521",
+    SQLITE: "",
+}
+
+# Oracle (and any other engine) runs with Django's default OPTIONS.
+
+
+def _postgresql_options(env: environ.Env, prefix: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "connect_timeout": env.int(f"{prefix}_CONNECT_TIMEOUT", 5),
+    }
+    if env.bool(f"{prefix}_POOL", False):
+        # psycopg3 native pool (needs psycopg[pool]). Django hands pooled
+        # connections back on request_finished, so CONN_MAX_AGE must be 0.
+        options["pool"] = {
+            "min_size": env.int(f"{prefix}_POOL_MIN_SIZE", 2),
+            "max_size": env.int(f"{prefix}_POOL_MAX_SIZE", 10),
+            "timeout": env.float(f"{prefix}_POOL_TIMEOUT", 10.0),
+        }
+    return options
+
+
+def _mysql_options(env: environ.Env, prefix: str) -> Dict[str, Any]:
+    return {
+        "connect_timeout": env.int(f"{prefix}_CONNECT_TIMEOUT", 5),
+        "charset": "utf8mb4",
+        "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
+    }
+
+
+def _mssql_options(env: environ.Env, prefix: str) -> Dict[str, Any]:
+    return {
+        "driver": env.str(
+            f"{prefix}_ODBC_DRIVER", "ODBC Driver 17 for SQL Server"
+        ),
+        "connection_timeout": env.int(f"{prefix}_CONNECT_TIMEOUT", 5),
+        "connection_retries": 3,
+    }
+
+
+def _sqlite_options(env: environ.Env, prefix: str) -> Dict[str, Any]:
+    return {
+        # WAL lets readers proceed while a writer holds the lock.
+        "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+        "transaction_mode": "IMMEDIATE",
+    }
+
+
+OPTION_BUILDERS = {
+    POSTGRESQL: _postgresql_options,
+    MYSQL: _mysql_options,
+    MSSQL: _mssql_options,
+    SQLITE: _sqlite_options,
+}
+
+
+def database_config(
+    env: environ.Env,
+    prefix: str = "DB",
+    default_engine: str = POSTGRESQL,
+    default_port: Optional[str] = None,
+    default_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Return one ``DATABASES`` entry read from ``{prefix}_*`` variables.
+
+    ``{prefix}_PORT`` defaults to ``default_port``, else to the engine's
+    usual port (``DEFAULT_PORTS``). ``{prefix}_NAME`` is required unless
+    ``default_name`` is given; SQLite needs no user or password.
+
+    Connections are persistent (``{prefix}_CONN_MAX_AGE`` seconds, 60 by
+    default) and health-checked before reuse, unless the backend pools
+    connections itself.
+    """
+    engine: str = env.str(f"{prefix}_ENGINE", default_engine)
+    name: Any = environ.Env.NOTSET if default_name is None else default_name
+
+    if engine == MONGODB:
+        # pymongo keeps its own pool, djongo only needs the client options.
+        return {
+            "ENGINE": engine,
+            "NAME": env.str(f"{prefix}_NAME", name),
+            "ENFORCE_SCHEMA": False,
+            "CLIENT": {
+                "host": env.str(f"{prefix}_HOST", "localhost"),
+                "port": env.int(f"{prefix}_PORT", 27017),
+                "username": env.str(f"{prefix}_USER"),
+                "password": env.str(f"{prefix}_PASSWORD"),
+                "maxPoolSize": env.int(f"{prefix}_POOL_MAX_SIZE", 50),
+                "connectTimeoutMS": env.int(f"{prefix}_CONNECT_TIMEOUT", 5)
+                * 1000,
+            },
+        }
+
+    credential: Any = "" if engine == SQLITE else environ.Env.NOTSET
+    config: Dict[str, Any] = {
+        "ENGINE": engine,
+        "HOST": env.str(f"{prefix}_HOST", "localhost"),
+        "PORT": env.str(
+            f"{prefix}_PORT",
+            (
+                default_port
+                if default_port is not None
+                else DEFAULT_PORTS.get(engine, "")
+            ),
+        ),
+        "NAME": env.str(f"{prefix}_NAME", name),
+        "USER": env.str(f"{prefix}_USER", credential),
+        "PASSWORD": env.str(f"{prefix}_PASSWORD", credential),
+        "CONN_MAX_AGE": env.int(f"{prefix}_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": env.bool(f"{prefix}_CONN_HEALTH_CHECKS", True),
+        "OPTIONS": (
+            OPTION_BUILDERS[engine](env, prefix)
+            if engine in OPTION_BUILDERS
+            else {}
+        ),
+    }
+    if "pool" in config["OPTIONS"]:
+        config["CONN_MAX_AGE"] = 0
+    return config
+
+
+def replica_configs(
+    env: environ.Env, primary: Dict[str, Any], aliases: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Return ``DATABASES`` entries for read replicas of ``primary``.
+
+    Each alias (from ``DB_REPLICAS``) copies the primary's settings and
+    overrides whichever ``DB_<ALIAS>_HOST``, ``_PORT``, ``_NAME``,
+    ``_USER`` and ``_PASSWORD`` are set. In tests a replica mirrors the
+    primary unless ``DB_<ALIAS>_TEST_MIRROR`` is false.
+    """
+    configs: Dict[str, Dict[str, Any]] = {}
+    for alias in aliases:
+        prefix: str = f"DB_{alias.upper()}"
+        config: Dict[str, Any] = copy.deepcopy(primary)
+        for key in ("HOST", "PORT", "NAME", "USER", "PASSWORD"):
+            if key in config:
+                config[key] = env.str(f"{prefix}_{key}", config[key])
+        if env.bool(f"{prefix}_TEST_MIRROR", True):
+            config["TEST"] = {"MIRROR": "default"}
+        configs[alias] = config
+    return configs
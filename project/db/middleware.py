@@ -0,0 +1,88 @@
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import replicas
+
+# Set after a write, so the client's next requests also read from the
+# primary while replicas catch up.
+PIN_COOKIE: str = "db_primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaMiddleware:
+    """
+    Give every request its own replica routing state.
+
+    Reads go to a replica only in views that set ``use_read_replica``
+    (``DATABASE_REPLICA_READS`` decides for views that do not) and only
+    for safe methods. Once the request writes, the rest of it reads from
+    the primary, and so do the client's requests over the next
+    ``DATABASE_REPLICA_PIN_SECONDS``, covering the replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync process_view in a thread under ASGI; the
+            # hook does no I/O, so keep it on the event loop.
+            self.process_view = self.aprocess_view
+
+    def process_view(
+        self,
+        request: Any,
+        view_func: Callable,
+        view_args: tuple,
+        view_kwargs: dict,
+    ) -> None:
+        if request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES:
+            return
+        view_class: Any = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        allowed: bool = getattr(
+            view_func,
+            "use_read_replica",
+            getattr(
+                view_class,
+                "use_read_replica",
+                settings.DATABASE_REPLICA_READS,
+            ),
+        )
+        replicas.allow_replica_reads(allowed)
+
+    async def aprocess_view(self, *args: Any) -> None:
+        ReplicaMiddleware.process_view(self, *args)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replicas.routing(allowed=False):
+            response = self.get_response(request)
+            wrote: bool = replicas.has_written()
+        return self.pin(response, wrote)
+
+    async def __acall__(self, request: Any) -> Any:
+        # Writes made in sync_to_async threads flow back into this
+        # context, so has_written() sees them here too.
+        with replicas.routing(allowed=False):
+            response = await self.get_response(request)
+            wrote: bool = replicas.has_written()
+        return self.pin(response, wrote)
+
+    def pin(self, response: Any, wrote: bool) -> Any:
+        pin_seconds: int = settings.DATABASE_REPLICA_PIN_SECONDS
+        if wrote and pin_seconds:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,179 @@
+"""
+Read-replica selection and the per-request routing state.
+
+``ReplicaRouter`` (routers.py) asks ``read_alias()`` where a read goes.
+Reads use a replica only while they are allowed (``ReplicaMiddleware``
+allows them for views with ``use_read_replica``, ``use_replicas()`` for
+any other block) and nothing has been written yet: after a write every
+read goes to the primary, so a request always sees its own writes.
+
+A request reads from a single replica, picked round-robin or as the one
+serving the fewest requests in this process (``least_loaded``). With
+``DATABASE_REPLICA_MAX_LAG`` set, replicas are checked at most every
+``DATABASE_REPLICA_LAG_CHECK_INTERVAL`` seconds and skipped while they
+lag behind (or cannot be reached).
+"""
+
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_allowed: ContextVar[bool] = ContextVar("replica_reads_allowed", default=False)
+_wrote: ContextVar[bool] = ContextVar("primary_written", default=False)
+_replica: ContextVar[Optional[str]] = ContextVar("replica", default=None)
+
+# Seconds the replica's last replayed transaction is behind; engines not
+# listed are assumed to be in sync.
+LAG_QUERIES: Dict[str, str] = {
+    "postgresql": (
+        "SELECT COALESCE(EXTRACT(EPOCH FROM now() - "
+        "pg_last_xact_replay_timestamp()), 0)"
+    ),
+}
+
+
+def _lag(alias: str) -> float:
+    connection = connections[alias]
+    if connection.vendor == "mysql":
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW REPLICA STATUS")
+            row = cursor.fetchone()
+            if row is None:
+                return 0.0
+            columns: List[str] = [column[0] for column in cursor.description]
+            behind = dict(zip(columns, row)).get("Seconds_Behind_Source")
+            # NULL: replication is stopped.
+            return float("inf") if behind is None else float(behind)
+    query: Optional[str] = LAG_QUERIES.get(connection.vendor)
+    if query is None:
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaSelector:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.turn = itertools.count()
+        self.load: Dict[str, int] = {}
+        self.excluded: frozenset = frozenset()
+        self.checked_at: float = 0.0
+
+    def available(self) -> List[str]:
+        replicas: List[str] = list(settings.DATABASE_REPLICAS)
+        max_lag: float = settings.DATABASE_REPLICA_MAX_LAG
+        if not max_lag:
+            return replicas
+        now: float = time.monotonic()
+        interval: float = settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL
+        if now - self.checked_at >= interval:
+            # Set first so concurrent requests do not all run the check.
+            self.checked_at = now
+            excluded = set()
+            for alias in replicas:
+                try:
+                    lag: float = _lag(alias)
+                except DatabaseError:
+                    logger.warning("Replica %s is unreachable", alias)
+                    excluded.add(alias)
+                    continue
+                if lag > max_lag:
+                    logger.warning(
+                        "Replica %s is %.1f s behind; reading from the "
+                        "primary until it catches up",
+                        alias,
+                        lag,
+                    )
+                    excluded.add(alias)
+            self.excluded = frozenset(excluded)
+        return [alias for alias in replicas if alias not in self.excluded]
+
+    def acquire(self) -> Optional[str]:
+        replicas: List[str] = self.available()
+        if not replicas:
+            return None
+        with self.lock:
+            if settings.DATABASE_REPLICA_SELECTION == "least_loaded":
+                alias: str = min(
+                    replicas, key=lambda name: self.load.get(name, 0)
+                )
+            else:
+                alias = replicas[next(self.turn) % len(replicas)]
+            self.load[alias] = self.load.get(alias, 0) + 1
+        return alias
+
+    def release(self, alias: str) -> None:
+        with self.lock:
+            self.load[alias] = max(self.load.get(alias, 0) - 1, 0)
+
+
+selector = ReplicaSelector()
+
+
+def read_alias() -> Optional[str]:
+    """The replica for the next read, or ``None`` for the primary."""
+    if not _allowed.get() or _wrote.get():
+        return None
+    alias: Optional[str] = _replica.get()
+    if alias is None:
+        alias = selector.acquire()
+        if alias is not None:
+            _replica.set(alias)
+    return alias
+
+
+def mark_write() -> None:
+    _wrote.set(True)
+
+
+def has_written() -> bool:
+    return _wrote.get()
+
+
+def allow_replica_reads(allowed: bool) -> None:
+    _allowed.set(allowed)
+
+
+@contextmanager
+def routing(allowed: bool, written: bool = False) -> Iterator[None]:
+    """
+    Fresh routing state for a request or task: whether replicas may be
+    read, and whether to behave as if the primary was already written.
+    """
+    tokens = (
+        _allowed.set(allowed),
+        _wrote.set(written),
+        _replica.set(None),
+    )
+    try:
+        yield
+    finally:
+        alias: Optional[str] = _replica.get()
+        if alias is not None:
+            selector.release(alias)
+        wrote: bool = _wrote.get()
+        for var, token in zip((_allowed, _wrote, _replica), tokens):
+            var.reset(token)
+        # A nested block's writes still pin the enclosing one.
+        if wrote:
+            _wrote.set(True)
+
+
+def use_replicas() -> ContextManager[None]:
+    """Read from a replica inside the block (until something is written)."""
+    return routing(allowed=True)
+
+
+def use_primary() -> ContextManager[None]:
+    """Read from the primary inside the block."""
+    return routing(allowed=False)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db.models import Model
+from typing import Any, Optional
+
+from project.db import replicas
+
+
+class SilkRouter:
+    """
+    Sends django-silk's tables to the ``silk`` database alias, if defined.
+
+    Profiling data is write-heavy; keeping it off the primary database
+    means sampling can stay on in production. Without a ``silk`` alias
+    the router has no opinion and silk uses ``default``.
+    """
+
+    app_label: str = "silk"
+    alias: str = "silk"
+
+    def _enabled(self) -> bool:
+        return self.alias in settings.DATABASES
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        if self._enabled() and model._meta.app_label == self.app_label:
+            return self.alias
+        return None
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        return self.db_for_read(model, **hints)
+
+    def allow_migrate(
+        self, db: str, app_label: str, **hints: Any
+    ) -> Optional[bool]:
+        if not self._enabled():
+            return None
+        if app_label == self.app_label:
+            return db == self.alias
+        if db == self.alias:
+            return False
+        return None
+
+
+class ReplicaRouter:
+    """
+    Sends reads to ``DATABASE_REPLICAS`` and writes to the primary.
+
+    Which reads may use a replica, and which one, is decided per request
+    in ``project.db.replicas``; every write pins the rest of the request
+    to the primary. Apps in ``primary_apps`` never touch a replica: a
+    session written by a login must be readable on the next request, and
+    neither sessions nor silk's records count as writes that pin.
+    """
+
+    primary: str = "default"
+    primary_apps: frozenset = frozenset({"sessions", "silk"})
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        if model._meta.app_label in self.primary_apps:
+            return self.primary
+        return replicas.read_alias()
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        if model._meta.app_label not in self.primary_apps:
+            replicas.mark_write()
+        return self.primary
+
+    def allow_relation(
+        self, obj1: Model, obj2: Model, **hints: Any
+    ) -> Optional[bool]:
+        # Replicas hold the primary's rows: objects read from either side
+        # can be related to each other.
+        group = {self.primary, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in group and obj2._state.db in group:
+            return True
+        return None
+
+    def allow_migrate(
+        self, db: str, app_label: str, **hints: Any
+    ) -> Optional[bool]:
+        # Replicas get their schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,261 @@
+"""
+Tests for read-replica routing.
+
+Replicas are SQLite files connected as database aliases for each test; every
+database holds one ``auth.Group`` named after its alias, so a read shows
+which database served it. The primary is the test database.
+"""
+
+import copy
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import DatabaseError, connections
+from django.db.utils import load_backend
+from django.http import HttpResponse
+from django.urls import path
+
+from project.db import replicas
+from project.db.middleware import PIN_COOKIE
+
+REPLICAS: List[str] = ["replica1", "replica2"]
+
+
+def read() -> str:
+    return Group.objects.order_by("pk").first().name
+
+
+def replica_view(request: Any) -> HttpResponse:
+    return HttpResponse(read())
+
+
+replica_view.use_read_replica = True
+
+
+def unmarked_view(request: Any) -> HttpResponse:
+    return HttpResponse(read())
+
+
+def create_view(request: Any) -> HttpResponse:
+    Group.objects.create(name="created")
+    return HttpResponse(read())
+
+
+urlpatterns = [
+    path("replica/", replica_view),
+    path("unmarked/", unmarked_view),
+    path("create/", create_view),
+]
+
+
+@pytest.fixture
+def replica_databases(
+    db: None, settings: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Any
+) -> Iterator[List[str]]:
+    Group.objects.create(name="default")
+    for alias in REPLICAS:
+        # A copy of the primary's settings, as replica_configs() makes.
+        config: Dict[str, Any] = {
+            **copy.deepcopy(connections["default"].settings_dict),
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(tmp_path / f"{alias}.sqlite3"),
+            "OPTIONS": {},
+        }
+        # Created here rather than in DATABASES, which Django's test case
+        # only lets tests query when they declare it up front.
+        connections[alias] = load_backend(config["ENGINE"]).DatabaseWrapper(
+            config, alias
+        )
+        with connections[alias].schema_editor() as editor:
+            editor.create_model(Group)
+        Group.objects.using(alias).create(name=alias)
+
+    settings.DATABASE_ROUTERS = [
+        *settings.DATABASE_ROUTERS,
+        "project.db.routers.ReplicaRouter",
+    ]
+    settings.MIDDLEWARE = ["project.db.middleware.ReplicaMiddleware"]
+    settings.DATABASE_REPLICAS = REPLICAS
+    settings.DATABASE_REPLICA_SELECTION = "round_robin"
+    settings.DATABASE_REPLICA_READS = False
+    settings.DATABASE_REPLICA_PIN_SECONDS = 5
+    settings.DATABASE_REPLICA_MAX_LAG = 0.0
+    settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL = 0.0
+    monkeypatch.setattr(replicas, "selector", replicas.ReplicaSelector())
+    yield REPLICAS
+
+    for alias in REPLICAS:
+        connections[alias].close()
+        del connections[alias]
+
+
+def test_reads_use_the_primary_by_default(replica_databases: List[str]):
+    assert read() == "default"
+
+
+def test_use_replicas_reads_from_one_replica_per_block(
+    replica_databases: List[str],
+):
+    with replicas.use_replicas():
+        assert [read(), read()] == ["replica1", "replica1"]
+    with replicas.use_replicas():
+        assert read() == "replica2"
+    assert read() == "default"
+
+
+def test_use_primary_inside_use_replicas(replica_databases: List[str]):
+    with replicas.use_replicas():
+        with replicas.use_primary():
+            assert read() == "default"
+        assert read() == "replica1"
+
+
+def test_round_robin_ignores_load(replica_databases: List[str]):
+    selector = replicas.selector
+    assert [selector.acquire() for _ in range(3)] == [
+        "replica1",
+        "replica2",
+        "replica1",
+    ]
+
+
+def test_least_loaded_picks_the_replica_with_fewest_requests(
+    replica_databases: List[str], settings: Any
+):
+    settings.DATABASE_REPLICA_SELECTION = "least_loaded"
+    selector = replicas.selector
+    assert selector.acquire() == "replica1"
+    assert selector.acquire() == "replica2"
+    selector.release("replica2")
+    # Round-robin would move on to replica1 here.
+    assert selector.acquire() == "replica2"
+    assert selector.acquire() == "replica1"
+
+
+def test_release_when_the_block_ends(
+    replica_databases: List[str], settings: Any
+):
+    settings.DATABASE_REPLICA_SELECTION = "least_loaded"
+    with replicas.use_replicas():
+        assert read() == "replica1"
+    assert replicas.selector.load == {"replica1": 0}
+    with replicas.use_replicas():
+        assert read() == "replica1"
+
+
+def test_write_pins_the_rest_of_the_block_to_the_primary(
+    replica_databases: List[str],
+):
+    with replicas.use_replicas():
+        assert read() == "replica1"
+        Group.objects.create(name="created")
+        assert read() == "default"
+        assert Group.objects.filter(name="created").exists()
+
+
+def test_nested_write_pins_the_enclosing_block(
+    replica_databases: List[str],
+):
+    with replicas.use_replicas():
+        with replicas.use_primary():
+            Group.objects.create(name="created")
+        assert read() == "default"
+
+
+def test_lagging_replicas_are_skipped(
+    replica_databases: List[str],
+    settings: Any,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    settings.DATABASE_REPLICA_MAX_LAG = 1.0
+    monkeypatch.setattr(
+        replicas, "_lag", {"replica1": 5.0, "replica2": 0.5}.__getitem__
+    )
+    for _ in range(2):
+        with replicas.use_replicas():
+            assert read() == "replica2"
+
+
+def test_unreachable_replicas_fall_back_to_the_primary(
+    replica_databases: List[str],
+    settings: Any,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    settings.DATABASE_REPLICA_MAX_LAG = 1.0
+
+    def unreachable(alias: str) -> float:
+        raise DatabaseError(alias)
+
+    monkeypatch.setattr(replicas, "_lag", unreachable)
+    with replicas.use_replicas():
+        assert read() == "default"
+
+
+def test_lag_is_rechecked_after_the_interval(
+    replica_databases: List[str],
+    settings: Any,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    settings.DATABASE_REPLICA_MAX_LAG = 1.0
+    settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL = 3600.0
+    lags = {"replica1": 5.0, "replica2": 5.0}
+    monkeypatch.setattr(replicas, "_lag", lags.__getitem__)
+    assert replicas.selector.available() == []
+    lags["replica1"] = 0.0
+    assert replicas.selector.available() == []
+    replicas.selector.checked_at = 0.0
+    assert replicas.selector.available() == ["replica1"]
+
+
+def test_sqlite_replicas_report_no_lag(replica_databases: List[str]):
+    assert [replicas._lag(alias) for alias in REPLICAS] == [0.0, 0.0]
+
+
+@pytest.mark.urls(__name__)
+def test_middleware_reads_from_a_replica_in_opted_in_views(
+    replica_databases: List[str], client: Any
+):
+    assert client.get("/replica/").content == b"replica1"
+    assert client.get("/replica/").content == b"replica2"
+    assert client.get("/unmarked/").content == b"default"
+
+
+@pytest.mark.urls(__name__)
+def test_middleware_default_comes_from_settings(
+    replica_databases: List[str], client: Any, settings: Any
+):
+    settings.DATABASE_REPLICA_READS = True
+    assert client.get("/unmarked/").content == b"replica1"
+
+
+@pytest.mark.urls(__name__)
+def test_middleware_writes_read_from_the_primary(
+    replica_databases: List[str], client: Any
+):
+    assert client.post("/create/").content == b"default"
+    assert client.post("/replica/").content == b"default"
+
+
+@pytest.mark.urls(__name__)
+def test_write_sets_the_pin_cookie(
+    replica_databases: List[str], client: Any
+):
+    response = client.post("/create/")
+    cookie = response.cookies[PIN_COOKIE]
+    assert cookie["max-age"] == 5
+    assert cookie["httponly"]
+    assert client.get("/replica/").content == b"default"
+
+    client.cookies.pop(PIN_COOKIE)
+    assert client.get("/replica/").content == b"replica1"
+
+
+@pytest.mark.urls(__name__)
+def test_no_pin_cookie_without_pin_seconds(
+    replica_databases: List[str], client: Any, settings: Any
+):
+    settings.DATABASE_REPLICA_PIN_SECONDS = 0
+    response = client.post("/create/")
+    assert PIN_COOKIE not in response.cookies
+    assert client.get("/replica/").content == b"replica1"
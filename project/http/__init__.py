@@ -0,0 +1,41 @@
+"""
+Shared client for outbound HTTP.
+
+``requests.get()`` builds a new connection pool per call and waits
+forever by default. Use the process-wide session instead::
+
+    from project import http
+
+    response = http.request("GET", "https://api.example.com/items")
+    response = await http.arequest("GET", url)  # in async views
+
+Every request gets the ``HTTP_CLIENT_*`` settings:
+
+* a connect and read timeout unless the caller passes one;
+* pooled keep-alive connections (``POOL_CONNECTIONS`` hosts with
+  ``POOL_MAXSIZE`` connections each; size it to the threads per process);
+* retries of connection errors and 429/5xx responses for idempotent
+  methods, with exponential backoff and full jitter, honouring
+  Retry-After;
+* a circuit breaker per host that fails fast with ``CircuitOpenError``
+  after ``BREAKER_FAILURES`` consecutive failures, for
+  ``BREAKER_RESET`` seconds;
+* ``http_client_*`` metrics per host (project/metrics).
+
+``StubServer`` serves canned responses on localhost for tests.
+"""
+
+from .breaker import CircuitBreaker, CircuitOpenError
+from .client import arequest, get_session, request, reset_session
+from .stub import StubResponse, StubServer
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "StubResponse",
+    "StubServer",
+    "arequest",
+    "get_session",
+    "request",
+    "reset_session",
+]
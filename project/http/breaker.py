@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from requests.exceptions import RequestException
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a host after ``failure_threshold`` consecutive failures.
+
+    ``closed``: requests pass. ``open``: they fail fast with
+    ``CircuitOpenError`` for ``reset_timeout`` seconds. ``half_open``: one
+    trial request passes; its success closes the circuit, its failure
+    opens it again. State is per process.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+        self.trial: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; claims the half-open trial."""
+        with self.lock:
+            state: str = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial:
+                self.trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(
+    host: str, failure_threshold: int, reset_timeout: float
+) -> CircuitBreaker:
+    breaker: Optional[CircuitBreaker] = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                host, CircuitBreaker(failure_threshold, reset_timeout)
+            )
+    return breaker
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
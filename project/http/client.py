@@ -0,0 +1,200 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from project.metrics import HTTP_CLIENT_DURATION, HTTP_CLIENT_REQUESTS
+
+from .breaker import CircuitOpenError, get_breaker, reset_breakers
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Statuses worth another attempt; 429 and 503 honour Retry-After.
+RETRY_STATUSES: frozenset = frozenset({429, 500, 502, 503, 504})
+
+
+class JitteredRetry(Retry):
+    """
+    ``Retry`` with full jitter: sleeps a random share of the backoff.
+    Retry-After is honoured up to ``backoff_max``
+    (``HTTP_CLIENT_BACKOFF_MAX``): a server asking for an hour must not
+    block the worker for one.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after: Optional[float] = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.backoff_max)
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    ``HTTPAdapter`` with a default timeout, retries, a circuit breaker
+    per host and latency metrics per host.
+
+    Each ``send`` is one call as the caller sees it: the metrics and the
+    breaker count it once, however many attempts the retries made.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout,
+        failure_threshold: int,
+        reset_timeout: float,
+        **kwargs: Any,
+    ) -> None:
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        super().__init__(**kwargs)
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        url = urlsplit(request.url)
+        # Not netloc: it carries user:password@ for URLs with credentials,
+        # and the host is a metric label.
+        host: str = url.hostname or ""
+        if url.port:
+            host = f"{host}:{url.port}"
+        method: str = request.method or "GET"
+        breaker = get_breaker(
+            host, self.failure_threshold, self.reset_timeout
+        )
+        if not breaker.allow():
+            HTTP_CLIENT_REQUESTS.labels(host, method, "open").inc()
+            raise CircuitOpenError(
+                f"Circuit for {host} is open after repeated failures.",
+                request=request,
+            )
+        started: float = time.perf_counter()
+        try:
+            response: requests.Response = super().send(request, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            HTTP_CLIENT_REQUESTS.labels(host, method, "error").inc()
+            raise
+        finally:
+            HTTP_CLIENT_DURATION.labels(host, method).observe(
+                time.perf_counter() - started
+            )
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        HTTP_CLIENT_REQUESTS.labels(
+            host, method, f"{response.status_code // 100}xx"
+        ).inc()
+        return response
+
+
+def build_session() -> requests.Session:
+    """A session configured from the ``HTTP_CLIENT_*`` settings."""
+    retry = JitteredRetry(
+        total=settings.HTTP_CLIENT_RETRIES,
+        backoff_factor=settings.HTTP_CLIENT_BACKOFF,
+        backoff_max=settings.HTTP_CLIENT_BACKOFF_MAX,
+        status_forcelist=RETRY_STATUSES,
+        # The last response is returned rather than raised, like a
+        # request that was never retried.
+        raise_on_status=False,
+    )
+    adapter = ResilientAdapter(
+        timeout=(
+            settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+            settings.HTTP_CLIENT_READ_TIMEOUT,
+        ),
+        failure_threshold=settings.HTTP_CLIENT_BREAKER_FAILURES,
+        reset_timeout=settings.HTTP_CLIENT_BREAKER_RESET,
+        pool_connections=settings.HTTP_CLIENT_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_CLIENT_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+
+
+def get_session() -> requests.Session:
+    """
+    The process-wide session. Its connection pools are reused by every
+    caller; a forked process (e.g. a gunicorn worker) builds its own, as
+    sockets must not be shared across processes.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                _session = build_session()
+                _session_pid = os.getpid()
+    return _session
+
+
+def reset_session() -> None:
+    """
+    Drop the session and the circuit breakers, e.g. after overriding
+    ``HTTP_CLIENT_*`` in tests.
+    """
+    global _session, _executor
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+    reset_breakers()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # As many threads as pooled connections per host: the event loop's
+    # default executor (min(32, CPUs + 4) threads) would cap concurrent
+    # async calls well below what the pool can serve.
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _session_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.HTTP_CLIENT_POOL_MAXSIZE,
+                    thread_name_prefix="http-client",
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    return get_session().request(method, url, **kwargs)
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """
+    ``request`` for async views and consumers: the call runs in one of
+    ``HTTP_CLIENT_POOL_MAXSIZE`` client threads so the event loop keeps
+    serving while it waits.
+    """
+    return await sync_to_async(
+        request, thread_sensitive=False, executor=_get_executor()
+    )(method, url, **kwargs)
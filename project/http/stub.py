@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    json: Any = None
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Seconds to wait before answering, to exercise timeouts.
+    delay: float = 0.0
+    # Close the connection without answering.
+    drop: bool = False
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog of 5
+    # would refuse some of them.
+    request_queue_size = 128
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+
+class StubServer:
+    """
+    An HTTP server on a free localhost port that answers with canned
+    responses, for tests of code that calls external APIs::
+
+        with StubServer() as stub:
+            stub.add("GET", "/items", StubResponse(503), StubResponse())
+            response = http.request("GET", stub.url("/items"))
+            assert len(stub.requests) == 2
+
+    Each route answers with its responses in order and repeats the last.
+    Unknown routes get a 404. Every request is recorded in ``requests``.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[Tuple[str, str], List[StubResponse]] = {}
+        self.requests: List[RecordedRequest] = []
+        self.lock = threading.Lock()
+        self.server: Optional[_Server] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, method: str, path: str, *responses: StubResponse) -> None:
+        with self.lock:
+            self.routes[(method.upper(), path)] = list(
+                responses or [StubResponse()]
+            )
+
+    def url(self, path: str = "/") -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def next_response(self, method: str, path: str) -> StubResponse:
+        with self.lock:
+            responses: Optional[List[StubResponse]] = self.routes.get(
+                (method, path.split("?")[0])
+            )
+            if not responses:
+                return StubResponse(status=404)
+            return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    def handler(self) -> type:
+        stub: StubServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def answer(self) -> None:
+                length: int = int(self.headers.get("Content-Length") or 0)
+                body: bytes = self.rfile.read(length) if length else b""
+                with stub.lock:
+                    stub.requests.append(
+                        RecordedRequest(
+                            self.command, self.path, dict(self.headers), body
+                        )
+                    )
+                response: StubResponse = stub.next_response(
+                    self.command, self.path
+                )
+                if response.delay:
+                    time.sleep(response.delay)
+                if response.drop:
+                    self.close_connection = True
+                    return
+                payload: bytes = response.body
+                headers: Dict[str, str] = dict(response.headers)
+                if response.json is not None:
+                    payload = json.dumps(response.json).encode()
+                    headers.setdefault("Content-Type", "application/json")
+                try:
+                    self.send_response(response.status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up first, e.g. on a delayed answer.
+                    self.close_connection = True
+
+            do_GET = do_HEAD = do_POST = do_PUT = answer
+            do_PATCH = do_DELETE = do_OPTIONS = answer
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self.server = _Server(("127.0.0.1", 0), self.handler())
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
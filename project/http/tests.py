@@ -0,0 +1,206 @@
+"""
+Tests for the outbound HTTP client against ``StubServer``: retries and
+Retry-After, the circuit breaker and the default timeout.
+
+Every test builds a fresh session from the ``HTTP_CLIENT_*`` settings it
+overrides; breakers are reset with it.
+"""
+
+import threading
+import time
+from typing import Any, Iterator, List
+
+import pytest
+import requests
+from asgiref.sync import async_to_sync
+from urllib3 import HTTPResponse
+
+from project import http
+from project.http.breaker import CircuitBreaker, _breakers
+from project.http.client import JitteredRetry
+
+
+@pytest.fixture
+def client_settings(settings: Any) -> Iterator[Any]:
+    settings.HTTP_CLIENT_RETRIES = 0
+    settings.HTTP_CLIENT_BACKOFF = 0.0
+    settings.HTTP_CLIENT_BACKOFF_MAX = 0.2
+    settings.HTTP_CLIENT_READ_TIMEOUT = 5.0
+    settings.HTTP_CLIENT_BREAKER_FAILURES = 2
+    settings.HTTP_CLIENT_BREAKER_RESET = 30.0
+    http.reset_session()
+    yield settings
+    http.reset_session()
+
+
+@pytest.fixture
+def stub() -> Iterator[http.StubServer]:
+    with http.StubServer() as server:
+        yield server
+
+
+def breaker_for(stub: http.StubServer) -> CircuitBreaker:
+    host, port = stub.server.server_address[:2]
+    return _breakers[f"{host}:{port}"]
+
+
+def expire(breaker: CircuitBreaker) -> None:
+    """Let ``reset_timeout`` pass without sleeping through it."""
+    breaker.opened_at -= breaker.reset_timeout
+
+
+def test_retry_after_is_capped_at_backoff_max():
+    retry = JitteredRetry(total=1, backoff_max=5.0)
+    for value, expected in (("3600", 5.0), ("2", 2.0)):
+        response = HTTPResponse(headers={"Retry-After": value})
+        assert retry.get_retry_after(response) == expected
+
+
+def test_retry_after_does_not_block_past_backoff_max(
+    client_settings: Any, stub: http.StubServer
+):
+    client_settings.HTTP_CLIENT_RETRIES = 1
+    stub.add(
+        "GET",
+        "/busy",
+        http.StubResponse(503, headers={"Retry-After": "3600"}),
+        http.StubResponse(json={"ok": True}),
+    )
+    started: float = time.monotonic()
+    response = http.request("GET", stub.url("/busy"))
+    elapsed: float = time.monotonic() - started
+    assert response.json() == {"ok": True}
+    assert len(stub.requests) == 2
+    assert 0.2 <= elapsed < 2
+
+
+def test_retries_give_up_with_the_last_response(
+    client_settings: Any, stub: http.StubServer
+):
+    client_settings.HTTP_CLIENT_RETRIES = 2
+    stub.add("GET", "/down", http.StubResponse(502))
+    assert http.request("GET", stub.url("/down")).status_code == 502
+    assert len(stub.requests) == 3
+
+
+def test_post_is_not_retried(client_settings: Any, stub: http.StubServer):
+    client_settings.HTTP_CLIENT_RETRIES = 2
+    stub.add("POST", "/items", http.StubResponse(503), http.StubResponse())
+    assert http.request("POST", stub.url("/items")).status_code == 503
+    assert len(stub.requests) == 1
+
+
+def test_breaker_opens_after_consecutive_failures(
+    client_settings: Any, stub: http.StubServer
+):
+    stub.add("GET", "/flaky", http.StubResponse(500))
+    for _ in range(2):
+        assert http.request("GET", stub.url("/flaky")).status_code == 500
+    assert breaker_for(stub).state == "open"
+    with pytest.raises(http.CircuitOpenError):
+        http.request("GET", stub.url("/flaky"))
+    # Failed fast, without calling the server.
+    assert len(stub.requests) == 2
+
+
+def test_success_resets_the_failure_count(
+    client_settings: Any, stub: http.StubServer
+):
+    stub.add(
+        "GET",
+        "/flaky",
+        http.StubResponse(500),
+        http.StubResponse(200),
+        http.StubResponse(500),
+    )
+    for _ in range(3):
+        http.request("GET", stub.url("/flaky"))
+    assert breaker_for(stub).state == "closed"
+
+
+def test_client_errors_do_not_open_the_breaker(
+    client_settings: Any, stub: http.StubServer
+):
+    stub.add("GET", "/missing", http.StubResponse(404))
+    for _ in range(3):
+        http.request("GET", stub.url("/missing"))
+    assert breaker_for(stub).state == "closed"
+
+
+def test_half_open_allows_a_single_trial(
+    client_settings: Any, stub: http.StubServer
+):
+    stub.add(
+        "GET",
+        "/flaky",
+        http.StubResponse(500),
+        http.StubResponse(500),
+        # The trial: slow enough for a second request to arrive meanwhile.
+        http.StubResponse(200, delay=0.5),
+    )
+    for _ in range(2):
+        http.request("GET", stub.url("/flaky"))
+    breaker: CircuitBreaker = breaker_for(stub)
+    expire(breaker)
+    assert breaker.state == "half_open"
+
+    results: List[Any] = []
+    trial = threading.Thread(
+        target=lambda: results.append(http.request("GET", stub.url("/flaky")))
+    )
+    trial.start()
+    while len(stub.requests) < 3:
+        time.sleep(0.01)
+    with pytest.raises(http.CircuitOpenError):
+        http.request("GET", stub.url("/flaky"))
+    trial.join()
+    assert results[0].status_code == 200
+    assert breaker.state == "closed"
+    assert len(stub.requests) == 3
+
+
+def test_failed_trial_opens_the_circuit_again(
+    client_settings: Any, stub: http.StubServer
+):
+    stub.add("GET", "/flaky", http.StubResponse(500))
+    for _ in range(2):
+        http.request("GET", stub.url("/flaky"))
+    breaker: CircuitBreaker = breaker_for(stub)
+    expire(breaker)
+    assert http.request("GET", stub.url("/flaky")).status_code == 500
+    assert breaker.state == "open"
+    with pytest.raises(http.CircuitOpenError):
+        http.request("GET", stub.url("/flaky"))
+
+
+def test_breaker_counts_connection_errors(client_settings: Any):
+    with http.StubServer() as stub:
+        url: str = stub.url("/gone")
+    # Nothing listens on the port any more.
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            http.request("GET", url)
+    with pytest.raises(http.CircuitOpenError):
+        http.request("GET", url)
+
+
+def test_default_timeout_applies(client_settings: Any, stub: http.StubServer):
+    client_settings.HTTP_CLIENT_READ_TIMEOUT = 0.2
+    stub.add("GET", "/slow", http.StubResponse(delay=1.0))
+    started: float = time.monotonic()
+    with pytest.raises(requests.RequestException):
+        http.request("GET", stub.url("/slow"))
+    assert time.monotonic() - started < 0.9
+
+
+def test_explicit_timeout_wins(client_settings: Any, stub: http.StubServer):
+    client_settings.HTTP_CLIENT_READ_TIMEOUT = 0.2
+    stub.add("GET", "/slow", http.StubResponse(delay=0.5))
+    response = http.request("GET", stub.url("/slow"), timeout=5)
+    assert response.status_code == 200
+
+
+def test_arequest(client_settings: Any, stub: http.StubServer):
+    stub.add("GET", "/items", http.StubResponse(json=[1, 2]))
+    response = async_to_sync(http.arequest)("GET", stub.url("/items"))
+    assert response.json() == [1, 2]
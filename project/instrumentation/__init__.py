@@ -0,0 +1,31 @@
+"""
+Query-count and slow-query guardrails.
+
+``track_queries`` counts the queries and database time of a block through
+``connection.execute_wrapper`` and checks them against a ``QueryBudget``
+(``atrack_queries`` in coroutines).
+``middleware.QueryBudgetMiddleware`` does the same for every request,
+logging or raising with the offending SQL fingerprint, so N+1 queries
+show up before they ship. ``pytest_plugin`` fails tests whose query count
+regressed from a recorded baseline.
+"""
+
+from .middleware import query_budget
+from .queries import (
+    QueryBudget,
+    QueryBudgetExceeded,
+    QueryRecorder,
+    atrack_queries,
+    fingerprint,
+    track_queries,
+)
+
+__all__ = [
+    "QueryBudget",
+    "QueryBudgetExceeded",
+    "QueryRecorder",
+    "atrack_queries",
+    "fingerprint",
+    "query_budget",
+    "track_queries",
+]
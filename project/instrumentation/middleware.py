@@ -0,0 +1,109 @@
+from typing import Any, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .queries import QueryBudget, atrack_queries, enforce, track_queries
+
+ACTIONS: tuple = ("log", "raise")
+
+
+def view_budget(view_func: Callable, method: str) -> Optional[QueryBudget]:
+    """
+    The ``query_budget`` declared by a view function, or by the class of a
+    class-based view or DRF view set. View sets may map actions to
+    budgets: ``query_budget = {"list": QueryBudget(max_queries=3)}``.
+    """
+    budget: Any = getattr(view_func, "query_budget", None)
+    if budget is None:
+        view_class: Any = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        actions: dict = getattr(view_func, "actions", None) or {}
+        return budget.get(actions.get(method.lower()))
+    return budget
+
+
+def query_budget(**limits: Any) -> Callable[[Callable], Callable]:
+    """Set the budget of a function-based view: ``@query_budget(...)``."""
+
+    def decorator(view_func: Callable) -> Callable:
+        view_func.query_budget = QueryBudget(**limits)
+        return view_func
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries and database time of every request and log or raise
+    (``QUERY_BUDGET``) when they exceed the view's ``query_budget``, whose
+    unset limits come from the ``QUERY_BUDGET_MAX_*`` settings.
+
+    With ``DEBUG`` on, responses carry the totals in ``Server-Timing``, so
+    they show up in the browser's network panel.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # No I/O in the hook: keep it off Django's sync_to_async hop.
+            self.process_view = self.aprocess_view
+        self.action: str = settings.QUERY_BUDGET
+        if self.action not in ACTIONS:
+            raise ImproperlyConfigured(
+                f"QUERY_BUDGET must be one of {', '.join(ACTIONS)} or 'off', "
+                f"not '{self.action}'."
+            )
+        self.default = QueryBudget(
+            max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+            max_time_ms=settings.QUERY_BUDGET_MAX_TIME_MS,
+            max_duplicates=settings.QUERY_BUDGET_MAX_DUPLICATES,
+        )
+
+    def process_view(
+        self,
+        request: Any,
+        view_func: Callable,
+        view_args: tuple,
+        view_kwargs: dict,
+    ) -> None:
+        budget: Optional[QueryBudget] = view_budget(view_func, request.method)
+        if budget is not None:
+            request._query_budget = budget.merged(self.default)
+
+    async def aprocess_view(self, *args: Any) -> None:
+        QueryBudgetMiddleware.process_view(self, *args)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_queries() as recorder:
+            response = self.get_response(request)
+        return self.check(request, response, recorder)
+
+    async def __acall__(self, request: Any) -> Any:
+        async with atrack_queries() as recorder:
+            response = await self.get_response(request)
+        return self.check(request, response, recorder)
+
+    def check(self, request: Any, response: Any, recorder: Any) -> Any:
+        if settings.DEBUG:
+            response["Server-Timing"] = (
+                f'db;dur={recorder.duration_ms:.1f};desc="{recorder.count} '
+                f'queries"'
+            )
+        enforce(
+            getattr(request, "_query_budget", self.default),
+            recorder,
+            f"{request.method} {request.path}",
+            self.action,
+        )
+        return response
@@ -0,0 +1,151 @@
+"""
+pytest plugin that fails tests whose query count grew.
+
+The queries each database test runs (fixtures excluded) are compared with
+a JSON baseline of ``{node id: count}``; a test that runs more than its
+baseline plus ``--query-tolerance`` fails with its most repeated SQL.
+Tests missing from the baseline only get recorded.
+
+* ``pytest --record-query-baseline`` writes the counts of the tests that
+  ran into the baseline, keeping the entries of the others. Record
+  without ``-n`` (pytest-xdist workers do not write the file).
+* ``--query-baseline=PATH`` (or the ``query_baseline`` ini option) moves
+  the file from its default ``query_baseline.json`` in the rootdir.
+* ``@pytest.mark.query_budget(max_queries=3, max_duplicates=1)`` checks a
+  test against a fixed ``QueryBudget`` as well.
+
+Loaded from the rootdir conftest.py.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from .queries import QueryBudget, enforce, track_queries
+
+DB_FIXTURES = frozenset(
+    {
+        "db",
+        "transactional_db",
+        "django_db_reset_sequences",
+        "django_db_serialized_rollback",
+    }
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("query-baseline", "query count baseline")
+    group.addoption(
+        "--query-baseline",
+        default=None,
+        help="Baseline file (default: query_baseline.json in the rootdir).",
+    )
+    group.addoption(
+        "--record-query-baseline",
+        action="store_true",
+        help="Write the query counts of this run to the baseline.",
+    )
+    group.addoption(
+        "--query-tolerance",
+        type=int,
+        default=0,
+        help="Extra queries allowed over the baseline.",
+    )
+    parser.addini("query_baseline", "Path of the query count baseline.")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "query_budget(**limits): fail the test when its queries exceed "
+        "project.instrumentation.QueryBudget(**limits).",
+    )
+    config.pluginmanager.register(QueryBaseline(config), "query_baseline")
+
+
+def uses_database(item: pytest.Item) -> bool:
+    if item.get_closest_marker("django_db"):
+        return True
+    if DB_FIXTURES & set(getattr(item, "fixturenames", ())):
+        return True
+    cls: Optional[type] = getattr(item, "cls", None)
+    if cls is None:
+        return False
+    from django.test import TransactionTestCase
+
+    return issubclass(cls, TransactionTestCase)
+
+
+class QueryBaseline:
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        option: Optional[str] = config.getoption("query_baseline")
+        self.path = Path(
+            option
+            or config.getini("query_baseline")
+            or config.rootpath / "query_baseline.json"
+        )
+        self.record: bool = config.getoption("record_query_baseline")
+        self.tolerance: int = config.getoption("query_tolerance")
+        self.baseline: Dict[str, int] = (
+            json.loads(self.path.read_text()) if self.path.exists() else {}
+        )
+        self.counts: Dict[str, int] = {}
+        self.regressions: List[Tuple[str, int, int]] = []
+        self.improvements: List[Tuple[str, int, int]] = []
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Any:
+        if not uses_database(item):
+            return (yield)
+
+        with track_queries() as recorder:
+            result: Any = yield
+        self.counts[item.nodeid] = recorder.count
+
+        marker = item.get_closest_marker("query_budget")
+        if marker is not None:
+            enforce(QueryBudget(**marker.kwargs), recorder, item.nodeid)
+
+        expected: Optional[int] = self.baseline.get(item.nodeid)
+        if self.record or expected is None:
+            return result
+        if recorder.count < expected:
+            self.improvements.append((item.nodeid, expected, recorder.count))
+        elif recorder.count > expected + self.tolerance:
+            self.regressions.append((item.nodeid, expected, recorder.count))
+            pytest.fail(
+                f"Query count regressed from {expected} to "
+                f"{recorder.count} (tolerance {self.tolerance}); "
+                "if intended, rerun with --record-query-baseline.\n"
+                f"{recorder.report()}",
+                pytrace=False,
+            )
+        return result
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not self.record or hasattr(self.config, "workerinput"):
+            return
+        merged: Dict[str, int] = {**self.baseline, **self.counts}
+        self.path.write_text(
+            json.dumps(dict(sorted(merged.items())), indent=2) + "\n"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.record and self.counts:
+            terminalreporter.write_line(
+                f"query baseline: recorded {len(self.counts)} tests "
+                f"in {self.path}"
+            )
+        if self.regressions:
+            terminalreporter.write_line(
+                f"query baseline: {len(self.regressions)} tests regressed"
+            )
+        if self.improvements:
+            terminalreporter.write_line(
+                f"query baseline: {len(self.improvements)} tests run fewer "
+                "queries than recorded; --record-query-baseline lowers "
+                "their baseline"
+            )
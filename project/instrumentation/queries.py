@@ -0,0 +1,251 @@
+import logging
+import re
+import time
+from collections import defaultdict
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass, fields
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+# "IN (?, ?, ?)" and multi-row "VALUES (?, ?), (?, ?)" collapse to one
+# shape whatever the number of items.
+_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalize ``sql`` so statements that differ only in their parameters
+    (one query per row of an N+1, say) share a fingerprint.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub(r"\1", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    ``connection.execute_wrapper`` callable counting queries and DB time.
+
+    Statements are tallied by their SQL text, which Django keeps free of
+    parameter values, so recording stays a dictionary update per query;
+    fingerprints are only computed when a report is asked for.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.duration: float = 0.0
+        self.statements: Dict[str, List[float]] = defaultdict(
+            lambda: [0, 0.0]
+        )
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed: float = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            entry: List[float] = self.statements[sql]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def by_fingerprint(self) -> List[Tuple[str, int, float]]:
+        """``(fingerprint, count, ms)`` rows, most repeated first."""
+        grouped: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        for sql, (count, elapsed) in self.statements.items():
+            entry: List[float] = grouped[fingerprint(sql)]
+            entry[0] += count
+            entry[1] += elapsed
+        return sorted(
+            (
+                (sql, int(count), elapsed * 1000)
+                for sql, (count, elapsed) in grouped.items()
+            ),
+            key=lambda row: (-row[1], -row[2]),
+        )
+
+    @property
+    def max_duplicates(self) -> int:
+        rows = self.by_fingerprint()
+        return rows[0][1] if rows else 0
+
+    def report(self, limit: int = 3) -> str:
+        lines: List[str] = [
+            f"{self.count} queries in {self.duration_ms:.1f} ms"
+        ]
+        for sql, count, elapsed in self.by_fingerprint()[:limit]:
+            lines.append(f"  {count}x {elapsed:.1f} ms  {sql}")
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Limits for one request or block. ``None`` means "no limit", or "the
+    project default" once merged with one (see ``merged``).
+    """
+
+    max_queries: Optional[int] = None
+    max_time_ms: Optional[float] = None
+    # Runs of the same fingerprint: the signature of an N+1.
+    max_duplicates: Optional[int] = None
+
+    def merged(self, default: "QueryBudget") -> "QueryBudget":
+        return QueryBudget(
+            **{
+                field.name: (
+                    getattr(self, field.name)
+                    if getattr(self, field.name) is not None
+                    else getattr(default, field.name)
+                )
+                for field in fields(self)
+            }
+        )
+
+    def violations(self, recorder: QueryRecorder) -> List[str]:
+        found: List[str] = []
+        if self.max_queries is not None and recorder.count > self.max_queries:
+            found.append(f"{recorder.count} queries > {self.max_queries}")
+        if (
+            self.max_time_ms is not None
+            and recorder.duration_ms > self.max_time_ms
+        ):
+            found.append(
+                f"{recorder.duration_ms:.1f} ms in the database "
+                f"> {self.max_time_ms:g} ms"
+            )
+        if self.max_duplicates is not None:
+            duplicates: int = recorder.max_duplicates
+            if duplicates > self.max_duplicates:
+                found.append(
+                    f"one statement ran {duplicates} times "
+                    f"> {self.max_duplicates}"
+                )
+        return found
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(
+        self, label: str, violations: List[str], recorder: QueryRecorder
+    ) -> None:
+        self.label = label
+        self.violations = violations
+        self.recorder = recorder
+        super().__init__(
+            f"Query budget exceeded for {label}: {'; '.join(violations)}\n"
+            f"{recorder.report()}"
+        )
+
+
+def enforce(
+    budget: QueryBudget,
+    recorder: QueryRecorder,
+    label: str,
+    action: str = "raise",
+) -> None:
+    """Raise ``QueryBudgetExceeded`` or log a warning if over budget."""
+    violations: List[str] = budget.violations(recorder)
+    if not violations:
+        return
+    error = QueryBudgetExceeded(label, violations, recorder)
+    if action == "raise":
+        raise error
+    top: List[Tuple[str, int, float]] = recorder.by_fingerprint()
+    logger.warning(
+        str(error),
+        extra={
+            "label": label,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration_ms, 1),
+            "fingerprint": top[0][0] if top else "",
+        },
+    )
+
+
+@contextmanager
+def track_queries(
+    budget: Optional[QueryBudget] = None,
+    label: str = "block",
+    action: str = "raise",
+    using: Optional[str] = None,
+) -> Iterator[QueryRecorder]:
+    """
+    Record the queries run inside the block on ``using`` (every database
+    by default) and check them against ``budget`` when it exits::
+
+        with track_queries(QueryBudget(max_queries=3)) as recorder:
+            ...
+        recorder.count, recorder.duration_ms
+    """
+    recorder = QueryRecorder()
+    aliases: List[str] = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+    if budget is not None:
+        enforce(budget, recorder, label, action)
+
+
+@asynccontextmanager
+async def atrack_queries(
+    budget: Optional[QueryBudget] = None,
+    label: str = "block",
+    action: str = "raise",
+    using: Optional[str] = None,
+) -> AsyncIterator[QueryRecorder]:
+    """
+    ``track_queries`` for coroutines. Connections are per thread and the
+    ORM runs in ``sync_to_async`` threads, never on the event loop, so
+    the recorder is installed (and removed) through a thread-sensitive
+    ``sync_to_async`` call: under ASGI, that is the thread every sync
+    view and async ORM call of the request runs in.
+    """
+    recorder = QueryRecorder()
+    stack = ExitStack()
+
+    def install() -> None:
+        aliases: List[str] = [using] if using else list(connections)
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+
+    await sync_to_async(install)()
+    try:
+        yield recorder
+    finally:
+        await sync_to_async(stack.close)()
+    if budget is not None:
+        enforce(budget, recorder, label, action)
@@ -0,0 +1,287 @@
+"""
+Tests for the query guardrails: SQL fingerprints, budgets, the
+``QueryBudgetMiddleware`` in its log and raise modes, and the pytest
+baseline plugin, which runs in a separate pytest process.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.models import Group
+from django.http import HttpResponse
+from django.urls import path
+
+from project.instrumentation import (
+    QueryBudget,
+    QueryBudgetExceeded,
+    fingerprint,
+    query_budget,
+    track_queries,
+)
+from project.instrumentation.middleware import view_budget
+
+
+def run_queries(count: int) -> None:
+    for number in range(count):
+        Group.objects.filter(pk=number).exists()
+
+
+@query_budget(max_queries=2)
+def budgeted_view(request: Any) -> HttpResponse:
+    run_queries(int(request.GET["queries"]))
+    return HttpResponse("ok")
+
+
+def default_view(request: Any) -> HttpResponse:
+    run_queries(int(request.GET["queries"]))
+    return HttpResponse("ok")
+
+
+urlpatterns = [
+    path("budgeted/", budgeted_view),
+    path("default/", default_view),
+]
+
+
+@pytest.fixture
+def budget_settings(db: None, settings: Any) -> Any:
+    settings.ROOT_URLCONF = __name__
+    settings.QUERY_BUDGET_MAX_QUERIES = 50
+    settings.QUERY_BUDGET_MAX_TIME_MS = 500.0
+    settings.QUERY_BUDGET_MAX_DUPLICATES = 3
+    return settings
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        (
+            "SELECT * FROM t WHERE id = 42 AND name = 'it''s'",
+            "SELECT * FROM t WHERE id = ? AND name = ?",
+        ),
+        (
+            "SELECT * FROM t WHERE id IN (%s, %s, %s)",
+            "SELECT * FROM t WHERE id IN (...)",
+        ),
+        (
+            'INSERT INTO "t" ("a", "b") VALUES (?, ?), (?, ?), (?, ?)',
+            'INSERT INTO "t" ("a", "b") VALUES (...)',
+        ),
+        ("SELECT  1\n  FROM t1", "SELECT ? FROM t1"),
+    ],
+)
+def test_fingerprint(sql: str, expected: str):
+    assert fingerprint(sql) == expected
+
+
+def test_fingerprint_groups_in_lists_of_any_length():
+    assert fingerprint("WHERE id IN (?)") != fingerprint("WHERE id IN (?, ?)")
+    assert fingerprint("WHERE id IN (?, ?)") == fingerprint(
+        "WHERE id IN (?, ?, ?, ?)"
+    )
+
+
+def test_merged_budget_keeps_set_limits():
+    default = QueryBudget(max_queries=50, max_time_ms=500, max_duplicates=10)
+    merged = QueryBudget(max_queries=3, max_duplicates=0).merged(default)
+    assert merged == QueryBudget(
+        max_queries=3, max_time_ms=500, max_duplicates=0
+    )
+    assert QueryBudget().merged(default) == default
+
+
+@pytest.mark.django_db
+def test_track_queries_reports_the_repeated_statement():
+    with pytest.raises(QueryBudgetExceeded) as raised:
+        with track_queries(QueryBudget(max_duplicates=2), label="loop"):
+            run_queries(3)
+    assert raised.value.violations == ["one statement ran 3 times > 2"]
+    assert "3x" in str(raised.value)
+    assert '"auth_group"."id" = ?' in str(raised.value)
+
+
+@pytest.mark.django_db
+def test_track_queries_counts_within_budget():
+    with track_queries(QueryBudget(max_queries=2)) as recorder:
+        run_queries(2)
+    assert recorder.count == 2
+    assert recorder.max_duplicates == 2
+
+
+def test_view_set_budgets_by_action():
+    budget = QueryBudget(max_queries=1)
+
+    class ViewSet:
+        query_budget = {"list": budget}
+
+    def view() -> None:
+        pass
+
+    view.cls = ViewSet
+    view.actions = {"get": "list", "post": "create"}
+    assert view_budget(view, "GET") is budget
+    assert view_budget(view, "POST") is None
+
+
+def test_middleware_raises_over_budget(budget_settings: Any, client: Any):
+    budget_settings.QUERY_BUDGET = "raise"
+    assert client.get("/budgeted/", {"queries": 2}).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="GET /budgeted/"):
+        client.get("/budgeted/", {"queries": 3})
+
+
+def test_middleware_logs_over_budget(
+    budget_settings: Any, client: Any, caplog: pytest.LogCaptureFixture
+):
+    budget_settings.QUERY_BUDGET = "log"
+    with caplog.at_level(logging.WARNING, "project.instrumentation"):
+        response = client.get("/budgeted/", {"queries": 3})
+    assert response.status_code == 200
+    [record] = caplog.records
+    assert record.label == "GET /budgeted/"
+    assert record.queries == 3
+    assert "3 queries > 2" in record.getMessage()
+
+
+def test_middleware_applies_the_default_budget(
+    budget_settings: Any, client: Any
+):
+    budget_settings.QUERY_BUDGET = "raise"
+    # Three queries fit the default 50, four repeats do not fit 3.
+    assert client.get("/default/", {"queries": 3}).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="ran 4 times > 3"):
+        client.get("/default/", {"queries": 4})
+
+
+def test_middleware_adds_server_timing_under_debug(
+    budget_settings: Any, client: Any
+):
+    budget_settings.DEBUG = True
+    response = client.get("/budgeted/", {"queries": 1})
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert response["Server-Timing"].endswith('desc="1 queries"')
+
+
+PLUGIN_TESTS: str = """
+import os
+
+import pytest
+from django.contrib.auth.models import Group
+
+
+def run_queries():
+    for number in range(int(os.environ["QUERIES"])):
+        Group.objects.filter(pk=number).exists()
+
+
+@pytest.mark.django_db
+def test_counted():
+    run_queries()
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(max_queries=2)
+def test_budgeted():
+    run_queries()
+
+
+def test_without_database():
+    pass
+"""
+
+
+class PluginRun:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.baseline: Path = directory / "baseline.json"
+        (directory / "test_counts.py").write_text(PLUGIN_TESTS)
+        # An empty ini file keeps the repository's pytest settings out.
+        (directory / "pytest.ini").write_text("[pytest]\n")
+
+    def __call__(
+        self, queries: int, *options: str
+    ) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-p",
+                "project.instrumentation.pytest_plugin",
+                "-p",
+                "no:cacheprovider",
+                "--ds=project.settings.test",
+                f"--query-baseline={self.baseline}",
+                "test_counts.py",
+                *options,
+            ],
+            cwd=self.directory,
+            env={
+                **os.environ,
+                "PYTHONPATH": str(django_settings.BASE_DIR),
+                "QUERIES": str(queries),
+            },
+            capture_output=True,
+            text=True,
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return json.loads(self.baseline.read_text())
+
+
+@pytest.fixture
+def plugin_run(tmp_path: Path) -> PluginRun:
+    return PluginRun(tmp_path)
+
+
+def test_plugin_records_the_baseline(plugin_run: PluginRun):
+    result = plugin_run(1, "--record-query-baseline")
+    assert result.returncode == 0, result.stdout
+    assert "recorded 2 tests" in result.stdout
+    assert plugin_run.counts() == {
+        "test_counts.py::test_budgeted": 1,
+        "test_counts.py::test_counted": 1,
+    }
+
+
+def test_plugin_fails_regressions(plugin_run: PluginRun):
+    plugin_run(1, "--record-query-baseline")
+    assert plugin_run(1).returncode == 0
+    result = plugin_run(2, "-k", "counted")
+    assert result.returncode == 1
+    assert "Query count regressed from 1 to 2" in result.stdout
+    assert "1 tests regressed" in result.stdout
+    result = plugin_run(2, "-k", "counted", "--query-tolerance=1")
+    assert result.returncode == 0, result.stdout
+
+
+def test_plugin_reports_improvements(plugin_run: PluginRun):
+    plugin_run(2, "--record-query-baseline")
+    result = plugin_run(1)
+    assert result.returncode == 0, result.stdout
+    assert "2 tests run fewer queries than recorded" in result.stdout
+
+
+def test_plugin_rerecording_keeps_other_entries(plugin_run: PluginRun):
+    plugin_run(1, "--record-query-baseline")
+    plugin_run(2, "-k", "counted", "--record-query-baseline")
+    assert plugin_run.counts() == {
+        "test_counts.py::test_budgeted": 1,
+        "test_counts.py::test_counted": 2,
+    }
+
+
+def test_plugin_enforces_the_query_budget_marker(plugin_run: PluginRun):
+    result = plugin_run(3, "-k", "budgeted")
+    assert result.returncode == 1
+    assert (
+        "Query budget exceeded for test_counts.py::test_budgeted: "
+        "3 queries > 2" in result.stdout
+    )
@@ -0,0 +1,129 @@
+"""
+Builds ``LOGGING`` from environment variables.
+
+Records are put on a queue by the calling thread and written to disk by a
+background ``QueueListener``, so request threads never wait on file I/O.
+This module is imported from the settings files and must stay free of
+Django imports.
+"""
+
+import os
+from typing import Any, Dict
+
+import environ
+
+
+def _file_handler(
+    filename: str, env: environ.Env, formatter: str
+) -> Dict[str, Any]:
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    common: Dict[str, Any] = {
+        "filename": filename,
+        "formatter": formatter,
+        "encoding": "utf-8",
+        "delay": True,
+    }
+    rotation: str = env.str("LOG_ROTATION", "external")
+    # In-process rotation is only safe with a single process writing the
+    # file: gunicorn workers would each rotate it under the others.
+    if rotation == "time":
+        return {
+            "class": "logging.handlers.TimedRotatingFileHandler",
+            "when": env.str("LOG_ROTATION_WHEN", "midnight"),
+            "utc": True,
+            "backupCount": env.int("LOG_BACKUP_COUNT", 5),
+            **common,
+        }
+    if rotation == "size":
+        return {
+            "class": "logging.handlers.RotatingFileHandler",
+            "maxBytes": env.int("LOG_MAX_BYTES", 50 * 1024 * 1024),
+            "backupCount": env.int("LOG_BACKUP_COUNT", 5),
+            **common,
+        }
+    # Rotated by logrotate (or similar); every process reopens the file
+    # once it has been moved away.
+    return {"class": "logging.handlers.WatchedFileHandler", **common}
+
+
+def logging_config(
+    env: environ.Env, default_level: str, default_file: str
+) -> Dict[str, Any]:
+    """
+    Return a ``LOGGING`` dict.
+
+    ``LOG_LEVEL`` and ``DJANGO_LOG_LEVEL`` default to the profile's
+    ``default_level``; ``LOG_FORMAT=json`` switches to structured output.
+    ``LOG_FILE`` (``default_file`` when unset) is rotated externally
+    (``WatchedFileHandler``) unless ``LOG_ROTATION`` is ``size`` or
+    ``time``, which only suit a single server process. An empty
+    ``LOG_FILE`` logs to the console only.
+    """
+    level: str = env.str("LOG_LEVEL", default_level).upper()
+    formatter: str = env.str("LOG_FORMAT", "verbose")
+    filename: str = env.str("LOG_FILE", default_file)
+    handlers: Dict[str, Any] = {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": formatter,
+        },
+    }
+    target_handlers = []
+    if filename:
+        handlers["file"] = _file_handler(filename, env, formatter)
+        target_handlers.append("file")
+    if not filename or env.bool("LOG_CONSOLE", False):
+        target_handlers.append("console")
+
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "verbose": {
+                "format": "{name} {levelname} {asctime} {module} {message}",
+                "style": "{",
+            },
+            "simple": {
+                "format": "{levelname} {message}",
+                "style": "{",
+            },
+            "json": {
+                "()": "project.log.formatters.JSONFormatter",
+            },
+        },
+        "handlers": {
+            **handlers,
+            "queue": {
+                "class": "project.log.handlers.AsyncQueueHandler",
+                "handlers": target_handlers,
+                # Bounded, so a stalled disk drops records instead of
+                # growing memory without limit.
+                "queue": {
+                    "()": "queue.Queue",
+                    "maxsize": env.int("LOG_QUEUE_SIZE", 10000),
+                },
+                "respect_handler_level": True,
+            },
+        },
+        "root": {
+            "handlers": ["queue"],
+            "level": level,
+        },
+        "loggers": {
+            "django": {
+                "level": env.str("DJANGO_LOG_LEVEL", level).upper(),
+                "propagate": True,
+            },
+            # Every SQL statement is logged here when DEBUG is on.
+            "django.db.backends": {
+                "level": env.str("DB_LOG_LEVEL", "INFO").upper(),
+                "propagate": True,
+            },
+            # factory_boy logs every declaration it evaluates (seed_perf
+            # evaluates millions).
+            "factory": {
+                "level": "INFO",
+                "propagate": True,
+            },
+        },
+    }
@@ -0,0 +1,59 @@
+import atexit
+import logging
+import os
+import queue
+from logging import LogRecord
+from logging.handlers import QueueHandler
+from typing import Optional
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` whose ``QueueListener`` is started on first use.
+
+    ``logging.config.dictConfig`` builds the listener from the ``handlers``
+    key (Python 3.12+) but leaves starting it to the caller. Starting it
+    lazily, once per process id, also covers forked workers (gunicorn
+    ``--preload``), which inherit the handler but not the listener thread.
+
+    Records that find the queue full are dropped and counted in
+    ``dropped``; the next record that fits is preceded by a warning with
+    the count, rather than a traceback on stderr for every lost record.
+    """
+
+    _listener_pid: Optional[int] = None
+    dropped: int = 0
+
+    def _start_listener(self) -> None:
+        if self._listener_pid is not None:
+            # Forked child: the parent's thread is gone and its queue may
+            # have been copied mid-operation, so start from a fresh one.
+            self.queue = queue.Queue(self.queue.maxsize)
+            self.listener.queue = self.queue
+        self._listener_pid = os.getpid()
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def emit(self, record: LogRecord) -> None:
+        if self.listener is not None and self._listener_pid != os.getpid():
+            self._start_listener()
+        try:
+            if self.dropped:
+                self.enqueue(self.prepare(self._dropped_record()))
+                self.dropped = 0
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _dropped_record(self) -> LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "%d log records were dropped: the log queue was full",
+                "args": (self.dropped,),
+            }
+        )
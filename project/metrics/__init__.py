@@ -0,0 +1,48 @@
+"""
+In-process metrics in the Prometheus text format.
+
+``REGISTRY`` holds counters and histograms whose values live in an mmap:
+per process in memory, or with ``METRICS_DIR`` set one file per process
+in that directory, summed when ``/metrics`` is scraped so every gunicorn
+worker is counted. Recording is a dictionary lookup and a float update.
+
+* ``middleware.MetricsMiddleware``: request latency, status and database
+  time per URL name.
+* ``channels.ChannelsMetricsMiddleware``: WebSocket events, in asgi.py.
+* ``project.cache`` counts hits and misses per namespace.
+* ``project.http`` times outbound calls per host.
+
+Settings: ``METRICS_ENABLED`` (on in the local, dev and qa profiles),
+``METRICS_DIR`` (empty it before starting the server: counts of exited
+workers are kept in ``aggregate.metrics``) and ``METRICS_TOKEN`` (bearer
+token required by ``/metrics``; mandatory when ``DEBUG`` is off).
+``manage.py metrics_benchmark`` measures the per-request overhead.
+"""
+
+from .definitions import (
+    CACHE_REQUESTS,
+    CHANNELS_MESSAGES,
+    DB_DURATION,
+    DB_QUERIES,
+    HTTP_CLIENT_DURATION,
+    HTTP_CLIENT_REQUESTS,
+    REGISTRY,
+    REQUEST_DURATION,
+    REQUESTS,
+)
+from .registry import Counter, Histogram, Registry
+
+__all__ = [
+    "CACHE_REQUESTS",
+    "CHANNELS_MESSAGES",
+    "Counter",
+    "DB_DURATION",
+    "DB_QUERIES",
+    "HTTP_CLIENT_DURATION",
+    "HTTP_CLIENT_REQUESTS",
+    "Histogram",
+    "REGISTRY",
+    "REQUESTS",
+    "REQUEST_DURATION",
+    "Registry",
+]
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Dict
+
+from .definitions import CHANNELS_MESSAGES
+
+
+class ChannelsMetricsMiddleware:
+    """
+    ASGI middleware counting the WebSocket events that pass through it
+    (``websocket.receive``, ``websocket.send``, connects and closes);
+    their rates are the message rates of the consumers behind it.
+    """
+
+    def __init__(self, inner: Callable) -> None:
+        self.inner = inner
+
+    async def __call__(
+        self, scope: Dict[str, Any], receive: Callable, send: Callable
+    ) -> Any:
+        async def counted_receive() -> Dict[str, Any]:
+            message: Dict[str, Any] = await receive()
+            CHANNELS_MESSAGES.labels(message["type"]).inc()
+            return message
+
+        async def counted_send(message: Dict[str, Any]) -> None:
+            CHANNELS_MESSAGES.labels(message["type"]).inc()
+            await send(message)
+
+        return await self.inner(scope, counted_receive, counted_send)
@@ -0,0 +1,45 @@
+from .registry import Registry
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by URL name.",
+    ["view", "method"],
+)
+REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "Requests handled, by URL name and status class.",
+    ["view", "method", "status"],
+)
+DB_DURATION = REGISTRY.histogram(
+    "db_request_duration_seconds",
+    "Time a request spent in database queries, by URL name.",
+    ["view"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+DB_QUERIES = REGISTRY.counter(
+    "db_queries_total",
+    "Database queries run while handling requests, by URL name.",
+    ["view"],
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "project.cache lookups, by namespace and result (hit or miss).",
+    ["namespace", "result"],
+)
+CHANNELS_MESSAGES = REGISTRY.counter(
+    "channels_messages_total",
+    "WebSocket events received from and sent to clients, by type.",
+    ["type"],
+)
+HTTP_CLIENT_DURATION = REGISTRY.histogram(
+    "http_client_request_duration_seconds",
+    "Outbound calls through project.http, retries included, by host.",
+    ["host", "method"],
+)
+HTTP_CLIENT_REQUESTS = REGISTRY.counter(
+    "http_client_requests_total",
+    "Outbound calls by host and status class, 'error' or 'open' (circuit).",
+    ["host", "method", "status"],
+)
@@ -0,0 +1,447 @@
+import bisect
+import fcntl
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from django.conf import settings
+
+_HEADER = struct.Struct("i4x")
+_LENGTH = struct.Struct("i")
+_DOUBLE = struct.Struct("d")
+
+FILE_SUFFIX: str = ".metrics"
+# Values of exited processes, folded into one file.
+AGGREGATE: str = "aggregate"
+LOCK_FILE: str = ".lock"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _padded(length: int) -> int:
+    # Keeps every value 8-byte aligned, so a reader never sees half of one.
+    return length + (8 - (_LENGTH.size + length) % 8) % 8
+
+
+def read_entries(buffer: Any) -> Iterator[Tuple[str, float, int]]:
+    """``(key, value, value offset)`` of every entry in a store buffer."""
+    (used,) = _HEADER.unpack_from(buffer, 0)
+    position: int = _HEADER.size
+    while position < used:
+        (length,) = _LENGTH.unpack_from(buffer, position)
+        start: int = position + _LENGTH.size
+        key: str = bytes(buffer[start : start + length]).decode()
+        offset: int = start + _padded(length)
+        (value,) = _DOUBLE.unpack_from(buffer, offset)
+        yield key, value, offset
+        position = offset + _DOUBLE.size
+
+
+class Store:
+    """
+    Float values addressed by key, appended to an mmap.
+
+    With a ``path`` the map is a file other processes can read, one file
+    per process so writers never contend; without, it is anonymous
+    memory. Entries are ``[length][key][value]``; the header holding the
+    used size is updated after an entry is complete.
+    """
+
+    initial_size: int = 1 << 16
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.offsets: Dict[str, int] = {}
+        self.fd: Optional[int] = None
+        if path is None:
+            self.map = mmap.mmap(-1, self.initial_size)
+        else:
+            self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            size: int = os.fstat(self.fd).st_size
+            if size == 0:
+                size = self.initial_size
+                os.ftruncate(self.fd, size)
+            self.map = mmap.mmap(self.fd, size)
+        (self.used,) = _HEADER.unpack_from(self.map, 0)
+        if self.used == 0:
+            self.used = _HEADER.size
+            _HEADER.pack_into(self.map, 0, self.used)
+        # A file left by an earlier process with the same pid is continued.
+        for key, _, offset in read_entries(self.map):
+            self.offsets[key] = offset
+
+    def _grow(self, needed: int) -> None:
+        size: int = len(self.map)
+        while size < needed:
+            size *= 2
+        if self.fd is None:
+            grown = mmap.mmap(-1, size)
+            grown[: self.used] = self.map[: self.used]
+        else:
+            self.map.flush()
+            os.ftruncate(self.fd, size)
+            grown = mmap.mmap(self.fd, size)
+        self.map.close()
+        self.map = grown
+
+    def _allocate(self, key: str) -> int:
+        encoded: bytes = key.encode()
+        padded: int = _padded(len(encoded))
+        end: int = self.used + _LENGTH.size + padded + _DOUBLE.size
+        if end > len(self.map):
+            self._grow(end)
+        _LENGTH.pack_into(self.map, self.used, len(encoded))
+        start: int = self.used + _LENGTH.size
+        self.map[start : start + len(encoded)] = encoded
+        offset: int = start + padded
+        _DOUBLE.pack_into(self.map, offset, 0.0)
+        self.used = end
+        _HEADER.pack_into(self.map, 0, end)
+        self.offsets[key] = offset
+        return offset
+
+    def inc(self, key: str, amount: float) -> None:
+        with self.lock:
+            offset: Optional[int] = self.offsets.get(key)
+            if offset is None:
+                offset = self._allocate(key)
+            (value,) = _DOUBLE.unpack_from(self.map, offset)
+            _DOUBLE.pack_into(self.map, offset, value + amount)
+
+    def values(self) -> Dict[str, float]:
+        with self.lock:
+            return {key: value for key, value, _ in read_entries(self.map)}
+
+    def close(self) -> None:
+        self.map.close()
+        if self.fd is not None:
+            os.close(self.fd)
+
+
+@contextmanager
+def _locked(directory: str, operation: int) -> Iterator[None]:
+    # Scrapes read under a shared lock, merges write under an exclusive
+    # one: a scrape never sees a value in both a pid file and the
+    # aggregate, or in neither (which would look like a counter reset).
+    fd: int = os.open(Path(directory) / LOCK_FILE, os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(fd, operation)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _exited(path: Path) -> bool:
+    """True if ``path`` is the file of a process that no longer runs."""
+    try:
+        pid: int = int(path.stem)
+    except ValueError:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def sample_key(name: str, labels: Sequence[str], part: str = "") -> str:
+    return json.dumps([name, list(labels), part], separators=(",", ":"))
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+    )
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs: str = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind: str = ""
+
+    def __init__(
+        self,
+        registry: "Registry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self.children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str) -> Any:
+        child: Any = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} takes labels {self.labelnames}, "
+                    f"got {values}"
+                )
+            child = self.children[values] = self.make_child(values)
+        return child
+
+    def make_child(self, values: Tuple[str, ...]) -> Any:
+        raise NotImplementedError
+
+    def samples(self, values: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        """Exposition lines from ``{labels as JSON: {part: value}}``."""
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("registry", "key")
+
+    def __init__(self, registry: "Registry", key: str) -> None:
+        self.registry = registry
+        self.key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.registry.store().inc(self.key, amount)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def make_child(self, values: Tuple[str, ...]) -> _CounterChild:
+        return _CounterChild(self.registry, sample_key(self.name, values))
+
+    def samples(self, values: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        for labels, parts in sorted(values.items()):
+            yield (
+                f"{self.name}"
+                f"{_format_labels(self.labelnames, json.loads(labels))} "
+                f"{_format_value(parts.get('', 0.0))}"
+            )
+
+
+class _HistogramChild:
+    __slots__ = ("registry", "bounds", "bucket_keys", "sum_key")
+
+    def __init__(
+        self,
+        registry: "Registry",
+        name: str,
+        values: Tuple[str, ...],
+        bounds: Tuple[float, ...],
+    ) -> None:
+        self.registry = registry
+        self.bounds = bounds
+        # Counts per bucket (not cumulative): one increment per observation,
+        # and the count is their total.
+        self.bucket_keys: List[str] = [
+            sample_key(name, values, str(index))
+            for index in range(len(bounds) + 1)
+        ]
+        self.sum_key: str = sample_key(name, values, "sum")
+
+    def observe(self, value: float) -> None:
+        store: Store = self.registry.store()
+        store.inc(self.bucket_keys[bisect.bisect_left(self.bounds, value)], 1)
+        store.inc(self.sum_key, value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "Registry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.bounds: Tuple[float, ...] = tuple(sorted(buckets))
+
+    def make_child(self, values: Tuple[str, ...]) -> _HistogramChild:
+        return _HistogramChild(self.registry, self.name, values, self.bounds)
+
+    def samples(self, values: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        for labels, parts in sorted(values.items()):
+            label_values: List[str] = json.loads(labels)
+            names: Tuple[str, ...] = (*self.labelnames, "le")
+            cumulative: float = 0.0
+            for index, bound in enumerate((*self.bounds, math.inf)):
+                cumulative += parts.get(str(index), 0.0)
+                le: str = _format_value(bound)
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(names, [*label_values, le])} "
+                    f"{_format_value(cumulative)}"
+                )
+            base: str = _format_labels(self.labelnames, label_values)
+            yield (
+                f"{self.name}_sum{base} "
+                f"{_format_value(parts.get('sum', 0.0))}"
+            )
+            yield f"{self.name}_count{base} {_format_value(cumulative)}"
+
+
+class Registry:
+    """
+    The metrics of this project and where their values live.
+
+    Values go to ``<METRICS_DIR>/<pid>.metrics`` when the setting is set
+    (one file per gunicorn worker, summed when rendered), otherwise to
+    process memory. The store is reopened after a fork, so workers of a
+    preloaded master never share one. Files of exited processes are
+    folded into ``aggregate.metrics`` and deleted (``merge``), by
+    gunicorn's ``child_exit`` hook or at the next scrape, so workers
+    recycled by ``--max-requests`` do not pile up.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+        self.directory: Optional[str] = None
+        self._store: Optional[Store] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(self, name, documentation, labelnames, buckets)
+        )
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def configure(self, directory: Optional[str]) -> None:
+        """Use ``directory`` instead of ``METRICS_DIR`` ("" for memory)."""
+        with self._lock:
+            self.directory = directory
+            self._store = None
+
+    def _directory(self) -> str:
+        if self.directory is not None:
+            return self.directory
+        return getattr(settings, "METRICS_DIR", "")
+
+    def store(self) -> Store:
+        pid: int = os.getpid()
+        if self._pid == pid and self._store is not None:
+            return self._store
+        with self._lock:
+            if self._pid != pid or self._store is None:
+                directory: str = self._directory()
+                path: Optional[Path] = None
+                if directory:
+                    Path(directory).mkdir(parents=True, exist_ok=True)
+                    path = Path(directory) / f"{pid}{FILE_SUFFIX}"
+                self._store = Store(path)
+                self._pid = pid
+        return self._store
+
+    def merge(self, pids: Iterable[int]) -> None:
+        """
+        Add the values of the exited processes ``pids`` to the aggregate
+        file and delete their files.
+        """
+        directory: str = self._directory()
+        if not directory:
+            return
+        with _locked(directory, fcntl.LOCK_EX):
+            aggregate: Optional[Store] = None
+            for pid in pids:
+                path = Path(directory) / f"{pid}{FILE_SUFFIX}"
+                if not path.exists():
+                    # Merged by someone else meanwhile.
+                    continue
+                content: bytes = path.read_bytes()
+                if len(content) >= _HEADER.size:
+                    if aggregate is None:
+                        aggregate = Store(
+                            Path(directory) / f"{AGGREGATE}{FILE_SUFFIX}"
+                        )
+                    for key, value, _ in read_entries(content):
+                        aggregate.inc(key, value)
+                path.unlink()
+            if aggregate is not None:
+                aggregate.close()
+
+    def collect(self) -> Dict[str, float]:
+        """Every sample, summed over the processes sharing the directory."""
+        directory: str = self._directory()
+        if not directory:
+            return self.store().values()
+        exited: List[int] = [
+            int(path.stem)
+            for path in Path(directory).glob(f"*{FILE_SUFFIX}")
+            if _exited(path)
+        ]
+        if exited:
+            self.merge(exited)
+        totals: Dict[str, float] = {}
+        with _locked(directory, fcntl.LOCK_SH):
+            for path in sorted(Path(directory).glob(f"*{FILE_SUFFIX}")):
+                content: bytes = path.read_bytes()
+                if len(content) < _HEADER.size:
+                    continue
+                for key, value, _ in read_entries(content):
+                    totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def render(self) -> str:
+        """The Prometheus text exposition format (version 0.0.4)."""
+        grouped: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for key, value in self.collect().items():
+            name, labels, part = json.loads(key)
+            by_labels = grouped.setdefault(name, {})
+            by_labels.setdefault(json.dumps(labels), {})[part] = value
+
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples(grouped.get(name, {})))
+        return "\n".join(lines) + "\n"
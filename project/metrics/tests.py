@@ -0,0 +1,166 @@
+"""
+Tests for the metrics registry: the mmap ``Store``, the files of
+several processes sharing a directory, and the merge of exited ones.
+
+Worker processes are separate interpreters running ``WORKER``, so they
+record into their own pid files as gunicorn workers do.
+"""
+
+import fcntl
+import signal
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from django.conf import settings
+
+from project.metrics.registry import (
+    AGGREGATE,
+    FILE_SUFFIX,
+    Registry,
+    Store,
+    _locked,
+    sample_key,
+)
+
+WORKER: str = """
+import sys
+import time
+
+from project.metrics.registry import Registry
+
+registry = Registry()
+registry.configure(sys.argv[1])
+requests = registry.counter("requests_total", "Requests.", ["view"])
+for _ in range(int(sys.argv[2])):
+    requests.labels("home").inc()
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+REQUESTS: str = sample_key("requests_total", ["home"])
+
+
+def start_worker(directory: Path, count: int) -> subprocess.Popen:
+    worker = subprocess.Popen(
+        [sys.executable, "-c", WORKER, str(directory), str(count)],
+        cwd=settings.BASE_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert worker.stdout.readline() == "ready\n"
+    return worker
+
+
+def kill(worker: subprocess.Popen) -> None:
+    worker.send_signal(signal.SIGKILL)
+    # Reaped, so the pid no longer answers os.kill(pid, 0).
+    worker.wait()
+
+
+def files(directory: Path) -> List[str]:
+    return sorted(path.name for path in directory.glob(f"*{FILE_SUFFIX}"))
+
+
+def test_store_in_memory_grows():
+    store = Store()
+    for number in range(5000):
+        store.inc(f"key-{number}", number)
+    store.inc("key-1", 0.5)
+    values: Dict[str, float] = store.values()
+    assert len(values) == 5000
+    assert values["key-1"] == 1.5
+    assert values["key-4999"] == 4999
+    store.close()
+
+
+def test_store_file_is_continued_when_reopened(tmp_path: Path):
+    path: Path = tmp_path / f"1{FILE_SUFFIX}"
+    store = Store(path)
+    for number in range(5000):
+        store.inc(f"key-{number}", 1)
+    store.close()
+
+    store = Store(path)
+    store.inc("key-0", 1)
+    store.inc("new", 3)
+    values: Dict[str, float] = store.values()
+    store.close()
+    assert len(values) == 5001
+    assert (values["key-0"], values["key-4999"], values["new"]) == (2, 1, 3)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    registry.configure("")
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 5.0):
+        latency.labels().observe(value)
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_workers_are_summed_and_merged_when_they_exit(tmp_path: Path):
+    registry = Registry()
+    registry.configure(str(tmp_path))
+    registry.counter("requests_total", "Requests.", ["view"])
+    first = start_worker(tmp_path, 1000)
+    second = start_worker(tmp_path, 500)
+    try:
+        assert registry.collect() == {REQUESTS: 1500}
+
+        kill(first)
+        # The scrape folds the killed worker's file into the aggregate.
+        assert registry.collect() == {REQUESTS: 1500}
+        assert files(tmp_path) == sorted(
+            [f"{AGGREGATE}{FILE_SUFFIX}", f"{second.pid}{FILE_SUFFIX}"]
+        )
+
+        kill(second)
+        assert 'requests_total{view="home"} 1500' in registry.render()
+        assert files(tmp_path) == [f"{AGGREGATE}{FILE_SUFFIX}"]
+    finally:
+        for worker in (first, second):
+            if worker.poll() is None:
+                kill(worker)
+
+
+def test_merge_is_idempotent(tmp_path: Path):
+    registry = Registry()
+    registry.configure(str(tmp_path))
+    worker = start_worker(tmp_path, 10)
+    kill(worker)
+    # gunicorn's child_exit hook and a scrape may both merge a worker.
+    registry.merge([worker.pid])
+    registry.merge([worker.pid])
+    assert registry.collect() == {REQUESTS: 10}
+
+
+def test_merge_waits_for_scrapes_to_finish(tmp_path: Path):
+    registry = Registry()
+    registry.configure(str(tmp_path))
+    worker = start_worker(tmp_path, 10)
+    kill(worker)
+    path: Path = tmp_path / f"{worker.pid}{FILE_SUFFIX}"
+
+    merge = threading.Thread(target=registry.merge, args=([worker.pid],))
+    # A scrape in progress holds the shared lock.
+    with _locked(str(tmp_path), fcntl.LOCK_SH):
+        merge.start()
+        merge.join(0.2)
+        assert merge.is_alive()
+        assert path.exists()
+    merge.join(5)
+    assert not path.exists()
+    assert registry.collect() == {REQUESTS: 10}
@@ -0,0 +1,21 @@
+import secrets
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+
+from .definitions import REGISTRY
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Serve the registry to Prometheus, behind ``METRICS_TOKEN`` if set."""
+    token: str = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        supplied: str = request.headers.get("Authorization", "")
+        # Bytes: compare_digest rejects non-ASCII str with a TypeError.
+        if not secrets.compare_digest(
+            supplied.encode(), f"Bearer {token}".encode()
+        ):
+            return HttpResponseForbidden()
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,51 @@
+"""
+Request sampling for django-silk.
+
+``should_profile`` is installed as ``SILKY_INTERCEPT_FUNC`` so silk only
+records a fraction of the traffic. It is driven by these settings:
+
+* ``PROFILING_SAMPLE_RATE``: share of requests recorded, 0.0 to 1.0.
+* ``PROFILING_ALLOW_PATHS``: if set, only paths with one of these prefixes
+  are sampled.
+* ``PROFILING_DENY_PATHS``: path prefixes that are never recorded.
+* ``PROFILING_HEADER`` / ``PROFILING_HEADER_TOKEN``: a request carrying
+  the header with the token is always recorded (unless denied). Header
+  opt-in is disabled while the token is empty.
+"""
+
+import random
+import secrets
+from typing import TYPE_CHECKING, Sequence
+
+from django.conf import settings
+
+# The settings modules import this file; django.http is only needed for
+# the annotation and would add noticeably to every process's startup.
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+def _matches(path: str, prefixes: Sequence[str]) -> bool:
+    return any(path.startswith(prefix) for prefix in prefixes)
+
+
+def should_profile(request: "HttpRequest") -> bool:
+    path: str = request.path_info
+    if _matches(path, getattr(settings, "PROFILING_DENY_PATHS", ())):
+        return False
+
+    token: str = getattr(settings, "PROFILING_HEADER_TOKEN", "")
+    if token:
+        header: str = getattr(settings, "PROFILING_HEADER", "X-Profile")
+        supplied: str = request.headers.get(header, "")
+        # Bytes: compare_digest rejects non-ASCII str with a TypeError.
+        if supplied and secrets.compare_digest(
+            supplied.encode(), token.encode()
+        ):
+            return True
+
+    allowed: Sequence[str] = getattr(settings, "PROFILING_ALLOW_PATHS", ())
+    if allowed and not _matches(path, allowed):
+        return False
+
+    return random.random() < getattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
@@ -0,0 +1,14 @@
+"""
+WebSocket URL configuration for project project.
+
+The `websocket_urlpatterns` list routes WebSocket paths to consumers, the
+same way `urls.py` routes HTTP paths to views. Consumers are scaffolded with
+`python manage.py make_consumer <app_name> <consumer_name>`.
+Example:
+    1. Add an import:  from chat.consumers.room_consumer import RoomConsumer
+    2. Add a route:  path("ws/room/<str:group>/", RoomConsumer.as_asgi())
+"""
+
+from django.urls import path  # noqa: F401
+
+websocket_urlpatterns: list = []
@@ -0,0 +1,26 @@
+"""
+Bulk data for performance work: ``manage.py seed_perf``.
+
+Reproducing a slow page needs production-sized tables, and inserting
+them one ``save()`` at a time takes hours. This package derives a
+factory_boy factory from each model (``model_factory``: Faker values
+through django-seed's guessers, sequences for unique fields, foreign
+keys drawn from the primary keys already in the database) and inserts
+its rows with ``BulkWriteService``, a chunk per transaction:
+
+* models are seeded in foreign key order, so every reference points to
+  an existing row; many-to-many links follow once both sides exist;
+* each chunk is seeded from the seed, the model and the chunk's
+  position, so a run is reproducible whether it uses one process or
+  many (``Seeder(processes=...)``);
+* ``values="placeholder"`` swaps Faker for ``project.testing``
+  placeholders when only the row count matters.
+
+Benchmarks that need data call ``Seeder`` (or the command) rather than
+inserting rows of their own.
+"""
+
+from .factories import model_factory
+from .seeder import SeedResult, Seeder, resolve_models
+
+__all__ = ["SeedResult", "Seeder", "model_factory", "resolve_models"]
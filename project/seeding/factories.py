@@ -0,0 +1,253 @@
+import datetime
+import operator
+import random
+import uuid
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import factory
+from django.conf import settings
+from django.db import models
+from django.utils.translation import to_locale
+from django_seed.guessers import FieldTypeGuesser, NameGuesser
+from faker import Faker
+
+from project.testing import field_value
+
+VALUES: tuple = ("faker", "placeholder")
+
+# Generated dates lie in the two years before this fixed day, so they do
+# not depend on the day the seed runs.
+EPOCH: datetime.datetime = datetime.datetime(2025, 1, 1)
+SPAN: datetime.timedelta = datetime.timedelta(days=730)
+
+Generator = Callable[[], Any]
+
+_faker: Optional[Faker] = None
+
+
+def get_faker() -> Faker:
+    """The process's Faker, in the locale of ``LANGUAGE_CODE``."""
+    global _faker
+    if _faker is None:
+        try:
+            _faker = Faker(to_locale(settings.LANGUAGE_CODE))
+        except AttributeError:
+            # Faker has no provider for that locale.
+            _faker = Faker()
+    return _faker
+
+
+def reseed(seed: int) -> random.Random:
+    """
+    Seed Faker and ``random`` (django-seed's providers use the module
+    functions) and return a generator for everything else.
+    """
+    get_faker().seed_instance(seed)
+    random.seed(seed)
+    return random.Random(seed)
+
+
+def seeded_fields(model: type[models.Model]) -> Iterator[models.Field]:
+    """Concrete fields the seeder fills in; the rest is left to Django."""
+    for field in model._meta.concrete_fields:
+        if isinstance(field, models.AutoField) or field.has_default():
+            continue
+        if getattr(field, "auto_now", False):
+            continue
+        if getattr(field, "auto_now_add", False):
+            continue
+        if getattr(field, "generated", False):
+            continue
+        yield field
+
+
+def _unique_sets(model: type[models.Model]) -> Iterator[Tuple[str, ...]]:
+    opts = model._meta
+    yield from (tuple(names) for names in opts.unique_together)
+    for constraint in opts.constraints:
+        if isinstance(constraint, models.UniqueConstraint):
+            if constraint.fields and constraint.condition is None:
+                yield tuple(constraint.fields)
+
+
+def unique_fields(model: type[models.Model]) -> Set[str]:
+    """
+    Fields that get sequential values: unique fields, and one non-relation
+    field of every unique_together / UniqueConstraint, which makes the
+    whole combination unique.
+    """
+    names: Set[str] = {
+        field.name
+        for field in model._meta.concrete_fields
+        if field.unique and not field.is_relation
+    }
+    for fields in _unique_sets(model):
+        for name in fields:
+            if not model._meta.get_field(name).is_relation:
+                names.add(name)
+                break
+    return names
+
+
+def has_relation_constraints(model: type[models.Model]) -> bool:
+    """
+    True if a unique combination consists of foreign keys only: randomly
+    drawn keys can repeat, so such rows are inserted ignoring conflicts.
+    """
+    return any(
+        all(model._meta.get_field(name).is_relation for name in fields)
+        for fields in _unique_sets(model)
+    )
+
+
+def unique_value(field: models.Field, number: int) -> Any:
+    """A value of ``field`` that differs for every ``number``."""
+    if isinstance(field, models.UUIDField):
+        return uuid.UUID(int=number)
+    if isinstance(field, (models.IntegerField, models.FloatField)):
+        return number
+    if isinstance(field, models.DateTimeField):
+        moment: datetime.datetime = EPOCH - datetime.timedelta(seconds=number)
+        if settings.USE_TZ:
+            return moment.replace(tzinfo=datetime.timezone.utc)
+        return moment
+    if isinstance(field, models.DateField):
+        return EPOCH.date() - datetime.timedelta(days=number)
+    return field_value(field, number)
+
+
+def fake_generator(field: models.Field, faker: Faker) -> Optional[Generator]:
+    """
+    A Faker-backed generator for ``field``: django-seed's guessers, except
+    where they break on current Django (time zones) or ignore the field's
+    limits. ``None`` if nothing fits.
+    """
+    if isinstance(field, models.DateTimeField):
+        tzinfo = datetime.timezone.utc if settings.USE_TZ else None
+        return lambda: faker.date_time_between(
+            EPOCH - SPAN, EPOCH, tzinfo=tzinfo
+        )
+    if isinstance(field, models.DateField):
+        return lambda: faker.date_between(
+            (EPOCH - SPAN).date(), EPOCH.date()
+        )
+    if isinstance(field, models.TimeField):
+        return faker.time_object
+    if isinstance(field, models.DurationField):
+        return lambda: datetime.timedelta(seconds=faker.random_int(0, 86_400))
+    if isinstance(field, models.UUIDField):
+        return lambda: faker.uuid4(cast_to=None)
+    if isinstance(field, models.DecimalField) and not field.choices:
+        return lambda: faker.pydecimal(
+            left_digits=field.max_digits - field.decimal_places,
+            right_digits=field.decimal_places,
+            positive=True,
+        )
+    if isinstance(field, models.JSONField):
+        return lambda: faker.pydict(3, value_types=[str, int])
+
+    guess: Optional[Callable[[Any], Any]] = None
+    name: str = field.name.lower()
+    # Names like is_* and *_at make the name guesser return booleans and
+    # datetimes, which do not belong in text columns.
+    if (
+        isinstance(field, (models.CharField, models.TextField))
+        and not field.choices
+        and not name.startswith("is_")
+        and not name.endswith("_at")
+    ):
+        guess = NameGuesser(faker).guess_format(field.name)
+    if guess is None:
+        try:
+            guess = FieldTypeGuesser(faker).guess_format(field)
+        except AttributeError:
+            return None
+    if field.max_length and not field.choices:
+        return lambda: guess(None)[: field.max_length]
+    return lambda: guess(None)
+
+
+def model_factory(
+    model: type[models.Model],
+    rng: random.Random,
+    pools: Dict[str, Sequence[Any]],
+    values: str = "faker",
+    skip: Sequence[str] = (),
+    pk_offset: Optional[int] = None,
+) -> type[factory.django.DjangoModelFactory]:
+    """
+    A factory_boy factory for ``model``, derived from its fields.
+
+    Foreign keys take a primary key from ``pools`` (by related model
+    label): a random one, or the n-th for one-to-one fields. Unique
+    fields follow the factory's sequence; everything else is Faker data
+    via django-seed, or ``project.testing.field_value`` placeholders
+    (faster) with ``values="placeholder"``. Fields in ``skip`` are left
+    to their defaults (``NULL``). With ``pk_offset`` an auto-increment
+    primary key is set explicitly to sequence number + offset. Rows are
+    built, never saved: the caller inserts them in bulk.
+    """
+    faker: Faker = get_faker()
+    unique: Set[str] = unique_fields(model)
+    declarations: Dict[str, Any] = {}
+    if pk_offset is not None and isinstance(model._meta.pk, models.AutoField):
+        declarations[model._meta.pk.attname] = factory.Sequence(
+            partial(operator.add, pk_offset)
+        )
+
+    for field in seeded_fields(model):
+        if field.name in skip:
+            continue
+        if field.is_relation:
+            pool: Sequence[Any] = pools[field.related_model._meta.label]
+            # Set through the column (author_id): no related instance.
+            if field.unique:
+                declarations[field.attname] = factory.Sequence(
+                    pool.__getitem__
+                )
+            else:
+                declarations[field.attname] = factory.LazyFunction(
+                    partial(rng.choice, pool)
+                )
+            continue
+        if field.name in unique or field.primary_key:
+            declarations[field.name] = factory.Sequence(
+                partial(unique_value, field)
+            )
+            continue
+        generate: Optional[Generator] = (
+            fake_generator(field, faker) if values == "faker" else None
+        )
+        if generate is None:
+            declarations[field.name] = factory.Sequence(
+                partial(field_value, field)
+            )
+        else:
+            declarations[field.name] = factory.LazyFunction(generate)
+
+    declarations["Meta"] = type("Meta", (), {"model": model})
+    return type(
+        f"{model.__name__}SeedFactory",
+        (factory.django.DjangoModelFactory,),
+        declarations,
+    )
+
+
+def build_rows(
+    model_factory: type[factory.django.DjangoModelFactory],
+    start: int,
+    count: int,
+) -> Iterator[models.Model]:
+    """``count`` unsaved rows whose sequence numbers begin at ``start``."""
+    model_factory.reset_sequence(start)
+    return (model_factory.build() for _ in range(count))
@@ -0,0 +1,413 @@
+import hashlib
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
+from multiprocessing import get_context
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, models, router
+from django.db.models import Count, Max, Min
+
+from project.services import BulkWriteService
+from project.tasks.worker import init_process
+
+from .factories import (
+    build_rows,
+    has_relation_constraints,
+    model_factory,
+    reseed,
+    seeded_fields,
+)
+
+Snapshot = Union[int, FrozenSet[Any]]
+
+# Primary keys of related models, per process and run.
+_pools: Dict[str, Sequence[Any]] = {}
+
+
+def resolve_models(specs: Iterable[str]) -> List[type[models.Model]]:
+    """Models from app labels (``blog``) and model labels (``blog.Tag``)."""
+    found: Dict[type[models.Model], None] = {}
+    for spec in specs:
+        try:
+            if "." in spec:
+                found[apps.get_model(spec)] = None
+                continue
+            for model in apps.get_app_config(spec).get_models():
+                if model._meta.managed and not model._meta.proxy:
+                    found[model] = None
+        except (LookupError, ValueError):
+            raise ValueError(
+                f"'{spec}' is neither an app label nor a model label."
+            ) from None
+    return list(found)
+
+
+def chunk_seed(seed: int, *parts: Any) -> int:
+    """A stable seed for one chunk: the same in every process and run."""
+    key: str = ":".join(map(str, (seed, *parts)))
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(), "big"
+    )
+
+
+def bulk_service(
+    model: type[models.Model], batch_size: int
+) -> BulkWriteService:
+    service_class = type(
+        f"{model.__name__}SeedService", (BulkWriteService,), {"model": model}
+    )
+    return service_class(batch_size=batch_size)
+
+
+def primary_keys(model: type[models.Model]) -> Sequence[Any]:
+    """All primary keys of ``model``, in order."""
+    queryset = model._base_manager.all()
+    if isinstance(model._meta.pk, models.IntegerField):
+        stats: Dict[str, Any] = queryset.aggregate(
+            low=Min("pk"), high=Max("pk"), total=Count("pk")
+        )
+        if stats["total"] and stats["high"] - stats["low"] + 1 == (
+            stats["total"]
+        ):
+            # Contiguous ids (the usual case after a seed): nothing to hold.
+            return range(stats["low"], stats["high"] + 1)
+    return list(
+        queryset.order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=10_000)
+    )
+
+
+def load_pool(model: type[models.Model]) -> Sequence[Any]:
+    # Only models that are complete are loaded, so the cache stays valid
+    # for the rest of the run.
+    label: str = model._meta.label
+    if label not in _pools:
+        _pools[label] = primary_keys(model)
+    return _pools[label]
+
+
+@dataclass
+class ChunkTask:
+    label: str
+    # Sequence number of the first row; unique values derive from it.
+    start: int
+    count: int
+    seed: int
+    values: str
+    batch_size: int
+    skip: Sequence[str] = ()
+    ignore_conflicts: bool = False
+    pk_offset: Optional[int] = None
+
+
+@dataclass
+class LinkTask:
+    label: str
+    field: str
+    sources: List[Any]
+    per_row: int
+    seed: int
+    batch_size: int
+
+
+def run_chunk(task: ChunkTask) -> int:
+    """Build and insert one chunk of rows; runs in a pool process."""
+    model: type[models.Model] = apps.get_model(task.label)
+    rng: random.Random = reseed(task.seed)
+    pools: Dict[str, Sequence[Any]] = {
+        field.related_model._meta.label: load_pool(field.related_model)
+        for field in seeded_fields(model)
+        if field.is_relation and field.name not in task.skip
+    }
+    factory = model_factory(
+        model, rng, pools, task.values, task.skip, task.pk_offset
+    )
+    return bulk_service(model, task.batch_size).create(
+        build_rows(factory, task.start, task.count),
+        ignore_conflicts=task.ignore_conflicts,
+    )
+
+
+def run_link(task: LinkTask) -> int:
+    """Link rows of a many-to-many field to random targets."""
+    model: type[models.Model] = apps.get_model(task.label)
+    m2m = model._meta.get_field(task.field)
+    through: type[models.Model] = m2m.remote_field.through
+    source: str = through._meta.get_field(m2m.m2m_field_name()).attname
+    target: str = through._meta.get_field(
+        m2m.m2m_reverse_field_name()
+    ).attname
+    pool: Sequence[Any] = load_pool(m2m.related_model)
+    rng = random.Random(task.seed)
+    per_row: int = min(task.per_row, len(pool))
+    rows: Iterator[models.Model] = (
+        through(**{source: pk, target: other})
+        for pk in task.sources
+        for other in rng.sample(pool, per_row)
+    )
+    return bulk_service(through, task.batch_size).create(
+        rows, ignore_conflicts=True
+    )
+
+
+@dataclass
+class SeedResult:
+    label: str
+    requested: int
+    rows: int
+    seconds: float
+
+
+@dataclass
+class Seeder:
+    """
+    Fills ``counts`` (model -> rows) in foreign key order.
+
+    Each model is split into chunks of ``chunk_size`` rows; every chunk is
+    built by a factory (see ``model_factory``) seeded from ``seed``, the
+    model and the chunk's position, and inserted with a
+    ``BulkWriteService``. The same seed, chunk size and starting database
+    give the same rows, whatever the number of ``processes``. After the
+    models, every auto-created many-to-many field links each new row to
+    ``m2m`` random targets.
+    """
+
+    counts: Dict[type[models.Model], int]
+    seed: int = 0
+    values: str = "faker"
+    processes: int = 1
+    chunk_size: int = 10_000
+    batch_size: int = BulkWriteService.batch_size
+    m2m: int = 2
+
+    def __post_init__(self) -> None:
+        # Keys before each model was seeded, to find the rows to link.
+        self._snapshots: Dict[type[models.Model], Snapshot] = {}
+
+    def order(self) -> List[type[models.Model]]:
+        """
+        Models with the ones they reference first. Nullable foreign keys
+        that close a cycle (a self-reference included) stay ``NULL``.
+        """
+        selected: List[type[models.Model]] = sorted(
+            self.counts, key=lambda model: model._meta.label
+        )
+
+        def graph(required: bool) -> Dict[Any, List[Any]]:
+            return {
+                model: sorted(
+                    {
+                        field.related_model
+                        for field in seeded_fields(model)
+                        if field.is_relation
+                        and field.related_model in self.counts
+                        and field.related_model is not model
+                        and not (required and field.null)
+                    },
+                    key=lambda related: related._meta.label,
+                )
+                for model in selected
+            }
+
+        for model in selected:
+            for field in seeded_fields(model):
+                if field.is_relation and field.related_model is model:
+                    if not field.null:
+                        raise ValueError(
+                            f"{model._meta.label}.{field.name} is a required "
+                            "reference to its own model; seed it by hand."
+                        )
+        try:
+            return list(TopologicalSorter(graph(False)).static_order())
+        except CycleError:
+            pass
+        try:
+            return list(TopologicalSorter(graph(True)).static_order())
+        except CycleError as e:
+            labels: str = ", ".join(model._meta.label for model in e.args[1])
+            raise ValueError(
+                f"Required foreign keys form a cycle: {labels}."
+            ) from None
+
+    def run(self) -> Iterator[SeedResult]:
+        """Seed every model, then the many-to-many links; one result each."""
+        _pools.clear()
+        order: List[type[models.Model]] = self.order()
+        with self.executor() as executor:
+            done: Set[type[models.Model]] = set()
+            for model in order:
+                yield self.seed_model(model, done, executor)
+                done.add(model)
+            if self.m2m < 1:
+                return
+            for model in order:
+                for m2m in model._meta.many_to_many:
+                    if m2m.remote_field.through._meta.auto_created:
+                        yield self.link(model, m2m, executor)
+
+    def run_all(self) -> List[SeedResult]:
+        """``run()``, consumed: every result once seeding has finished."""
+        return list(self.run())
+
+    def executor(self) -> ContextManager[Optional[Executor]]:
+        if self.processes <= 1:
+            return nullcontext()
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            # Spawned, not forked: no inherited connections.
+            mp_context=get_context("spawn"),
+            initializer=init_process,
+        )
+
+    def dispatch(
+        self,
+        executor: Optional[Executor],
+        function: Callable[[Any], int],
+        tasks: List[Any],
+    ) -> int:
+        if executor is None:
+            return sum(map(function, tasks))
+        return sum(executor.map(function, tasks))
+
+    def seed_model(
+        self,
+        model: type[models.Model],
+        done: Set[type[models.Model]],
+        executor: Optional[Executor],
+    ) -> SeedResult:
+        started: float = perf_counter()
+        label: str = model._meta.label
+        requested: int = self.counts[model]
+        count: int = requested
+        base: int = model._base_manager.count()
+        skip: List[str] = []
+        for field in seeded_fields(model):
+            if not field.is_relation:
+                continue
+            related: type[models.Model] = field.related_model
+            if related in self.counts and related not in done:
+                # Seeded later (order() allows that for nullable keys only).
+                skip.append(field.name)
+                continue
+            pool: Sequence[Any] = load_pool(related)
+            if not pool:
+                if not field.null:
+                    raise ValueError(
+                        f"{label}.{field.name} needs "
+                        f"{related._meta.label} rows: seed that model as "
+                        "well, or load its data first."
+                    )
+                skip.append(field.name)
+            elif field.unique:
+                # One-to-one: every row needs a target of its own.
+                count = min(count, max(0, len(pool) - base))
+
+        snapshot: Snapshot = self.snapshot(model)
+        self._snapshots[model] = snapshot
+        # Chunks finish in any order: explicit ids keep every row's id
+        # independent of that.
+        pk_offset: Optional[int] = None
+        if isinstance(model._meta.pk, models.AutoField):
+            pk_offset = snapshot + 1 - base
+        tasks: List[ChunkTask] = [
+            ChunkTask(
+                label=label,
+                start=base + start,
+                count=min(self.chunk_size, count - start),
+                seed=chunk_seed(self.seed, label, base + start),
+                values=self.values,
+                batch_size=self.batch_size,
+                skip=tuple(skip),
+                ignore_conflicts=has_relation_constraints(model),
+                pk_offset=pk_offset,
+            )
+            for start in range(0, count, self.chunk_size)
+        ]
+        self.dispatch(executor, run_chunk, tasks)
+        if pk_offset is not None:
+            self.reset_sequence(model)
+        return SeedResult(
+            label,
+            requested,
+            model._base_manager.count() - base,
+            perf_counter() - started,
+        )
+
+    def reset_sequence(self, model: type[models.Model]) -> None:
+        # As loaddata does: explicit ids do not advance PostgreSQL's
+        # sequences, and the next save() would collide.
+        connection = connections[router.db_for_write(model)]
+        statements: List[str] = connection.ops.sequence_reset_sql(
+            no_style(), [model]
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def snapshot(self, model: type[models.Model]) -> Snapshot:
+        if isinstance(model._meta.pk, models.IntegerField):
+            return model._base_manager.aggregate(top=Max("pk"))["top"] or 0
+        return frozenset(primary_keys(model))
+
+    def created(self, model: type[models.Model]) -> List[Any]:
+        """Primary keys of the rows this run added to ``model``."""
+        snapshot: Snapshot = self._snapshots[model]
+        if isinstance(snapshot, int):
+            return list(
+                model._base_manager.filter(pk__gt=snapshot)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+        return [pk for pk in primary_keys(model) if pk not in snapshot]
+
+    def link(
+        self,
+        model: type[models.Model],
+        m2m: models.ManyToManyField,
+        executor: Optional[Executor],
+    ) -> SeedResult:
+        started: float = perf_counter()
+        label: str = f"{model._meta.label}.{m2m.name}"
+        sources: List[Any] = self.created(model)
+        through: type[models.Model] = m2m.remote_field.through
+        before: int = through._base_manager.count()
+        per_row: int = min(self.m2m, len(load_pool(m2m.related_model)))
+        tasks: List[LinkTask] = [
+            LinkTask(
+                label=model._meta.label,
+                field=m2m.name,
+                sources=sources[start : start + self.chunk_size],
+                per_row=per_row,
+                seed=chunk_seed(self.seed, label, start),
+                batch_size=self.batch_size,
+            )
+            for start in range(0, len(sources), self.chunk_size)
+        ]
+        self.dispatch(executor, run_link, tasks)
+        return SeedResult(
+            label,
+            len(sources) * self.m2m,
+            through._base_manager.count() - before,
+            perf_counter() - started,
+        )
@@ -0,0 +1,35 @@
+"""
+Production server entry point.
+
+``manage.py serve --profile production`` replaces itself with gunicorn
+(WSGI, or ASGI through uvicorn workers) or uvicorn, tuned from the
+``SERVER_*`` settings:
+
+* workers derived from the CPUs the process may use (cgroup quota
+  included): ``2 x CPUs + 1`` threaded workers for WSGI, one event loop
+  per CPU for ASGI;
+* ``--preload``: the app is imported once in the master and shared with
+  the workers copy-on-write; ``gunicorn_conf.when_ready`` freezes the
+  garbage collector so the workers do not dirty those pages;
+* ``--max-requests`` with jitter, so workers are recycled before leaks
+  add up, not all at once;
+* keep-alive and graceful-shutdown timeouts.
+
+The settings profile is always named explicitly: the server never falls
+back to the local (DEBUG) settings. ``manage.py serve_report`` lists the
+memory of the master and every worker. Scale a running gunicorn with
+``kill -TTIN <master>`` (one more worker) and ``kill -TTOU <master>``
+(one fewer); ``kill -HUP <master>`` replaces the workers gracefully.
+"""
+
+from .config import ServerConfig, available_cpus, default_workers
+from .memory import ProcessMemory, children, process_memory
+
+__all__ = [
+    "ProcessMemory",
+    "ServerConfig",
+    "available_cpus",
+    "children",
+    "default_workers",
+    "process_memory",
+]
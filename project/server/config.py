@@ -0,0 +1,154 @@
+import math
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MODES: tuple = ("wsgi", "asgi")
+SERVERS: tuple = ("gunicorn", "uvicorn")
+
+APPLICATIONS: Dict[str, str] = {
+    "wsgi": "project.wsgi:application",
+    "asgi": "project.asgi:application",
+}
+
+# Gunicorn's settings module: hooks only, every option is on the command
+# line.
+GUNICORN_CONFIG: str = "python:project.server.gunicorn_conf"
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may use: the affinity mask, capped by a cgroup v2
+    CPU quota (``docker --cpus``, Kubernetes limits), which
+    ``os.cpu_count()`` ignores.
+    """
+    cpus: int = os.process_cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def default_workers(mode: str, cpus: int) -> int:
+    if mode == "asgi":
+        # One event loop per CPU; concurrency comes from the loop.
+        return cpus
+    # Gunicorn's rule of thumb: while a worker waits on I/O another one
+    # uses its CPU.
+    return 2 * cpus + 1
+
+
+def asgi_worker_class() -> str:
+    try:
+        import uvicorn_worker  # noqa: F401
+
+        return "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        # Deprecated in uvicorn in favour of the uvicorn-worker package.
+        return "uvicorn.workers.UvicornWorker"
+
+
+@dataclass
+class ServerConfig:
+    mode: str
+    server: str
+    profile: str
+    bind: str
+    workers: int
+    threads: int
+    preload: bool
+    max_requests: int
+    max_requests_jitter: int
+    keepalive: int
+    timeout: int
+    graceful_timeout: int
+    pidfile: str
+
+    @property
+    def worker_class(self) -> str:
+        if self.mode == "asgi":
+            return asgi_worker_class()
+        return "gthread" if self.threads > 1 else "sync"
+
+    def environ(self) -> Dict[str, str]:
+        """The server's environment, with the profile named explicitly."""
+        return {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": f"project.settings.{self.profile}",
+            "DJANGO_PROFILE": self.profile,
+        }
+
+    def argv(self) -> List[str]:
+        if self.server == "uvicorn":
+            return self.uvicorn_argv()
+        return self.gunicorn_argv()
+
+    def gunicorn_argv(self) -> List[str]:
+        argv: List[str] = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            APPLICATIONS[self.mode],
+            "--config",
+            GUNICORN_CONFIG,
+            "--bind",
+            self.bind,
+            "--workers",
+            str(self.workers),
+            "--worker-class",
+            self.worker_class,
+            "--max-requests",
+            str(self.max_requests),
+            "--max-requests-jitter",
+            str(self.max_requests_jitter),
+            "--keep-alive",
+            str(self.keepalive),
+            "--timeout",
+            str(self.timeout),
+            "--graceful-timeout",
+            str(self.graceful_timeout),
+            "--pid",
+            self.pidfile,
+        ]
+        if self.worker_class == "gthread":
+            argv += ["--threads", str(self.threads)]
+        if self.preload:
+            argv.append("--preload")
+        return argv
+
+    def uvicorn_argv(self) -> List[str]:
+        argv: List[str] = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            APPLICATIONS[self.mode],
+        ]
+        if self.bind.startswith("unix:"):
+            argv += ["--uds", self.bind.removeprefix("unix:")]
+        else:
+            host, _, port = self.bind.rpartition(":")
+            argv += ["--host", host.strip("[]") or "127.0.0.1"]
+            argv += ["--port", port]
+        argv += [
+            "--workers",
+            str(self.workers),
+            "--timeout-keep-alive",
+            str(self.keepalive),
+            "--timeout-graceful-shutdown",
+            str(self.graceful_timeout),
+        ]
+        if self.max_requests:
+            argv += ["--limit-max-requests", str(self.max_requests)]
+        return argv
+
+
+def read_pidfile(path: str) -> Optional[int]:
+    try:
+        return int(Path(path).read_text().strip())
+    except (OSError, ValueError):
+        return None
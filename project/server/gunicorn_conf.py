@@ -0,0 +1,51 @@
+"""
+Gunicorn hooks, loaded by ``manage.py serve`` with
+``--config python:project.server.gunicorn_conf``. Every option is passed
+on the command line; this module only adds behaviour.
+"""
+
+import gc
+import os
+from typing import Any
+
+from project.server.memory import process_memory
+
+MB: int = 1024 * 1024
+
+
+def when_ready(server: Any) -> None:
+    # Runs in the master before the first fork. With --preload the app is
+    # imported by now: move those objects out of the collector's reach,
+    # or the workers' collections would write to (and so copy) the pages
+    # they share with the master.
+    gc.freeze()
+    usage = process_memory(os.getpid())
+    if usage is not None:
+        server.log.info(
+            "Master %s ready: %.1f MB RSS shared with the workers",
+            os.getpid(),
+            usage.rss / MB,
+        )
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    # Runs in the worker, e.g. when --max-requests recycles it: the last
+    # chance to see how much memory it had grown to.
+    usage = process_memory(os.getpid())
+    if usage is not None:
+        server.log.info(
+            "Worker %s exiting after %s requests: %.1f MB RSS, "
+            "%.1f MB private",
+            worker.pid,
+            getattr(worker, "nr", "?"),
+            usage.rss / MB,
+            usage.uss / MB,
+        )
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    # Runs in the master once a worker is gone: fold its metrics file
+    # into the aggregate, so recycled workers do not leave one each.
+    from project.metrics import REGISTRY
+
+    REGISTRY.merge([worker.pid])
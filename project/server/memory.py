@@ -0,0 +1,77 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROC: Path = Path("/proc")
+
+
+@dataclass
+class ProcessMemory:
+    """
+    Memory of one process, in bytes. ``pss`` charges every shared page to
+    its sharers in equal parts, so the PSS of a master and its workers
+    adds up to what they really use; ``uss`` is what exiting would free.
+    """
+
+    pid: int
+    rss: int
+    pss: int
+    uss: int
+    swap: int
+
+    @property
+    def shared(self) -> int:
+        return self.rss - self.uss
+
+
+def _read_fields(path: Path) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    with path.open() as lines:
+        for line in lines:
+            name, _, rest = line.partition(":")
+            parts: List[str] = rest.split()
+            # Mapping headers and flag lines carry no "<n> kB" pair.
+            if len(parts) == 2 and parts[1] == "kB":
+                totals[name] = totals.get(name, 0) + int(parts[0]) * 1024
+    return totals
+
+
+def process_memory(pid: int) -> Optional[ProcessMemory]:
+    """Read ``pid``'s memory from /proc; ``None`` once it has exited."""
+    try:
+        # smaps_rollup (Linux 4.14+) is the sum of smaps, precomputed.
+        rollup: Path = PROC / str(pid) / "smaps_rollup"
+        fields: Dict[str, int] = _read_fields(
+            rollup if rollup.exists() else PROC / str(pid) / "smaps"
+        )
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    return ProcessMemory(
+        pid=pid,
+        rss=fields.get("Rss", 0),
+        pss=fields.get("Pss", 0),
+        uss=fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        swap=fields.get("Swap", 0),
+    )
+
+
+def children(pid: int) -> List[int]:
+    """Pids whose parent is ``pid``, e.g. the workers of a server master."""
+    found: List[int] = []
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat: str = (entry / "stat").read_text()
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        # "pid (comm) state ppid ...": comm may contain spaces and ")".
+        fields: List[str] = stat.rpartition(")")[2].split()
+        if int(fields[1]) == pid:
+            found.append(int(entry.name))
+    return sorted(found)
+
+
+def supported() -> bool:
+    return (PROC / str(os.getpid()) / "smaps").exists()
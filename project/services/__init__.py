@@ -0,0 +1,10 @@
+"""
+Base classes for the ``services`` package of every app.
+
+Apps created with ``startapp`` import ``BulkWriteService`` from here and
+subclass it per model.
+"""
+
+from .bulk import BulkWriteService
+
+__all__ = ["BulkWriteService"]
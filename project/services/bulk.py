@@ -0,0 +1,160 @@
+import itertools
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+Row = Union[models.Model, Dict[str, Any]]
+
+
+class BulkWriteService:
+    """
+    Chunked ``bulk_create`` / ``bulk_update`` / upsert for one model.
+
+    Input may be any iterable (including generators) of model instances or
+    field dicts; it is consumed ``batch_size`` rows at a time, so memory use
+    stays flat regardless of the total. Every chunk runs in its own
+    transaction: a failure rolls back that chunk only and earlier chunks
+    stay committed, which keeps locks short on large imports.
+
+    Example::
+
+        class ArticleBulkService(BulkWriteService):
+            model = Article
+            unique_fields = ["slug"]
+
+        ArticleBulkService().upsert(rows_from_feed())
+    """
+
+    model: Optional[type[models.Model]] = None
+    batch_size: int = 1000
+    # Conflict target for upsert(); usually a unique constraint.
+    unique_fields: Sequence[str] = ()
+    # Columns overwritten on conflict; defaults to every concrete field
+    # except the primary key, unique_fields and auto_now_add fields.
+    update_fields: Sequence[str] = ()
+
+    def __init__(
+        self, batch_size: Optional[int] = None, using: Optional[str] = None
+    ) -> None:
+        if self.model is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} must set the 'model' attribute."
+            )
+        if batch_size is not None:
+            self.batch_size = batch_size
+        self.using: str = using or router.db_for_write(self.model)
+
+    def chunks(self, rows: Iterable[Row]) -> Iterator[List[models.Model]]:
+        iterator: Iterator[Row] = iter(rows)
+        while chunk := list(itertools.islice(iterator, self.batch_size)):
+            yield [self.to_instance(row) for row in chunk]
+
+    def to_instance(self, row: Row) -> models.Model:
+        """Hook for converting input rows; dicts become model instances."""
+        if isinstance(row, dict):
+            return self.model(**row)
+        return row
+
+    def after_write(self, chunk: List[models.Model]) -> None:
+        """
+        Hook run in each chunk's transaction once the chunk is written,
+        e.g. to write related rows. Primary keys are set on ``chunk`` only
+        where the backend returns them from bulk inserts.
+        """
+
+    def get_update_fields(self) -> List[str]:
+        if self.update_fields:
+            return list(self.update_fields)
+        return [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in self.unique_fields
+            and not getattr(field, "auto_now_add", False)
+        ]
+
+    def create(
+        self, rows: Iterable[Row], ignore_conflicts: bool = False
+    ) -> int:
+        """Insert ``rows``; returns the number of rows sent."""
+        manager = self.model._default_manager.db_manager(self.using)
+        total: int = 0
+        for chunk in self.chunks(rows):
+            with transaction.atomic(using=self.using):
+                manager.bulk_create(
+                    chunk,
+                    batch_size=self.batch_size,
+                    ignore_conflicts=ignore_conflicts,
+                )
+                self.after_write(chunk)
+            total += len(chunk)
+        return total
+
+    def update(self, rows: Iterable[Row], fields: Sequence[str]) -> int:
+        """
+        Update ``fields`` of existing rows (they need a primary key).
+
+        ``bulk_update`` skips ``pre_save``, so ``auto_now`` fields such as
+        ``updated_at`` are set here explicitly.
+        """
+        manager = self.model._default_manager.db_manager(self.using)
+        auto_now: List[str] = [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if getattr(field, "auto_now", False) and field.name not in fields
+        ]
+        fields = list(fields) + auto_now
+        total: int = 0
+        for chunk in self.chunks(rows):
+            if auto_now:
+                now = timezone.now()
+                for instance in chunk:
+                    for name in auto_now:
+                        setattr(instance, name, now)
+            with transaction.atomic(using=self.using):
+                total += manager.bulk_update(
+                    chunk, fields, batch_size=self.batch_size
+                )
+                self.after_write(chunk)
+        return total
+
+    def upsert(self, rows: Iterable[Row]) -> int:
+        """
+        Insert rows, updating ``get_update_fields()`` when ``unique_fields``
+        already exist (``INSERT ... ON CONFLICT DO UPDATE``).
+        """
+        manager = self.model._default_manager.db_manager(self.using)
+        features = connections[self.using].features
+        # MySQL/MariaDB infer the conflict target and reject explicit ones.
+        unique_fields: Optional[Sequence[str]] = (
+            self.unique_fields
+            if features.supports_update_conflicts_with_target
+            else None
+        )
+        update_fields: List[str] = self.get_update_fields()
+        if not update_fields:
+            # Nothing besides the conflict target: existing rows stay as is.
+            return self.create(rows, ignore_conflicts=True)
+        total: int = 0
+        for chunk in self.chunks(rows):
+            with transaction.atomic(using=self.using):
+                manager.bulk_create(
+                    chunk,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=update_fields,
+                )
+                self.after_write(chunk)
+            total += len(chunk)
+        return total
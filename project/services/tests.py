@@ -0,0 +1,175 @@
+"""
+Tests for ``BulkWriteService``: chunked writes, upserts and the
+per-chunk transactions, on ``auth.Group`` and ``auth.Permission``.
+"""
+
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from project.services import BulkWriteService
+
+
+class GroupBulkService(BulkWriteService):
+    model = Group
+    unique_fields = ["name"]
+    batch_size = 2
+
+
+class PermissionBulkService(BulkWriteService):
+    model = Permission
+    unique_fields = ["content_type", "codename"]
+
+
+class RecordingService(GroupBulkService):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.written: List[List[str]] = []
+
+    def after_write(self, chunk: List[Any]) -> None:
+        self.written.append([instance.name for instance in chunk])
+
+
+def names(count: int, prefix: str = "group") -> List[Dict[str, Any]]:
+    return [{"name": f"{prefix}{number}"} for number in range(count)]
+
+
+def statements(context: CaptureQueriesContext, verb: str) -> int:
+    return sum(
+        query["sql"].startswith(verb) for query in context.captured_queries
+    )
+
+
+def test_model_is_required():
+    with pytest.raises(NotImplementedError, match="'model'"):
+        BulkWriteService()
+
+
+def test_chunks_read_the_input_lazily():
+    pulled: List[int] = []
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        for number in range(10):
+            pulled.append(number)
+            yield {"name": f"group{number}"}
+
+    chunks = GroupBulkService(batch_size=3).chunks(rows())
+    assert [group.name for group in next(chunks)] == [
+        "group0",
+        "group1",
+        "group2",
+    ]
+    assert len(pulled) == 3
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+
+@pytest.mark.django_db
+def test_create_writes_one_insert_per_chunk():
+    with CaptureQueriesContext(connection) as context:
+        assert GroupBulkService().create(names(5)) == 5
+    assert statements(context, "INSERT") == 3
+    assert Group.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_instances_and_dicts_are_accepted():
+    GroupBulkService().create([Group(name="instance"), {"name": "dict"}])
+    assert set(Group.objects.values_list("name", flat=True)) == {
+        "instance",
+        "dict",
+    }
+
+
+@pytest.mark.django_db
+def test_a_failed_chunk_rolls_back_alone():
+    Group.objects.create(name="taken")
+    # The second chunk, "new" and "taken", hits the unique constraint.
+    rows: List[Dict[str, Any]] = names(2) + [{"name": "new"}]
+    rows.append({"name": "taken"})
+    with pytest.raises(IntegrityError):
+        GroupBulkService().create(rows)
+    assert sorted(Group.objects.values_list("name", flat=True)) == [
+        "group0",
+        "group1",
+        "taken",
+    ]
+
+
+@pytest.mark.django_db
+def test_upsert_updates_conflicting_rows():
+    content_type = ContentType.objects.get_for_model(Group)
+    existing: Permission = Permission.objects.get(
+        content_type=content_type, codename="add_group"
+    )
+    rows: List[Dict[str, Any]] = [
+        {
+            "content_type": content_type,
+            "codename": "add_group",
+            "name": "Renamed",
+        },
+        {
+            "content_type": content_type,
+            "codename": "archive_group",
+            "name": "Can archive group",
+        },
+    ]
+    count: int = Permission.objects.count()
+    assert PermissionBulkService().upsert(rows) == 2
+    existing.refresh_from_db()
+    assert existing.name == "Renamed"
+    assert Permission.objects.count() == count + 1
+    assert Permission.objects.filter(codename="archive_group").exists()
+
+
+@pytest.mark.django_db
+def test_upsert_without_update_fields_keeps_existing_rows():
+    # Group has no column besides the conflict target to update.
+    existing: Group = Group.objects.create(name="group0")
+    with CaptureQueriesContext(connection) as context:
+        assert GroupBulkService().upsert(names(3)) == 3
+    assert statements(context, "INSERT") == 2
+    assert Group.objects.get(name="group0").pk == existing.pk
+    assert Group.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_upsert_honours_explicit_update_fields():
+    content_type = ContentType.objects.get_for_model(Group)
+
+    class NameOnly(PermissionBulkService):
+        update_fields = ["name"]
+
+    assert NameOnly().get_update_fields() == ["name"]
+    NameOnly().upsert(
+        [{"content_type": content_type, "codename": "add_group", "name": "X"}]
+    )
+    assert Permission.objects.get(codename="add_group").name == "X"
+
+
+@pytest.mark.django_db
+def test_update_writes_in_chunks():
+    GroupBulkService().create(names(5))
+    groups: List[Group] = list(Group.objects.order_by("name"))
+    for group in groups:
+        group.name = group.name.upper()
+    with CaptureQueriesContext(connection) as context:
+        assert GroupBulkService().update(groups, ["name"]) == 5
+    assert statements(context, "UPDATE") == 3
+    assert Group.objects.filter(name__startswith="GROUP").count() == 5
+
+
+@pytest.mark.django_db
+def test_after_write_runs_per_chunk():
+    service = RecordingService()
+    service.create(names(3))
+    service.upsert(names(3, "other"))
+    assert service.written == [
+        ["group0", "group1"],
+        ["group2"],
+        ["other0", "other1"],
+        ["other2"],
+    ]
@@ -3,6 +3,10 @@ Django settings for project project.
 
 Generated by 'django-admin startproject' using Django 5.1.4.
 
+Every environment shares this module. local.py, dev.py, qa.py and
+production.py only select a profile; the defaults that differ between
+them live in profiles.py and the environment is parsed once in env.py.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/topics/settings/
 
@@ -10,20 +14,46 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+from django.core.exceptions import ImproperlyConfigured
+
+from project.db.config import database_config, replica_configs
+from project.log.config import logging_config
+from project.profiling.sampling import should_profile
+from project.storage.config import storages_config
+
+from .env import env
+from .profiles import Profile, active_profile
+from .startup import lean_startup
+
+# The repository root; project/version.py runs git here.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+PROFILE: Profile = active_profile(env)
+
+# Scaffolding and cron-style commands skip the optional integrations.
+LEAN_STARTUP: bool = lean_startup(env)
 
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = ""
+if PROFILE.random_secret_key:
+    from django.core.management.utils import get_random_secret_key
+
+    # Not passed as env()'s default: django-environ would read a key that
+    # starts with "$" as a reference to another variable.
+    SECRET_KEY = env("DJANGO_SECRET_KEY", default="") or (
+        get_random_secret_key()
+    )
+else:
+    SECRET_KEY = env("DJANGO_SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env("DJANGO_DEBUG", default=PROFILE.debug)
 
 ALLOWED_HOSTS = []
 
@@ -37,10 +67,24 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "rest_framework",
+    "rest_framework.authtoken",
+    "channels",
+    "custom_commands",
+    "import_export",
+    "project.tasks",
+]
+
+# Apps created with `manage.py startapp` are listed here.
+PROJECT_APPS = [
 ]
 
+INSTALLED_APPS += PROJECT_APPS
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # 304s from view-set validators only; response bodies are never hashed.
+    "project.api.middleware.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -70,16 +114,267 @@ TEMPLATES = [
 WSGI_APPLICATION = "project.wsgi.application"
 
 
-# Database
-# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Optional integrations
+# Each one is installed only when its profile (or the variable) enables
+# it, so disabled tools cost nothing at startup. Lean startup
+# (project/settings/startup.py) disables all of them.
+API_DOCS_ENABLED = not LEAN_STARTUP and env(
+    "API_DOCS_ENABLED", default=PROFILE.api_docs
+)
 
+if API_DOCS_ENABLED:
+    INSTALLED_APPS += ["drf_spectacular"]
+
+DEBUG_TOOLS_ENABLED = not LEAN_STARTUP and env(
+    "DEBUG_TOOLS_ENABLED", default=PROFILE.debug_tools
+)
+
+if DEBUG_TOOLS_ENABLED and find_spec("django_extensions"):
+    INSTALLED_APPS += ["django_extensions"]
+
+
+# Database
+# Persistent, health-checked connections; see project/db/config.py for the
+# per-engine defaults and the DB_* variables it reads.
 DATABASES = {
+    "default": database_config(
+        env,
+        default_engine=PROFILE.db_engine,
+        default_name=PROFILE.db_name,
+    ),
+}
+
+
+# Profiling
+# Silk records a sample of requests; see project/profiling/sampling.py for
+# the PROFILING_* settings. Set SILK_DB_NAME (and the other SILK_DB_*
+# variables) to keep its tables off the primary database.
+SILK_ENABLED = not LEAN_STARTUP and env(
+    "SILK_ENABLED", default=PROFILE.silk
+)
+
+if SILK_ENABLED:
+    INSTALLED_APPS += ["silk"]
+    MIDDLEWARE += ["silk.middleware.SilkyMiddleware"]
+
+# silk/ shows recorded requests, headers and bodies: staff only outside
+# development.
+SILKY_AUTHENTICATION = SILKY_AUTHORISATION = not DEBUG
+
+PROFILING_SAMPLE_RATE = env(
+    "PROFILING_SAMPLE_RATE", default=PROFILE.profiling_sample_rate
+)
+PROFILING_ALLOW_PATHS = env("PROFILING_ALLOW_PATHS")
+PROFILING_DENY_PATHS = env("PROFILING_DENY_PATHS")
+PROFILING_HEADER = env("PROFILING_HEADER")
+PROFILING_HEADER_TOKEN = env("PROFILING_HEADER_TOKEN")
+
+SILKY_INTERCEPT_FUNC = should_profile
+SILKY_MAX_REQUEST_BODY_SIZE = env("PROFILING_MAX_BODY_SIZE")
+SILKY_MAX_RESPONSE_BODY_SIZE = SILKY_MAX_REQUEST_BODY_SIZE
+SILKY_MAX_RECORDED_REQUESTS = env("PROFILING_MAX_RECORDED_REQUESTS")
+
+if env("SILK_DB_NAME"):
+    DATABASES["silk"] = database_config(env, prefix="SILK_DB")
+
+DATABASE_ROUTERS = ["project.db.routers.SilkRouter"]
+
+
+# Read replicas
+# DB_REPLICAS lists replica aliases; each copies the primary's settings,
+# overridden by its own DB_<ALIAS>_* variables. Views opt into replica
+# reads with `use_read_replica = True` (DB_REPLICA_READS sets the default)
+# and a write pins the request, and the client for DB_REPLICA_PIN_SECONDS,
+# to the primary. DB_REPLICA_SELECTION is round_robin or least_loaded;
+# with DB_REPLICA_MAX_LAG (seconds) lagging replicas are skipped. See
+# project/db/replicas.py.
+DATABASE_REPLICAS = env("DB_REPLICAS")
+DATABASES.update(
+    replica_configs(env, DATABASES["default"], DATABASE_REPLICAS)
+)
+DATABASE_REPLICA_SELECTION = env("DB_REPLICA_SELECTION")
+DATABASE_REPLICA_READS = env("DB_REPLICA_READS")
+DATABASE_REPLICA_PIN_SECONDS = env("DB_REPLICA_PIN_SECONDS")
+DATABASE_REPLICA_MAX_LAG = env("DB_REPLICA_MAX_LAG")
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = env("DB_REPLICA_LAG_CHECK_INTERVAL")
+
+if DATABASE_REPLICA_SELECTION not in ("round_robin", "least_loaded"):
+    raise ImproperlyConfigured(
+        "DB_REPLICA_SELECTION must be round_robin or least_loaded."
+    )
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS += ["project.db.routers.ReplicaRouter"]
+    MIDDLEWARE += ["project.db.middleware.ReplicaMiddleware"]
+
+
+# Query budgets
+# Every request's queries and database time are checked against the
+# QUERY_BUDGET_MAX_* limits (views declare their own with `query_budget`)
+# and offenders are logged or raised with their most repeated SQL; see
+# project/instrumentation. Added after silk so its writes are not counted.
+QUERY_BUDGET = env("QUERY_BUDGET", default=PROFILE.query_budget)
+QUERY_BUDGET_MAX_QUERIES = env("QUERY_BUDGET_MAX_QUERIES")
+QUERY_BUDGET_MAX_TIME_MS = env("QUERY_BUDGET_MAX_TIME_MS")
+QUERY_BUDGET_MAX_DUPLICATES = env("QUERY_BUDGET_MAX_DUPLICATES")
+
+if QUERY_BUDGET != "off":
+    MIDDLEWARE += [
+        "project.instrumentation.middleware.QueryBudgetMiddleware",
+    ]
+
+
+# Metrics
+# Request latency, database time, cache hit ratio and WebSocket message
+# counts, served on /metrics; see project/metrics. Under gunicorn, point
+# METRICS_DIR at a directory shared by the workers (a tmpfs, ideally).
+METRICS_ENABLED = env("METRICS_ENABLED", default=PROFILE.metrics)
+METRICS_DIR = env("METRICS_DIR")
+METRICS_TOKEN = env("METRICS_TOKEN")
+
+if METRICS_ENABLED and not METRICS_TOKEN and not DEBUG:
+    # Outside development, /metrics would be public.
+    raise ImproperlyConfigured(
+        f"Set METRICS_TOKEN to enable metrics in the {PROFILE.name} "
+        "profile."
+    )
+
+if METRICS_ENABLED:
+    # First, so the latency covers every other middleware.
+    MIDDLEWARE = ["project.metrics.middleware.MetricsMiddleware", *MIDDLEWARE]
+
+
+# Cache
+# Redis via django-redis. Values are pickled at the highest protocol and
+# zlib-compressed; IGNORE_EXCEPTIONS turns a Redis outage into cache misses.
+if PROFILE.redis_optional:
+    REDIS_URL = env("REDIS_URL", default="")
+else:
+    REDIS_URL = env("REDIS_URL")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "TIMEOUT": env("CACHE_TIMEOUT"),
+        "KEY_PREFIX": env("CACHE_KEY_PREFIX"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {
+                "max_connections": env("REDIS_MAX_CONNECTIONS"),
+                "retry_on_timeout": True,
+            },
+            "SOCKET_CONNECT_TIMEOUT": env("REDIS_SOCKET_CONNECT_TIMEOUT"),
+            "SOCKET_TIMEOUT": env("REDIS_SOCKET_TIMEOUT"),
+            "COMPRESSOR": env("CACHE_COMPRESSOR"),
+            "SERIALIZER": env("CACHE_SERIALIZER"),
+            "PICKLE_VERSION": -1,
+            "IGNORE_EXCEPTIONS": env("CACHE_IGNORE_EXCEPTIONS"),
+        },
+    }
+}
+
+# Without REDIS_URL (tests, quick local runs) fall back to an in-process
+# cache so nothing needs a Redis server.
+if not REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "project",
+            "TIMEOUT": env("CACHE_TIMEOUT"),
+        }
+    }
+
+
+# Channels
+# WebSocket routing lives in project/routing.py. CHANNEL_LAYER_BACKEND can
+# be switched to channels_redis.pubsub.RedisPubSubChannelLayer, which has
+# lower group fan-out latency but drops messages for absent consumers.
+ASGI_APPLICATION = "project.asgi.application"
+
+CHANNEL_LAYERS = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": env("CHANNEL_LAYER_BACKEND"),
+        "CONFIG": {
+            "hosts": [env("CHANNEL_LAYER_URL") or REDIS_URL],
+            "capacity": env("CHANNEL_LAYER_CAPACITY"),
+            "expiry": env("CHANNEL_LAYER_EXPIRY"),
+        },
     }
 }
 
+# Without Redis, use the in-process layer (single process only).
+if not REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+
+
+# Tasks
+# Slow work goes through project/tasks and runs in `manage.py run_workers`.
+# TASK_BACKEND is redis (the default with REDIS_URL), database or memory
+# (tests); reserved tasks are handed out again if not renewed within
+# TASK_VISIBILITY_TIMEOUT seconds. Workers default to one per CPU.
+TASK_BACKEND = env("TASK_BACKEND") or ("redis" if REDIS_URL else "database")
+TASK_REDIS_URL = env("TASK_REDIS_URL") or REDIS_URL
+TASK_VISIBILITY_TIMEOUT = env("TASK_VISIBILITY_TIMEOUT")
+TASK_MAX_RETRIES = env("TASK_MAX_RETRIES")
+TASK_RETRY_BACKOFF = env("TASK_RETRY_BACKOFF")
+TASK_RETRY_BACKOFF_MAX = env("TASK_RETRY_BACKOFF_MAX")
+TASK_WORKER_CONCURRENCY = env("TASK_WORKER_CONCURRENCY")
+
+if TASK_BACKEND not in ("redis", "database", "memory"):
+    raise ImproperlyConfigured(
+        "TASK_BACKEND must be redis, database or memory."
+    )
+
+
+# Import/export
+# Exports and imports of django-import-export resources stream through
+# project/transfer (`manage.py export_data` / `import_data`) in chunks of
+# IMPORT_EXPORT_CHUNK_SIZE rows, which also sizes the library's own
+# queryset iteration.
+IMPORT_EXPORT_CHUNK_SIZE = env("IMPORT_EXPORT_CHUNK_SIZE")
+
+
+# Outbound HTTP
+# project/http: one pooled session per process with default timeouts
+# (connect, read), jittered retries and a circuit breaker per host. Size
+# the per-host pool to the threads a process runs.
+HTTP_CLIENT_CONNECT_TIMEOUT = env("HTTP_CLIENT_CONNECT_TIMEOUT")
+HTTP_CLIENT_READ_TIMEOUT = env("HTTP_CLIENT_READ_TIMEOUT")
+HTTP_CLIENT_POOL_CONNECTIONS = env("HTTP_CLIENT_POOL_CONNECTIONS")
+HTTP_CLIENT_POOL_MAXSIZE = env("HTTP_CLIENT_POOL_MAXSIZE")
+HTTP_CLIENT_RETRIES = env("HTTP_CLIENT_RETRIES")
+HTTP_CLIENT_BACKOFF = env("HTTP_CLIENT_BACKOFF")
+HTTP_CLIENT_BACKOFF_MAX = env("HTTP_CLIENT_BACKOFF_MAX")
+HTTP_CLIENT_BREAKER_FAILURES = env("HTTP_CLIENT_BREAKER_FAILURES")
+HTTP_CLIENT_BREAKER_RESET = env("HTTP_CLIENT_BREAKER_RESET")
+
+
+# Server
+# manage.py serve (project/server). SERVER_WORKERS=0 derives the worker
+# count from the CPUs; threads apply to WSGI workers. Keep SERVER_KEEPALIVE
+# above the idle timeout of a load balancer in front, or it may reuse a
+# connection the server just closed.
+SERVER_BIND = env("SERVER_BIND")
+SERVER_WORKERS = env("SERVER_WORKERS")
+SERVER_THREADS = env("SERVER_THREADS")
+SERVER_MAX_REQUESTS = env("SERVER_MAX_REQUESTS")
+SERVER_MAX_REQUESTS_JITTER = env("SERVER_MAX_REQUESTS_JITTER")
+SERVER_KEEPALIVE = env("SERVER_KEEPALIVE")
+SERVER_TIMEOUT = env("SERVER_TIMEOUT")
+SERVER_GRACEFUL_TIMEOUT = env("SERVER_GRACEFUL_TIMEOUT")
+SERVER_PIDFILE = env("SERVER_PIDFILE")
+
+
+# Benchmarks
+# manage.py run_benchmarks (benchmarks/). --save writes one JSON file per
+# commit here; --baseline fails when a case is slower by more than
+# BENCHMARK_THRESHOLD (0.15: 15%).
+BENCHMARK_RESULTS_DIR = env("BENCHMARK_RESULTS_DIR")
+BENCHMARK_THRESHOLD = env("BENCHMARK_THRESHOLD")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -105,7 +400,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = "en-us"
 
-TIME_ZONE = "UTC"
+TIME_ZONE = env("TIME_ZONE")
 
 USE_I18N = True
 
@@ -117,7 +412,86 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Storage
+# Static files are collected to STATIC_ROOT under hashed names with gzip and
+# brotli copies (plain storage for the local and test profiles, so neither
+# needs collectstatic); see project/storage/config.py for STATIC_STORAGE,
+# MEDIA_STORAGE and the AWS_* variables of the S3 backends.
+STATIC_ROOT = env("STATIC_ROOT")
+MEDIA_ROOT = env("MEDIA_ROOT")
+MEDIA_URL = env("MEDIA_URL")
+
+STORAGES = storages_config(
+    env,
+    default_static=PROFILE.static_storage,
+    default_media=PROFILE.media_storage,
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Logging
+# Queued to a background thread; the file (logs/, kept out of git) is
+# rotated externally unless LOG_ROTATION says otherwise. The test profile
+# logs to the console. See project/log/config.py for the LOG_* variables.
+LOGGING = logging_config(
+    env,
+    default_level=PROFILE.log_level,
+    default_file=(
+        str(BASE_DIR / "logs" / "django.log") if PROFILE.log_file else ""
+    ),
+)
+
+
+# Django REST framework
+# Keyset pagination, cache-backed throttles and orjson by default; see
+# project/api. Views opt into extra limits with `throttle_scope`, whose
+# rates go in DEFAULT_THROTTLE_RATES.
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "project.api.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": env("API_PAGE_SIZE"),
+    "DEFAULT_RENDERER_CLASSES": [
+        "project.api.renderers.ORJSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "project.api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "project.api.throttling.CacheAnonRateThrottle",
+        "project.api.throttling.CacheUserRateThrottle",
+        "project.api.throttling.CacheScopedRateThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": env("API_THROTTLE_ANON"),
+        "user": env("API_THROTTLE_USER"),
+    },
+}
+
+if PROFILE.browsable_api:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += [
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ]
+
+if API_DOCS_ENABLED:
+    REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = (
+        "drf_spectacular.openapi.AutoSchema"
+    )
+
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Your Project Name",
+    "DESCRIPTION": "Your Project Description",
+    "VERSION": "1.0.0",
+    "SCHEMA_PATH_PREFIX": "/api/",
+}
+
+# The schema is built once per CODE_VERSION (commit SHA or image tag; the
+# checked-out commit when unset) and served from the cache, plus
+# API_SCHEMA_DIR when set; see project/api/schema.py and build_schema.
+CODE_VERSION = env("CODE_VERSION")
+API_SCHEMA_DIR = env("API_SCHEMA_DIR")
+API_SCHEMA_CACHE_TIMEOUT = env("API_SCHEMA_CACHE_TIMEOUT")
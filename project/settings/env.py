@@ -0,0 +1,132 @@
+"""
+The one place settings read the environment.
+
+``.env`` is loaded here, once, whichever profile is selected, and ``env``
+declares the type and default of every variable the settings modules read
+directly, so ``env("REDIS_URL")`` comes back already cast. Defaults that
+differ per environment are passed at the call site from the active
+``Profile`` (see profiles.py). The helpers in project/db, project/log and
+project/storage are handed this same ``env`` and document their own
+variables.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import environ
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+env = environ.Env(
+    # Picks the profile when DJANGO_SETTINGS_MODULE does not name one.
+    DJANGO_PROFILE=(str, ""),
+    # Unset: decided per command, see startup.py.
+    DJANGO_LEAN_STARTUP=(bool, None),
+    DJANGO_SECRET_KEY=str,
+    DJANGO_DEBUG=bool,
+    TIME_ZONE=(str, "Asia/Kolkata"),
+    # Optional integrations
+    SILK_ENABLED=bool,
+    API_DOCS_ENABLED=bool,
+    DEBUG_TOOLS_ENABLED=bool,
+    # Profiling
+    PROFILING_SAMPLE_RATE=float,
+    PROFILING_ALLOW_PATHS=(list, []),
+    PROFILING_DENY_PATHS=(
+        list,
+        ["/static/", "/media/", "/silk/", "/metrics"],
+    ),
+    PROFILING_HEADER=(str, "X-Profile"),
+    PROFILING_HEADER_TOKEN=(str, ""),
+    PROFILING_MAX_BODY_SIZE=(int, 16 * 1024),
+    PROFILING_MAX_RECORDED_REQUESTS=(int, 10**4),
+    SILK_DB_NAME=(str, ""),
+    # Read replicas
+    DB_REPLICAS=(list, []),
+    DB_REPLICA_SELECTION=(str, "round_robin"),
+    DB_REPLICA_READS=(bool, False),
+    DB_REPLICA_PIN_SECONDS=(int, 5),
+    DB_REPLICA_MAX_LAG=(float, 0.0),
+    DB_REPLICA_LAG_CHECK_INTERVAL=(float, 5.0),
+    # Query budgets
+    QUERY_BUDGET=str,
+    QUERY_BUDGET_MAX_QUERIES=(int, 50),
+    QUERY_BUDGET_MAX_TIME_MS=(float, 500.0),
+    QUERY_BUDGET_MAX_DUPLICATES=(int, 10),
+    # Metrics
+    METRICS_ENABLED=bool,
+    METRICS_DIR=(str, ""),
+    METRICS_TOKEN=(str, ""),
+    # Cache
+    REDIS_URL=str,
+    CACHE_TIMEOUT=(int, 300),
+    CACHE_KEY_PREFIX=(str, "project"),
+    REDIS_MAX_CONNECTIONS=(int, 50),
+    REDIS_SOCKET_CONNECT_TIMEOUT=(float, 1.0),
+    REDIS_SOCKET_TIMEOUT=(float, 1.0),
+    CACHE_COMPRESSOR=(str, "django_redis.compressors.zlib.ZlibCompressor"),
+    CACHE_SERIALIZER=(
+        str,
+        "django_redis.serializers.pickle.PickleSerializer",
+    ),
+    CACHE_IGNORE_EXCEPTIONS=(bool, True),
+    # Tasks
+    TASK_BACKEND=(str, ""),
+    TASK_REDIS_URL=(str, ""),
+    TASK_VISIBILITY_TIMEOUT=(int, 300),
+    TASK_MAX_RETRIES=(int, 3),
+    TASK_RETRY_BACKOFF=(float, 2.0),
+    TASK_RETRY_BACKOFF_MAX=(float, 600.0),
+    TASK_WORKER_CONCURRENCY=(int, 0),
+    # Import/export
+    IMPORT_EXPORT_CHUNK_SIZE=(int, 2000),
+    # Outbound HTTP
+    HTTP_CLIENT_CONNECT_TIMEOUT=(float, 3.05),
+    HTTP_CLIENT_READ_TIMEOUT=(float, 10.0),
+    HTTP_CLIENT_POOL_CONNECTIONS=(int, 10),
+    HTTP_CLIENT_POOL_MAXSIZE=(int, 20),
+    HTTP_CLIENT_RETRIES=(int, 3),
+    HTTP_CLIENT_BACKOFF=(float, 0.5),
+    HTTP_CLIENT_BACKOFF_MAX=(float, 10.0),
+    HTTP_CLIENT_BREAKER_FAILURES=(int, 5),
+    HTTP_CLIENT_BREAKER_RESET=(float, 30.0),
+    # Server
+    SERVER_BIND=(str, "0.0.0.0:8000"),
+    SERVER_WORKERS=(int, 0),
+    SERVER_THREADS=(int, 4),
+    SERVER_MAX_REQUESTS=(int, 1000),
+    SERVER_MAX_REQUESTS_JITTER=(int, 100),
+    SERVER_KEEPALIVE=(int, 5),
+    SERVER_TIMEOUT=(int, 30),
+    SERVER_GRACEFUL_TIMEOUT=(int, 30),
+    SERVER_PIDFILE=(
+        str,
+        os.path.join(tempfile.gettempdir(), "project-server.pid"),
+    ),
+    # Benchmarks
+    BENCHMARK_RESULTS_DIR=(
+        str,
+        os.path.join(BASE_DIR, "benchmarks", "results"),
+    ),
+    BENCHMARK_THRESHOLD=(float, 0.15),
+    # Channels
+    CHANNEL_LAYER_BACKEND=(str, "channels_redis.core.RedisChannelLayer"),
+    CHANNEL_LAYER_URL=(str, ""),
+    CHANNEL_LAYER_CAPACITY=(int, 1500),
+    CHANNEL_LAYER_EXPIRY=(int, 10),
+    # Storage
+    STATIC_ROOT=(str, os.path.join(BASE_DIR, "staticfiles")),
+    MEDIA_ROOT=(str, os.path.join(BASE_DIR, "media")),
+    MEDIA_URL=(str, "media/"),
+    # Django REST framework
+    API_PAGE_SIZE=(int, 50),
+    API_THROTTLE_ANON=(str, "100/minute"),
+    API_THROTTLE_USER=(str, "1000/minute"),
+    # API schema
+    CODE_VERSION=(str, ""),
+    API_SCHEMA_DIR=(str, ""),
+    API_SCHEMA_CACHE_TIMEOUT=(int, 7 * 24 * 3600),
+)
+
+environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
@@ -0,0 +1,121 @@
+"""
+Per-environment defaults.
+
+base.py builds every setting once; a ``Profile`` only supplies the
+defaults that differ between environments. Each of them can still be
+overridden through the matching environment variable (noted per field).
+
+The active profile is ``DJANGO_PROFILE`` if set, otherwise the last part of
+``DJANGO_SETTINGS_MODULE`` (``project.settings.qa`` -> ``qa``). Settings
+modules that are not a profile name (a project-specific ``ci.py``, say)
+fall back to ``local``. The ``test`` profile is the one pytest runs with
+(see pyproject.toml); use ``manage.py test --settings=project.settings.test``
+for Django's runner.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import environ
+from django.core.exceptions import ImproperlyConfigured
+
+from project.db.config import POSTGRESQL, SQLITE
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    # DJANGO_DEBUG
+    debug: bool = False
+    # Without DJANGO_SECRET_KEY, generate a throwaway key instead of failing.
+    random_secret_key: bool = False
+    # DB_ENGINE / DB_NAME; None: DB_NAME must be set.
+    db_engine: str = POSTGRESQL
+    db_name: Optional[str] = None
+    # LOG_LEVEL
+    log_level: str = "INFO"
+    # LOG_FILE: logs/django.log, else the console only.
+    log_file: bool = True
+    # SILK_ENABLED / PROFILING_SAMPLE_RATE
+    silk: bool = False
+    profiling_sample_rate: float = 0.01
+    # METRICS_ENABLED: /metrics and the metrics middleware. Profiles
+    # without DEBUG also need METRICS_TOKEN to enable them.
+    metrics: bool = False
+    # QUERY_BUDGET: what requests over their query budget do (off, log or
+    # raise), see project/instrumentation.
+    query_budget: str = "log"
+    # API_DOCS_ENABLED: drf_spectacular, its schema class and URLs.
+    api_docs: bool = True
+    # DEBUG_TOOLS_ENABLED: django_extensions (when installed).
+    debug_tools: bool = False
+    browsable_api: bool = False
+    # Without REDIS_URL, fall back to in-process cache and channel layer.
+    redis_optional: bool = False
+    # STATIC_STORAGE / MEDIA_STORAGE, see project/storage/config.py
+    static_storage: str = "manifest"
+    media_storage: str = "filesystem"
+
+
+PROFILES: Dict[str, Profile] = {
+    "local": Profile(
+        name="local",
+        debug=True,
+        random_secret_key=True,
+        log_level="DEBUG",
+        silk=True,
+        profiling_sample_rate=1.0,
+        metrics=True,
+        query_budget="raise",
+        debug_tools=True,
+        browsable_api=True,
+        redis_optional=True,
+        static_storage="simple",
+    ),
+    "dev": Profile(
+        name="dev",
+        debug=True,
+        log_level="DEBUG",
+        silk=True,
+        profiling_sample_rate=0.1,
+        metrics=True,
+        browsable_api=True,
+    ),
+    "qa": Profile(
+        name="qa",
+        debug=True,
+        silk=True,
+        profiling_sample_rate=0.1,
+        metrics=True,
+        browsable_api=True,
+    ),
+    # Silk records 1% of requests (the default profiling_sample_rate).
+    "production": Profile(name="production", silk=True),
+    # No database server, bucket, collected manifest or Redis needed to
+    # run the tests.
+    "test": Profile(
+        name="test",
+        random_secret_key=True,
+        db_engine=SQLITE,
+        db_name=":memory:",
+        log_file=False,
+        query_budget="raise",
+        redis_optional=True,
+        static_storage="simple",
+        media_storage="temporary",
+    ),
+}
+
+
+def active_profile(env: environ.Env) -> Profile:
+    name: str = env("DJANGO_PROFILE")
+    if name:
+        if name not in PROFILES:
+            raise ImproperlyConfigured(
+                f"Unknown DJANGO_PROFILE '{name}'; "
+                f"expected one of {', '.join(PROFILES)}."
+            )
+        return PROFILES[name]
+    module: str = os.environ.get("DJANGO_SETTINGS_MODULE", "")
+    return PROFILES.get(module.rpartition(".")[2], PROFILES["local"])
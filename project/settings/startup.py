@@ -0,0 +1,53 @@
+"""
+Lean startup for commands that do not serve requests.
+
+Scaffolding commands only read and write source files, and cron-style
+commands only need models. Neither needs the optional integrations
+(silk, drf_spectacular, django_extensions), whose imports dominate cold
+start. When ``lean_startup`` is true base.py leaves them out.
+
+Lean mode is on for the commands in ``LEAN_COMMANDS``, and for anything
+else started with ``DJANGO_LEAN_STARTUP=1`` (e.g. in a crontab).
+``DJANGO_LEAN_STARTUP=0`` turns it off. Of the apps left out only silk
+has models, and none of them reference another app's rows, so deletes
+still cascade exactly as they do in the web process; silk's own tables
+are not reachable in lean mode.
+
+Use ``manage.py startup_profile`` to see where startup time goes.
+"""
+
+import os
+import sys
+from typing import FrozenSet, Optional
+
+import environ
+
+LEAN_COMMANDS: FrozenSet[str] = frozenset(
+    {
+        "add_model",
+        "export_data",
+        "import_data",
+        "make_consumer",
+        "make_custom_command",
+        "make_task",
+        "make_view",
+        "seed_perf",
+        "serve",
+        "serve_report",
+        "set_secret_key",
+        "settings_benchmark",
+        "setup_crud_view",
+        "startapp",
+        "startup_profile",
+    }
+)
+
+
+def lean_startup(env: environ.Env) -> bool:
+    forced: Optional[bool] = env("DJANGO_LEAN_STARTUP")
+    if forced is not None:
+        return forced
+    program: str = os.path.basename(sys.argv[0]) if sys.argv else ""
+    if program not in ("manage.py", "django-admin"):
+        return False
+    return len(sys.argv) > 1 and sys.argv[1] in LEAN_COMMANDS
@@ -0,0 +1,8 @@
+"""
+Settings for test runs.
+
+Everything is defined in base.py; the test defaults are
+PROFILES["test"] in profiles.py.
+"""
+
+from .base import *
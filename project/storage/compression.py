@@ -0,0 +1,95 @@
+"""
+Static files storage that writes precompressed copies at collectstatic time.
+
+Next to every hashed text asset (CSS, JS, SVG, ...) ``collectstatic`` writes
+``<name>.gz`` and, when the ``brotli`` package is installed, ``<name>.br``.
+The web server in front of Django serves those directly (nginx
+``gzip_static on;`` / ``brotli_static on;``), so nothing is compressed per
+request. Hashed names never change content, which is what makes
+``Cache-Control: public, max-age=31536000, immutable`` safe for them.
+"""
+
+import gzip
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Already-compressed formats (images, fonts, archives) are left alone.
+COMPRESSIBLE_EXTENSIONS: Tuple[str, ...] = (
+    ".css",
+    ".js",
+    ".mjs",
+    ".map",
+    ".json",
+    ".svg",
+    ".txt",
+    ".html",
+    ".xml",
+    ".ico",
+    ".ttf",
+    ".otf",
+    ".eot",
+)
+
+
+class CompressedStaticFilesMixin:
+    """Adds gzip/brotli siblings for the files a storage post-processes."""
+
+    # Below this size the compressed copy saves less than a network packet.
+    compress_min_size: int = 256
+    # Keep a compressed copy only if it is at most this fraction of the
+    # original.
+    compress_max_ratio: float = 0.95
+
+    def post_process(
+        self, paths: Dict[str, Any], dry_run: bool = False, **options: Any
+    ) -> Iterator[Tuple[str, Optional[str], Any]]:
+        final_names: Dict[str, str] = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                final_names[name] = hashed_name
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for name in sorted(set(final_names.values())):
+            for compressed_name in self.compress(name):
+                yield compressed_name, compressed_name, True
+
+    def compress(self, name: str) -> Iterator[str]:
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            content: bytes = original.read()
+        if len(content) < self.compress_min_size:
+            return
+
+        variants: Dict[str, bytes] = {
+            # mtime=0 keeps the output byte-identical between deploys.
+            ".gz": gzip.compress(content, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content)
+
+        for suffix, data in variants.items():
+            if len(data) > len(content) * self.compress_max_ratio:
+                continue
+            compressed_name: str = f"{name}{suffix}"
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(data))
+            yield compressed_name
+
+
+class CompressedManifestStaticFilesStorage(
+    CompressedStaticFilesMixin, ManifestStaticFilesStorage
+):
+    """Hashed file names, a manifest, and precompressed variants."""
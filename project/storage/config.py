@@ -0,0 +1,112 @@
+"""
+Builds ``STORAGES`` from environment variables.
+
+``STATIC_STORAGE`` picks how static files are stored:
+
+* ``manifest`` (default) - hashed names plus gzip/brotli copies under
+  ``STATIC_ROOT``, for a web server or CDN to serve with far-future
+  headers (project/storage/compression.py).
+* ``s3`` - hashed, gzip-encoded objects in a bucket with an immutable
+  Cache-Control header (project/storage/s3.py).
+* ``simple`` - Django's plain storage, no collectstatic needed.
+
+``MEDIA_STORAGE`` is ``filesystem`` (default, under ``MEDIA_ROOT``),
+``temporary`` (a directory under the system's temporary directory; the
+``test`` profile's default, so no test needs a bucket) or ``s3``. Both S3
+storages read the ``AWS_*`` variables below.
+
+This module is imported from the settings files, so it must not import
+anything that needs configured settings.
+"""
+
+import os
+import tempfile
+from typing import Any, Dict
+
+import environ
+
+FILESYSTEM: str = "django.core.files.storage.FileSystemStorage"
+STATIC: str = "django.contrib.staticfiles.storage.StaticFilesStorage"
+MANIFEST: str = (
+    "project.storage.compression.CompressedManifestStaticFilesStorage"
+)
+S3_MEDIA: str = "project.storage.s3.MediaS3Storage"
+S3_STATIC: str = "project.storage.s3.StaticS3Storage"
+
+MB: int = 1024 * 1024
+
+
+def _s3_options(env: environ.Env) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "bucket_name": env.str("AWS_STORAGE_BUCKET_NAME"),
+        "region_name": env.str("AWS_S3_REGION_NAME", None),
+        # Set for MinIO/R2/LocalStack and other S3-compatible services.
+        "endpoint_url": env.str("AWS_S3_ENDPOINT_URL", None),
+        "custom_domain": env.str("AWS_S3_CUSTOM_DOMAIN", None),
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _static_storage(env: environ.Env, backend: str) -> Dict[str, Any]:
+    if backend == "s3":
+        return {
+            "BACKEND": S3_STATIC,
+            "OPTIONS": {
+                **_s3_options(env),
+                "location": env.str("AWS_STATIC_LOCATION", "static"),
+                "querystring_auth": False,
+                "file_overwrite": True,
+                "gzip": True,
+                "cache_max_age": env.int("STATIC_CACHE_MAX_AGE", 31536000),
+            },
+        }
+    if backend == "manifest":
+        return {"BACKEND": MANIFEST}
+    return {"BACKEND": STATIC}
+
+
+def _media_storage(env: environ.Env, backend: str) -> Dict[str, Any]:
+    if backend == "s3":
+        return {
+            "BACKEND": S3_MEDIA,
+            "OPTIONS": {
+                **_s3_options(env),
+                "location": env.str("AWS_MEDIA_LOCATION", "media"),
+                "querystring_auth": env.bool("AWS_QUERYSTRING_AUTH", True),
+                # Never silently replace another upload with the same name.
+                "file_overwrite": False,
+                "multipart_threshold": env.int(
+                    "MEDIA_S3_MULTIPART_THRESHOLD", 8 * MB
+                ),
+                "multipart_chunksize": env.int(
+                    "MEDIA_S3_MULTIPART_CHUNKSIZE", 8 * MB
+                ),
+                "max_concurrency": env.int("MEDIA_S3_MAX_CONCURRENCY", 10),
+            },
+        }
+    if backend == "temporary":
+        return {
+            "BACKEND": FILESYSTEM,
+            "OPTIONS": {
+                "location": os.path.join(
+                    tempfile.gettempdir(), "project-test-media"
+                ),
+            },
+        }
+    return {"BACKEND": FILESYSTEM}
+
+
+def storages_config(
+    env: environ.Env,
+    default_static: str = "manifest",
+    default_media: str = "filesystem",
+) -> Dict[str, Dict[str, Any]]:
+    """Return the ``STORAGES`` setting for the current environment."""
+    return {
+        "default": _media_storage(
+            env, env.str("MEDIA_STORAGE", default_media)
+        ),
+        "staticfiles": _static_storage(
+            env, env.str("STATIC_STORAGE", default_static)
+        ),
+    }
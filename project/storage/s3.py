@@ -0,0 +1,65 @@
+"""
+S3-compatible storages (AWS, MinIO, R2, ...) built on django-storages.
+
+Imported only by the ``STORAGES`` backends that name it, so boto3 is needed
+only when a profile actually selects S3.
+"""
+
+from typing import Any, Dict
+
+from boto3.s3.transfer import TransferConfig
+from storages.backends.s3 import S3ManifestStaticStorage, S3Storage
+
+MB: int = 1024 * 1024
+
+
+class MediaS3Storage(S3Storage):
+    """
+    User uploads. Files above ``multipart_threshold`` are uploaded in
+    ``multipart_chunksize`` parts, ``max_concurrency`` parts at a time.
+    """
+
+    def get_default_settings(self) -> Dict[str, Any]:
+        settings: Dict[str, Any] = super().get_default_settings()
+        settings.update(
+            {
+                "multipart_threshold": 8 * MB,
+                "multipart_chunksize": 8 * MB,
+                "max_concurrency": 10,
+            }
+        )
+        return settings
+
+    def __init__(self, **settings: Any) -> None:
+        super().__init__(**settings)
+        if "transfer_config" not in settings:
+            self.transfer_config = TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                multipart_chunksize=self.multipart_chunksize,
+                max_concurrency=self.max_concurrency,
+                use_threads=self.use_threads,
+            )
+
+
+class StaticS3Storage(S3ManifestStaticStorage):
+    """
+    Hashed static files served straight from the bucket (or a CDN in front
+    of it). ``cache_max_age`` becomes a far-future, immutable Cache-Control
+    header on every object except the manifest, which must stay fresh.
+    """
+
+    def get_default_settings(self) -> Dict[str, Any]:
+        settings: Dict[str, Any] = super().get_default_settings()
+        settings["cache_max_age"] = 31536000
+        return settings
+
+    def get_object_parameters(self, name: str) -> Dict[str, Any]:
+        params: Dict[str, Any] = super().get_object_parameters(name)
+        if name == self.manifest_name:
+            params["CacheControl"] = "no-cache"
+        else:
+            params.setdefault(
+                "CacheControl",
+                f"public, max-age={self.cache_max_age}, immutable",
+            )
+        return params
@@ -0,0 +1,113 @@
+"""
+Tests for the precompressed static files storage: ``collectstatic`` runs
+into a temporary ``STATIC_ROOT`` with ``CompressedManifestStaticFilesStorage``
+and the gzip (and, with ``brotli`` installed, brotli) siblings it writes are
+checked.
+"""
+
+import gzip
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from project.storage import compression
+
+# Compressible, well above compress_min_size.
+CSS: bytes = b"".join(
+    b".item-%d { color: #333; margin: 0 auto; }\n" % number
+    for number in range(100)
+)
+FILES: Dict[str, bytes] = {
+    "css/app.css": CSS,
+    # Below compress_min_size.
+    "js/small.js": b"console.log(1);\n",
+    # Compresses well, but PNG is not a compressible extension.
+    "img/logo.png": CSS,
+    # Random bytes: gzip saves less than compress_max_ratio requires.
+    "img/noise.ico": os.urandom(4096),
+}
+
+
+@pytest.fixture
+def collect(settings: Any, tmp_path: Path) -> Any:
+    source: Path = tmp_path / "assets"
+    for name, content in FILES.items():
+        (source / name).parent.mkdir(parents=True, exist_ok=True)
+        (source / name).write_bytes(content)
+    settings.STATIC_ROOT = str(tmp_path / "static")
+    settings.STATICFILES_DIRS = [str(source)]
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder"
+    ]
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "project.storage.compression."
+            "CompressedManifestStaticFilesStorage",
+        },
+    }
+
+    def run() -> Path:
+        call_command("collectstatic", interactive=False, verbosity=0)
+        return tmp_path / "static"
+
+    return run
+
+
+def collected(root: Path, suffix: str) -> List[str]:
+    return sorted(
+        path.relative_to(root).as_posix()
+        for path in root.rglob(f"*{suffix}")
+    )
+
+
+def test_gzip_written_above_min_size(collect: Any):
+    root: Path = collect()
+    hashed: str = staticfiles_storage.stored_name("css/app.css")
+    assert collected(root, ".gz") == [f"{hashed}.gz"]
+    assert gzip.decompress((root / f"{hashed}.gz").read_bytes()) == CSS
+
+
+def test_small_and_incompressible_files_are_skipped(collect: Any):
+    root: Path = collect()
+    compressed: List[str] = collected(root, ".gz") + collected(root, ".br")
+    for name in ("js/small.js", "img/logo.png", "img/noise.ico"):
+        hashed: str = staticfiles_storage.stored_name(name)
+        assert (root / hashed).exists()
+        assert not [item for item in compressed if item.startswith(hashed)]
+
+
+def test_min_size_is_inclusive(collect: Any, monkeypatch: Any):
+    monkeypatch.setattr(
+        compression.CompressedStaticFilesMixin,
+        "compress_min_size",
+        len(CSS) + 1,
+    )
+    assert collected(collect(), ".gz") == []
+    monkeypatch.setattr(
+        compression.CompressedStaticFilesMixin,
+        "compress_min_size",
+        len(CSS),
+    )
+    assert len(collected(collect(), ".gz")) == 1
+
+
+def test_output_is_identical_between_runs(collect: Any):
+    root: Path = collect()
+    [name] = collected(root, ".gz")
+    first: bytes = (root / name).read_bytes()
+    (root / name).unlink()
+    collect()
+    assert (root / name).read_bytes() == first
+
+
+def test_brotli_written_above_min_size(collect: Any):
+    brotli = pytest.importorskip("brotli")
+    root: Path = collect()
+    hashed: str = staticfiles_storage.stored_name("css/app.css")
+    assert collected(root, ".br") == [f"{hashed}.br"]
+    assert brotli.decompress((root / f"{hashed}.br").read_bytes()) == CSS
@@ -0,0 +1,18 @@
+"""
+Background tasks, to keep slow work (exports, outbound HTTP, email) off
+the request path.
+
+Decorate a module-level function with ``@task`` and call ``.delay(...)``
+to enqueue it; ``manage.py run_workers`` runs queued calls in a process
+pool, retrying failures with exponential backoff up to ``max_retries``
+times. Scaffold new tasks with ``manage.py make_task``.
+
+``TASK_BACKEND`` picks the queue: ``redis`` (default when ``REDIS_URL`` is
+set), ``database`` or ``memory`` (tests). See backends.py for how
+messages are reserved and handed out again when a worker dies.
+"""
+
+from .backends import get_queue
+from .base import Task, TaskMessage, task
+
+__all__ = ["Task", "TaskMessage", "get_queue", "task"]
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "project.tasks"
+    # "tasks" is a likely name for a project app.
+    label = "project_tasks"
+    verbose_name = "Task queue"
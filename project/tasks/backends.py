@@ -0,0 +1,388 @@
+"""
+Task queue backends.
+
+Every backend stores ``TaskMessage`` payloads and hands each one to a
+single worker at a time. A reserved message is invisible to other workers
+until its visibility deadline; the worker renews the deadline while the
+task runs (``touch``) and removes the message when done (``ack``), so
+only messages of a worker that died are handed out again.
+
+* ``RedisQueue``: lists and sorted sets, reserved atomically by a Lua
+  script. The default when ``REDIS_URL`` is set.
+* ``DatabaseQueue``: the ``QueuedTask`` table, reserved with
+  ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it.
+* ``InMemoryQueue``: process-local, for tests; ``drain()`` runs what is
+  due inline.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .base import TaskMessage
+
+BACKENDS: Dict[str, str] = {
+    "redis": "project.tasks.backends.RedisQueue",
+    "database": "project.tasks.backends.DatabaseQueue",
+    "memory": "project.tasks.backends.InMemoryQueue",
+}
+
+
+class BaseQueue:
+    # Errors of an unreachable backend; the worker backs off and retries.
+    transient_errors: Tuple[type, ...] = ()
+
+    def push(self, message: TaskMessage, delay: float = 0) -> None:
+        raise NotImplementedError
+
+    def reserve(
+        self, queues: Sequence[str], visibility_timeout: float
+    ) -> Optional[TaskMessage]:
+        """Hand out the next due message of the first non-empty queue."""
+        raise NotImplementedError
+
+    def touch(self, message: TaskMessage, visibility_timeout: float) -> None:
+        raise NotImplementedError
+
+    def ack(self, message: TaskMessage) -> None:
+        raise NotImplementedError
+
+    def retry(
+        self, message: TaskMessage, delay: float, error: str = ""
+    ) -> None:
+        """Make a reserved message due again after ``delay`` seconds."""
+        raise NotImplementedError
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        """Move a reserved message out of the queue for good."""
+        raise NotImplementedError
+
+
+# KEYS: ready list, scheduled zset, processing zset, messages hash.
+# ARGV: now, visibility deadline.
+RESERVE_SCRIPT: str = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, id in ipairs(due) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('LPUSH', KEYS[1], id)
+end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[3], id)
+    redis.call('RPUSH', KEYS[1], id)
+end
+while true do
+    local id = redis.call('RPOP', KEYS[1])
+    if not id then
+        return nil
+    end
+    local payload = redis.call('HGET', KEYS[4], id)
+    if payload then
+        redis.call('ZADD', KEYS[3], ARGV[2], id)
+        return payload
+    end
+end
+"""
+
+
+class RedisQueue(BaseQueue):
+    prefix: str = "tasks"
+    dead_letters: int = 1000
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url or settings.TASK_REDIS_URL)
+        self.transient_errors = (redis.ConnectionError, redis.TimeoutError)
+        self.reserve_script = self.client.register_script(RESERVE_SCRIPT)
+        self.messages_key: str = f"{self.prefix}:messages"
+
+    def _keys(self, queue: str) -> Tuple[str, str, str]:
+        return (
+            f"{self.prefix}:{queue}:ready",
+            f"{self.prefix}:{queue}:scheduled",
+            f"{self.prefix}:{queue}:processing",
+        )
+
+    def push(self, message: TaskMessage, delay: float = 0) -> None:
+        ready, scheduled, _ = self._keys(message.queue)
+        pipe = self.client.pipeline()
+        pipe.hset(self.messages_key, message.id, message.dumps())
+        if delay > 0:
+            pipe.zadd(scheduled, {message.id: time.time() + delay})
+        else:
+            pipe.lpush(ready, message.id)
+        pipe.execute()
+
+    def reserve(
+        self, queues: Sequence[str], visibility_timeout: float
+    ) -> Optional[TaskMessage]:
+        now: float = time.time()
+        for queue in queues:
+            payload: Optional[bytes] = self.reserve_script(
+                keys=[*self._keys(queue), self.messages_key],
+                args=[now, now + visibility_timeout],
+            )
+            if payload is not None:
+                return TaskMessage.loads(payload)
+        return None
+
+    def touch(self, message: TaskMessage, visibility_timeout: float) -> None:
+        _, _, processing = self._keys(message.queue)
+        self.client.zadd(
+            processing,
+            {message.id: time.time() + visibility_timeout},
+            xx=True,
+        )
+
+    def ack(self, message: TaskMessage) -> None:
+        _, _, processing = self._keys(message.queue)
+        pipe = self.client.pipeline()
+        pipe.zrem(processing, message.id)
+        pipe.hdel(self.messages_key, message.id)
+        pipe.execute()
+
+    def retry(
+        self, message: TaskMessage, delay: float, error: str = ""
+    ) -> None:
+        _, scheduled, processing = self._keys(message.queue)
+        pipe = self.client.pipeline()
+        pipe.zrem(processing, message.id)
+        pipe.hset(self.messages_key, message.id, message.dumps())
+        pipe.zadd(scheduled, {message.id: time.time() + delay})
+        pipe.execute()
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        _, _, processing = self._keys(message.queue)
+        dead: str = f"{self.prefix}:dead"
+        pipe = self.client.pipeline()
+        pipe.zrem(processing, message.id)
+        pipe.hdel(self.messages_key, message.id)
+        pipe.lpush(dead, message.dumps())
+        pipe.ltrim(dead, 0, self.dead_letters - 1)
+        pipe.execute()
+
+
+class DatabaseQueue(BaseQueue):
+    transient_errors = (DatabaseError,)
+
+    def _model(self) -> Any:
+        from .models import QueuedTask
+
+        return QueuedTask
+
+    def push(self, message: TaskMessage, delay: float = 0) -> None:
+        self._model().objects.create(
+            id=message.id,
+            queue=message.queue,
+            available_at=timezone.now() + timedelta(seconds=delay),
+            payload=message.dumps(),
+        )
+
+    def reserve(
+        self, queues: Sequence[str], visibility_timeout: float
+    ) -> Optional[TaskMessage]:
+        QueuedTask = self._model()
+        alias: str = router.db_for_write(QueuedTask)
+        # Skipping locked rows lets workers reserve concurrently; without
+        # it (SQLite) writers are serialized anyway.
+        skip_locked: bool = connections[
+            alias
+        ].features.has_select_for_update_skip_locked
+        for queue in queues:
+            with transaction.atomic(using=alias):
+                now = timezone.now()
+                candidate = (
+                    QueuedTask.objects.using(alias)
+                    .select_for_update(skip_locked=skip_locked)
+                    .filter(
+                        queue=queue,
+                        status__in=[
+                            QueuedTask.Status.READY,
+                            QueuedTask.Status.RUNNING,
+                        ],
+                        available_at__lte=now,
+                    )
+                    .order_by("available_at")
+                    .only("id", "payload")
+                    .first()
+                )
+                if candidate is None:
+                    continue
+                QueuedTask.objects.using(alias).filter(
+                    pk=candidate.pk
+                ).update(
+                    status=QueuedTask.Status.RUNNING,
+                    available_at=now + timedelta(seconds=visibility_timeout),
+                )
+                return TaskMessage.loads(candidate.payload)
+        return None
+
+    def touch(self, message: TaskMessage, visibility_timeout: float) -> None:
+        QueuedTask = self._model()
+        QueuedTask.objects.filter(
+            pk=message.id, status=QueuedTask.Status.RUNNING
+        ).update(
+            available_at=timezone.now()
+            + timedelta(seconds=visibility_timeout)
+        )
+
+    def ack(self, message: TaskMessage) -> None:
+        self._model().objects.filter(pk=message.id).delete()
+
+    def retry(
+        self, message: TaskMessage, delay: float, error: str = ""
+    ) -> None:
+        QueuedTask = self._model()
+        QueuedTask.objects.filter(pk=message.id).update(
+            status=QueuedTask.Status.READY,
+            available_at=timezone.now() + timedelta(seconds=delay),
+            payload=message.dumps(),
+            last_error=error,
+        )
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        QueuedTask = self._model()
+        QueuedTask.objects.filter(pk=message.id).update(
+            status=QueuedTask.Status.FAILED,
+            payload=message.dumps(),
+            last_error=error,
+        )
+
+
+class InMemoryQueue(BaseQueue):
+    """
+    Process-local stand-in for tests. ``drain()`` runs due messages
+    through the same retry logic as the workers, inline.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ready: Dict[str, Deque[TaskMessage]] = {}
+        # (due time, tie-breaker, message)
+        self.scheduled: List[Tuple[float, int, TaskMessage]] = []
+        self.processing: Dict[str, Tuple[float, TaskMessage]] = {}
+        self.failed: List[Tuple[TaskMessage, str]] = []
+        self.sequence = itertools.count()
+
+    def _promote(self, now: float) -> None:
+        while self.scheduled and self.scheduled[0][0] <= now:
+            _, _, message = heapq.heappop(self.scheduled)
+            self.ready.setdefault(message.queue, deque()).append(message)
+        for message_id, (deadline, message) in list(self.processing.items()):
+            if deadline <= now:
+                del self.processing[message_id]
+                self.ready.setdefault(message.queue, deque()).appendleft(
+                    message
+                )
+
+    def push(self, message: TaskMessage, delay: float = 0) -> None:
+        # Same serialization as the real backends.
+        message = TaskMessage.loads(message.dumps())
+        with self.lock:
+            if delay > 0:
+                heapq.heappush(
+                    self.scheduled,
+                    (time.time() + delay, next(self.sequence), message),
+                )
+            else:
+                self.ready.setdefault(message.queue, deque()).append(message)
+
+    def reserve(
+        self, queues: Sequence[str], visibility_timeout: float
+    ) -> Optional[TaskMessage]:
+        now: float = time.time()
+        with self.lock:
+            self._promote(now)
+            for queue in queues:
+                pending: Optional[Deque[TaskMessage]] = self.ready.get(queue)
+                if pending:
+                    message: TaskMessage = pending.popleft()
+                    self.processing[message.id] = (
+                        now + visibility_timeout,
+                        message,
+                    )
+                    return message
+        return None
+
+    def touch(self, message: TaskMessage, visibility_timeout: float) -> None:
+        with self.lock:
+            if message.id in self.processing:
+                self.processing[message.id] = (
+                    time.time() + visibility_timeout,
+                    message,
+                )
+
+    def ack(self, message: TaskMessage) -> None:
+        with self.lock:
+            self.processing.pop(message.id, None)
+
+    def retry(
+        self, message: TaskMessage, delay: float, error: str = ""
+    ) -> None:
+        self.ack(message)
+        self.push(message, delay=delay)
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        self.ack(message)
+        with self.lock:
+            self.failed.append((message, error))
+
+    def queues(self) -> List[str]:
+        with self.lock:
+            names = set(self.ready) | {m.queue for _, _, m in self.scheduled}
+        return sorted(names)
+
+    def drain(self, include_scheduled: bool = False) -> int:
+        """
+        Run every due message inline, retries included when their backoff
+        has passed (or always, with ``include_scheduled``). Returns the
+        number of attempts made.
+        """
+        from .worker import handle_result, run_message
+
+        attempts: int = 0
+        while True:
+            if include_scheduled:
+                with self.lock:
+                    for due, sequence, message in self.scheduled:
+                        self.ready.setdefault(message.queue, deque()).append(
+                            message
+                        )
+                    self.scheduled.clear()
+            message: Optional[TaskMessage] = self.reserve(
+                self.queues(), settings.TASK_VISIBILITY_TIMEOUT
+            )
+            if message is None:
+                return attempts
+            attempts += 1
+            handle_result(self, message, run_message(message.dumps()))
+
+
+_queue: Optional[BaseQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> BaseQueue:
+    """The backend named by ``TASK_BACKEND``, created once per process."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = import_string(BACKENDS[settings.TASK_BACKEND])()
+    return _queue
+
+
+def reset_queue() -> None:
+    """Drop the backend, e.g. after overriding ``TASK_BACKEND`` in tests."""
+    global _queue
+    _queue = None
@@ -0,0 +1,141 @@
+import functools
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class TaskMessage:
+    task: str
+    args: List[Any] = field(default_factory=list)
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    queue: str = "default"
+    max_retries: int = 3
+    # Seconds before the first retry, doubled for each further one.
+    retry_backoff: float = 2.0
+    # Failed attempts so far.
+    attempts: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    enqueued_at: float = field(default_factory=time.time)
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, payload: str) -> "TaskMessage":
+        return cls(**json.loads(payload))
+
+    def retry_delay(self) -> float:
+        """Backoff before the next attempt, jittered so retries spread out."""
+        delay: float = min(
+            self.retry_backoff * 2 ** max(self.attempts - 1, 0),
+            settings.TASK_RETRY_BACKOFF_MAX,
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+
+class Task:
+    """
+    A function that can run later on a worker: ``func.delay(*args)``
+    enqueues the call, ``func(*args)`` still runs it inline.
+
+    Arguments travel as JSON, so pass ids rather than model instances.
+    Inside a transaction, enqueue with ``transaction.on_commit`` so the
+    worker never looks for rows that were rolled back or not yet
+    committed.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        queue: str = "default",
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ) -> None:
+        if "<locals>" in func.__qualname__:
+            raise ValueError(
+                f"Task {func.__qualname__} must be defined at module level "
+                "so workers can import it."
+            )
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name: str = f"{func.__module__}.{func.__qualname__}"
+        self.queue = queue
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.func(*args, **kwargs)
+
+    def enqueue(
+        self,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        countdown: float = 0,
+        queue: Optional[str] = None,
+    ) -> TaskMessage:
+        from .backends import get_queue
+
+        message = TaskMessage(
+            task=self.name,
+            args=list(args),
+            kwargs=kwargs or {},
+            queue=queue or self.queue,
+            max_retries=(
+                self._max_retries
+                if self._max_retries is not None
+                else settings.TASK_MAX_RETRIES
+            ),
+            retry_backoff=(
+                self._retry_backoff
+                if self._retry_backoff is not None
+                else settings.TASK_RETRY_BACKOFF
+            ),
+        )
+        # Serialize now: a bad argument fails in the caller, not a worker.
+        get_queue().push(message, delay=countdown)
+        return message
+
+    def delay(self, *args: Any, **kwargs: Any) -> TaskMessage:
+        return self.enqueue(args, kwargs)
+
+
+def task(
+    func: Optional[Callable] = None,
+    *,
+    queue: str = "default",
+    max_retries: Optional[int] = None,
+    retry_backoff: Optional[float] = None,
+) -> Any:
+    """
+    Turn a module-level function into a ``Task``; usable bare (``@task``)
+    or with options (``@task(queue="emails", max_retries=5)``).
+    ``max_retries`` and ``retry_backoff`` default to ``TASK_MAX_RETRIES``
+    and ``TASK_RETRY_BACKOFF``.
+    """
+
+    def decorator(func: Callable) -> Task:
+        return Task(
+            func,
+            queue=queue,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+        )
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def resolve(name: str) -> Task:
+    resolved: Any = import_string(name)
+    if not isinstance(resolved, Task):
+        raise TypeError(f"{name} is not a task.")
+    return resolved
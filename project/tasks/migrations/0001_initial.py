@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedTask',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('queue', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('ready', 'Ready'), ('running', 'Running'), ('failed', 'Failed')], default='ready', max_length=10)),
+                ('available_at', models.DateTimeField()),
+                ('payload', models.TextField()),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queue', 'status', 'available_at'], name='queuedtask_reserve_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class QueuedTask(models.Model):
+    """A message of the database task queue (``TASK_BACKEND=database``)."""
+
+    class Status(models.TextChoices):
+        READY = "ready"
+        RUNNING = "running"
+        FAILED = "failed"
+
+    id = models.CharField(primary_key=True, max_length=32)
+    queue = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.READY
+    )
+    # When a ready task may run, or when a running one is handed out again
+    # because its worker stopped renewing it.
+    available_at = models.DateTimeField()
+    payload = models.TextField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["queue", "status", "available_at"],
+                name="queuedtask_reserve_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id} ({self.status})"
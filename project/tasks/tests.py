@@ -0,0 +1,213 @@
+"""
+Tests for the task queue backends and the retry logic the workers share.
+
+The in-memory and database backends run the same tests; a ``clock``
+fixture stands in for the wall clock both read, so visibility deadlines
+and retry backoffs can be stepped through without sleeping.
+"""
+
+from datetime import UTC, datetime
+from typing import Any, Iterator, List
+
+import pytest
+from django.utils.module_loading import import_string
+
+from project.tasks import backends, task
+from project.tasks.backends import BACKENDS, BaseQueue, get_queue
+from project.tasks.base import TaskMessage
+from project.tasks.models import QueuedTask
+from project.tasks.worker import handle_result
+
+CALLS: List[Any] = []
+
+
+@task
+def record(value: Any) -> None:
+    CALLS.append(value)
+
+
+@task(max_retries=2, retry_backoff=1.0)
+def flaky(value: Any) -> None:
+    CALLS.append(value)
+    if CALLS.count(value) < 3:
+        raise RuntimeError("Not yet.")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.now, tz=UTC)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(backends.time, "time", clock.time)
+    monkeypatch.setattr(backends.timezone, "now", clock.datetime)
+    return clock
+
+
+@pytest.fixture(params=["memory", "database"])
+def queue(request: pytest.FixtureRequest, clock: Clock) -> BaseQueue:
+    if request.param == "database":
+        request.getfixturevalue("db")
+    return import_string(BACKENDS[request.param])()
+
+
+@pytest.fixture
+def no_jitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    # retry_delay() scales the backoff by uniform(0.5, 1.0).
+    monkeypatch.setattr("project.tasks.base.random.uniform", lambda a, b: b)
+
+
+@pytest.fixture
+def memory_backend(transactional_db: None, settings: Any) -> Iterator[None]:
+    # Tasks run as on a worker, closing the connection around each one;
+    # that must not end a test transaction.
+    settings.TASK_BACKEND = "memory"
+    backends.reset_queue()
+    CALLS.clear()
+    yield
+    backends.reset_queue()
+
+
+def message(**kwargs: Any) -> TaskMessage:
+    return TaskMessage(task=record.name, args=[1], **kwargs)
+
+
+def test_message_is_reserved_once(queue: BaseQueue):
+    first, second = message(), message()
+    queue.push(first)
+    queue.push(second)
+    reserved = [queue.reserve(["default"], 60) for _ in range(3)]
+    assert [item and item.id for item in reserved] == [
+        first.id,
+        second.id,
+        None,
+    ]
+
+
+def test_queues_are_reserved_in_order(queue: BaseQueue):
+    queue.push(message(queue="low"))
+    high = message(queue="high")
+    queue.push(high)
+    assert queue.reserve(["high", "low"], 60).id == high.id
+
+
+def test_delayed_message_waits(queue: BaseQueue, clock: Clock):
+    queue.push(message(), delay=10)
+    assert queue.reserve(["default"], 60) is None
+    clock.advance(10)
+    assert queue.reserve(["default"], 60) is not None
+
+
+def test_expired_reservation_is_handed_out_again(
+    queue: BaseQueue, clock: Clock
+):
+    queued = message()
+    queue.push(queued)
+    assert queue.reserve(["default"], 30).id == queued.id
+    clock.advance(29)
+    assert queue.reserve(["default"], 30) is None
+    # The worker stopped renewing it, e.g. because it died.
+    clock.advance(1)
+    assert queue.reserve(["default"], 30).id == queued.id
+
+
+def test_touch_extends_the_reservation(queue: BaseQueue, clock: Clock):
+    queue.push(message())
+    reserved = queue.reserve(["default"], 30)
+    clock.advance(20)
+    queue.touch(reserved, 30)
+    clock.advance(20)
+    assert queue.reserve(["default"], 30) is None
+    clock.advance(10)
+    assert queue.reserve(["default"], 30).id == reserved.id
+
+
+def test_acked_message_is_gone(queue: BaseQueue, clock: Clock):
+    queue.push(message())
+    queue.ack(queue.reserve(["default"], 30))
+    clock.advance(60)
+    assert queue.reserve(["default"], 30) is None
+
+
+def test_retry_backoff_doubles_until_failed(
+    queue: BaseQueue, clock: Clock, no_jitter: None
+):
+    queue.push(message(max_retries=2, retry_backoff=2.0))
+    for delay in (2.0, 4.0):
+        reserved = queue.reserve(["default"], 60)
+        handle_result(queue, reserved, (False, "Traceback"))
+        clock.advance(delay - 0.5)
+        assert queue.reserve(["default"], 60) is None
+        clock.advance(0.5)
+    reserved = queue.reserve(["default"], 60)
+    # The attempts travel with the message.
+    assert reserved.attempts == 2
+    handle_result(queue, reserved, (False, "Traceback"))
+    clock.advance(3600)
+    assert queue.reserve(["default"], 60) is None
+
+
+def test_retry_backoff_is_capped(settings: Any, no_jitter: None):
+    settings.TASK_RETRY_BACKOFF_MAX = 5.0
+    assert message(retry_backoff=2.0, attempts=1).retry_delay() == 2.0
+    assert message(retry_backoff=2.0, attempts=3).retry_delay() == 5.0
+
+
+def test_retry_delay_is_jittered():
+    delays = {
+        message(retry_backoff=2.0, attempts=2).retry_delay()
+        for _ in range(20)
+    }
+    assert len(delays) > 1
+    assert all(2.0 <= delay <= 4.0 for delay in delays)
+
+
+@pytest.mark.django_db
+def test_database_keeps_failed_messages(clock: Clock):
+    queue = backends.DatabaseQueue()
+    queue.push(message(max_retries=0))
+    handle_result(queue, queue.reserve(["default"], 60), (False, "Boom"))
+    failed = QueuedTask.objects.get()
+    assert (failed.status, failed.last_error) == ("failed", "Boom")
+
+
+def test_delay_runs_through_the_memory_backend(memory_backend: None):
+    record.delay({"id": 1})
+    assert CALLS == []
+    assert get_queue().drain() == 1
+    assert CALLS == [{"id": 1}]
+
+
+def test_drain_retries_until_success(memory_backend: None):
+    flaky.delay("a")
+    assert get_queue().drain(include_scheduled=True) == 3
+    assert CALLS == ["a", "a", "a"]
+    assert get_queue().failed == []
+
+
+def test_drain_gives_up_after_max_retries(memory_backend: None):
+    memory = get_queue()
+    memory.push(TaskMessage(task=flaky.name, args=["b"], max_retries=1))
+    assert memory.drain(include_scheduled=True) == 2
+    [(failed, error)] = memory.failed
+    assert (failed.args, failed.attempts) == (["b"], 2)
+    assert "RuntimeError: Not yet." in error
+
+
+def test_tasks_must_be_module_level():
+    def local() -> None:
+        pass
+
+    with pytest.raises(ValueError, match="module level"):
+        task(local)
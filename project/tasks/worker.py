@@ -0,0 +1,223 @@
+import logging
+import signal
+import time
+import traceback
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.db import close_old_connections
+
+from .backends import BaseQueue
+from .base import TaskMessage, resolve
+
+logger = logging.getLogger(__name__)
+
+Result = Tuple[bool, str]
+
+# Longest pause between polls while the queue backend keeps failing; a
+# stop request waits for it.
+MAX_ERROR_BACKOFF: float = 10.0
+
+
+def init_process() -> None:
+    """Set up Django in a freshly spawned pool process."""
+    import django
+
+    # The parent decides when to stop; Ctrl-C must not kill running tasks.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def run_message(payload: str) -> Result:
+    """Run one message; the outcome comes back as ``(ok, traceback)``."""
+    message: TaskMessage = TaskMessage.loads(payload)
+    close_old_connections()
+    try:
+        resolve(message.task).func(*message.args, **message.kwargs)
+    except Exception:
+        return False, traceback.format_exc()
+    finally:
+        close_old_connections()
+    return True, ""
+
+
+def handle_result(
+    queue: BaseQueue, message: TaskMessage, result: Result
+) -> None:
+    ok, error = result
+    if ok:
+        queue.ack(message)
+        return
+    message.attempts += 1
+    if message.attempts > message.max_retries:
+        queue.fail(message, error)
+        logger.error(
+            "Task %s (%s) failed after %d attempts:\n%s",
+            message.task,
+            message.id,
+            message.attempts,
+            error,
+        )
+        return
+    delay: float = message.retry_delay()
+    queue.retry(message, delay, error)
+    logger.warning(
+        "Task %s (%s) failed, retry %d/%d in %.1f s:\n%s",
+        message.task,
+        message.id,
+        message.attempts,
+        message.max_retries,
+        delay,
+        error,
+    )
+
+
+class Worker:
+    """
+    Reserves messages in this process and runs them in a pool of
+    ``concurrency`` spawned processes, renewing the visibility deadline of
+    running messages every third of ``visibility_timeout``. While the
+    queue backend is unreachable it keeps the running tasks going and
+    polls again after a growing pause (up to ``MAX_ERROR_BACKOFF``).
+    """
+
+    def __init__(
+        self,
+        queue: BaseQueue,
+        queues: Sequence[str],
+        concurrency: int,
+        visibility_timeout: float,
+        poll_interval: float = 1.0,
+        max_tasks_per_child: Optional[int] = None,
+    ) -> None:
+        self.queue = queue
+        self.queues: List[str] = list(queues)
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.max_tasks_per_child = max_tasks_per_child
+        self.stopping: bool = False
+        self.processed: int = 0
+        # future -> (message, when its deadline was last renewed)
+        self.running: Dict[Future, List[Any]] = {}
+
+    def stop(self, *args: Any) -> None:
+        if not self.stopping:
+            logger.info("Stopping after %d running tasks", len(self.running))
+        self.stopping = True
+
+    def _executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            # Spawned, not forked: no inherited connections, sockets or
+            # logging threads.
+            mp_context=get_context("spawn"),
+            initializer=init_process,
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    def _fill(self, executor: ProcessPoolExecutor) -> None:
+        while not self.stopping and len(self.running) < self.concurrency:
+            message: Optional[TaskMessage] = self.queue.reserve(
+                self.queues, self.visibility_timeout
+            )
+            if message is None:
+                return
+            future: Future = executor.submit(run_message, message.dumps())
+            self.running[future] = [message, time.monotonic()]
+
+    def _collect(self, futures: Sequence[Future]) -> bool:
+        """Handle finished futures; ``False`` if the pool broke."""
+        healthy: bool = True
+        for future in futures:
+            message, _ = self.running.pop(future)
+            try:
+                result: Result = future.result()
+            except BrokenProcessPool:
+                # A process died mid-task (OOM killer, segfault).
+                healthy = False
+                result = (False, "The worker process died mid-task.")
+            try:
+                handle_result(self.queue, message, result)
+            except self.queue.transient_errors:
+                # The message stays reserved and is handed out again once
+                # its visibility deadline passes.
+                logger.warning(
+                    "Could not record the result of task %s (%s)",
+                    message.task,
+                    message.id,
+                    exc_info=True,
+                )
+            self.processed += 1
+        return healthy
+
+    def _renew(self) -> None:
+        now: float = time.monotonic()
+        for entry in self.running.values():
+            if now - entry[1] >= self.visibility_timeout / 3:
+                try:
+                    self.queue.touch(entry[0], self.visibility_timeout)
+                except self.queue.transient_errors:
+                    # Retried on the next poll.
+                    logger.warning(
+                        "Could not renew task %s (%s)",
+                        entry[0].task,
+                        entry[0].id,
+                        exc_info=True,
+                    )
+                    continue
+                entry[1] = now
+
+    def run(self, burst: bool = False) -> int:
+        """Work until stopped (or, with ``burst``, until queues are empty)."""
+        executor: ProcessPoolExecutor = self._executor()
+        idle: float = 0.0
+        # Pause before the next poll while the backend is unreachable.
+        backoff: float = 0.0
+        try:
+            while True:
+                # Drop connections that broke or outlived CONN_MAX_AGE, as
+                # Django does around every request.
+                close_old_connections()
+                try:
+                    self._fill(executor)
+                except self.queue.transient_errors:
+                    backoff = min(
+                        max(backoff * 2, self.poll_interval),
+                        MAX_ERROR_BACKOFF,
+                    )
+                    logger.warning(
+                        "Queue backend unavailable, polling again in %.1f s",
+                        backoff,
+                        exc_info=True,
+                    )
+                else:
+                    backoff = 0.0
+                if not self.running:
+                    if self.stopping or (burst and not backoff):
+                        break
+                    # Back off while the queues stay empty.
+                    idle = min(max(idle * 2, 0.05), self.poll_interval)
+                    time.sleep(backoff or idle)
+                    continue
+                idle = 0.0
+                done, _ = wait(
+                    list(self.running),
+                    timeout=backoff or self.poll_interval,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not self._collect(list(done)):
+                    self._collect(list(self.running))
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = self._executor()
+                self._renew()
+        finally:
+            executor.shutdown(wait=True)
+        return self.processed
@@ -0,0 +1,33 @@
+"""
+Streaming export and chunked import for django-import-export resources.
+
+``resource.export()`` and ``resource.import_data()`` hold the whole
+dataset (and the rendered file) in memory, which does not survive
+tables with millions of rows. This package keeps memory flat:
+
+* ``StreamingExport`` renders a queryset as CSV or JSON Lines while it is
+  read with ``iterator(chunk_size=...)``; ``.response()`` is a
+  ``StreamingHttpResponse`` and ``StreamingExportMixin`` adds it to the
+  admin as actions.
+* ``import_stream`` parses a file lazily and upserts it with
+  ``ResourceBulkService`` (a ``BulkWriteService``), one batch per
+  transaction.
+
+Both run from ``manage.py export_data`` / ``import_data`` and, for files
+in the default storage, as the tasks in ``project.transfer.tasks``.
+"""
+
+from .admin import StreamingExportMixin
+from .export import StreamingExport
+from .imports import ImportResult, ResourceBulkService, import_stream
+from .resources import get_resource, guess_format
+
+__all__ = [
+    "ImportResult",
+    "ResourceBulkService",
+    "StreamingExport",
+    "StreamingExportMixin",
+    "get_resource",
+    "guess_format",
+    "import_stream",
+]
@@ -0,0 +1,382 @@
+import csv
+import functools
+import itertools
+import json
+import operator
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from import_export.resources import ModelResource
+from import_export.widgets import ForeignKeyWidget, ManyToManyWidget
+
+from project.services import BulkWriteService
+
+from .resources import FORMATS
+
+
+def read_rows(stream: TextIO, fmt: str = "csv") -> Iterator[Dict[str, Any]]:
+    """Parse ``stream`` lazily, one dict per CSV row or JSON line."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(
+            f"Unknown format '{fmt}'; use one of {', '.join(FORMATS)}."
+        )
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    written: int = 0
+    # (row number, message); only the first ``max_errors`` are kept.
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    error_count: int = 0
+    # Many-to-many columns left out with ``skip_m2m``.
+    ignored_columns: List[str] = field(default_factory=list)
+    max_errors: int = 100
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row, message))
+
+
+@dataclass
+class ManyToManyColumn:
+    """A many-to-many column and the through table it is written to."""
+
+    resource_field: Any
+    through: type[models.Model]
+    # Through table columns of the imported and of the related model.
+    owner: str
+    related: str
+
+
+class ResourceBulkService(BulkWriteService):
+    """
+    Upserts rows cleaned by an import-export resource, ``batch_size`` at a
+    time, on the resource's ``import_id_fields``.
+
+    Values go through the resource's widgets as in ``import_data()``, but
+    rows are never collected: memory stays flat however large the file.
+    Foreign keys given as primary keys are checked with one query per
+    chunk instead of one per row. Rows that fail to clean are skipped and
+    reported in ``result``.
+
+    Many-to-many columns replace the relations of each row, as
+    ``ManyToManyWidget`` does, with a few queries per chunk on the through
+    table; values naming no related row are left out, as the widget does.
+    ``m2m_changed`` is not sent. A through model with fields of its own
+    cannot be filled from a column: such resources need ``skip_m2m``,
+    which leaves every many-to-many column out (``ignored_columns``).
+    Per-row resource hooks (``before_import_row``, ``skip_row``, ...) are
+    not applied; use ``import_data()`` where those matter.
+    """
+
+    def __init__(
+        self,
+        resource: ModelResource,
+        batch_size: Optional[int] = None,
+        using: Optional[str] = None,
+        skip_m2m: bool = False,
+    ) -> None:
+        self.resource = resource
+        self.model = resource._meta.model
+        super().__init__(batch_size=batch_size, using=using)
+        self.unique_fields = [
+            resource.fields[name].attribute
+            for name in resource.get_import_id_fields()
+        ]
+        self.fields: List[Any] = []
+        self.many: List[ManyToManyColumn] = []
+        self.result = ImportResult()
+        for resource_field in resource.get_import_fields():
+            if not resource_field.attribute or resource_field.readonly:
+                continue
+            if isinstance(resource_field.widget, ManyToManyWidget):
+                if skip_m2m:
+                    self.result.ignored_columns.append(
+                        resource_field.column_name
+                    )
+                else:
+                    self.many.append(self.many_to_many(resource_field))
+                continue
+            self.fields.append(resource_field)
+        self.columns: Set[str] = set()
+        # The chunk being written and its many-to-many cells by row number.
+        self.pending: List[Tuple[int, models.Model]] = []
+        self.cells: Dict[int, Dict[str, Any]] = {}
+
+    def many_to_many(self, resource_field: Any) -> ManyToManyColumn:
+        model_field: Any = self.model._meta.get_field(
+            resource_field.attribute
+        )
+        through: type[models.Model] = model_field.remote_field.through
+        if not through._meta.auto_created:
+            raise ValueError(
+                f"{resource_field.column_name}: {through._meta.label} has "
+                "fields of its own; import it separately and skip the "
+                "many-to-many columns here."
+            )
+        return ManyToManyColumn(
+            resource_field,
+            through,
+            through._meta.get_field(model_field.m2m_field_name()).attname,
+            through._meta.get_field(
+                model_field.m2m_reverse_field_name()
+            ).attname,
+        )
+
+    def is_key(self, resource_field: Any) -> bool:
+        """Whether the column holds the related primary key itself."""
+        widget: Any = resource_field.widget
+        return (
+            isinstance(widget, ForeignKeyWidget)
+            and getattr(widget, "key_is_id", False)
+            and widget.field == "pk"
+            and not widget.use_natural_foreign_keys
+        )
+
+    def get_update_fields(self) -> List[str]:
+        if self.update_fields:
+            return list(self.update_fields)
+        update_fields: List[str] = [
+            resource_field.attribute
+            for resource_field in self.fields
+            if resource_field.column_name in self.columns
+            and resource_field.attribute not in self.unique_fields
+        ]
+        # bulk_create() sets auto_now fields, but only updates what it is
+        # told to.
+        update_fields += [
+            model_field.name
+            for model_field in self.model._meta.concrete_fields
+            if getattr(model_field, "auto_now", False)
+            and model_field.name not in update_fields
+        ]
+        return update_fields
+
+    def to_instance(self, row: Dict[str, Any]) -> models.Model:
+        instance: models.Model = self.model()
+        for resource_field in self.fields:
+            column: str = resource_field.column_name
+            if column not in row:
+                continue
+            try:
+                if self.is_key(resource_field):
+                    value: Any = row[column]
+                    setattr(
+                        instance,
+                        resource_field.attribute,
+                        resource_field.widget.model._meta.pk.to_python(value)
+                        if value not in (None, "")
+                        else None,
+                    )
+                else:
+                    resource_field.save(instance, row)
+            except Exception as error:
+                # Widgets raise ValueError, ValidationError, DoesNotExist
+                # and friends for bad values.
+                raise ValueError(
+                    f"{column}: {type(error).__name__}: {error}"
+                ) from error
+        return instance
+
+    def check_keys(
+        self, chunk: List[Tuple[int, models.Model]]
+    ) -> List[Tuple[int, models.Model]]:
+        """Drop rows whose foreign keys point at missing rows."""
+        for resource_field in self.fields:
+            if resource_field.column_name not in self.columns:
+                continue
+            if not self.is_key(resource_field):
+                continue
+            attribute: str = resource_field.attribute
+            keys: Set[Any] = {
+                getattr(instance, attribute) for _, instance in chunk
+            } - {None}
+            if not keys:
+                continue
+            related: Any = resource_field.widget.model
+            found: Set[Any] = set(
+                related._default_manager.using(self.using)
+                .filter(pk__in=keys)
+                .values_list("pk", flat=True)
+            )
+            kept: List[Tuple[int, models.Model]] = []
+            for number, instance in chunk:
+                key: Any = getattr(instance, attribute)
+                if key is None or key in found:
+                    kept.append((number, instance))
+                else:
+                    self.result.add_error(
+                        number,
+                        f"{resource_field.column_name}: "
+                        f"{related._meta.object_name} {key} does not exist.",
+                    )
+            chunk = kept
+        return chunk
+
+    def chunks(
+        self, rows: Iterable[Dict[str, Any]]
+    ) -> Iterator[List[models.Model]]:
+        iterator: Iterator[Dict[str, Any]] = iter(rows)
+        while rows_chunk := list(itertools.islice(iterator, self.batch_size)):
+            chunk: List[Tuple[int, models.Model]] = []
+            self.cells = {}
+            for row in rows_chunk:
+                self.result.rows += 1
+                try:
+                    chunk.append((self.result.rows, self.to_instance(row)))
+                except ValueError as error:
+                    self.result.add_error(self.result.rows, str(error))
+                    continue
+                self.cells[self.result.rows] = {
+                    column.resource_field.column_name: row[
+                        column.resource_field.column_name
+                    ]
+                    for column in self.many
+                    if column.resource_field.column_name in row
+                }
+            chunk = self.check_keys(chunk)
+            if chunk:
+                self.result.written += len(chunk)
+                self.pending = chunk
+                yield [instance for _, instance in chunk]
+
+    def primary_keys(self, chunk: List[models.Model]) -> List[Any]:
+        """
+        The primary keys of ``chunk`` once written, looked up by
+        ``unique_fields`` where the backend did not return them.
+        """
+        missing: List[models.Model] = [
+            instance for instance in chunk if instance.pk is None
+        ]
+        if missing:
+            attnames: List[str] = [
+                self.model._meta.get_field(name).attname
+                for name in self.unique_fields
+            ]
+            manager: Any = self.model._default_manager.using(self.using)
+
+            def key(instance: models.Model) -> Tuple[Any, ...]:
+                return tuple(getattr(instance, name) for name in attnames)
+
+            found: Dict[Tuple[Any, ...], Any] = {}
+            # Bounded, so no database hits its expression depth limit.
+            for start in range(0, len(missing), 100):
+                condition: models.Q = functools.reduce(
+                    operator.or_,
+                    (
+                        models.Q(**dict(zip(attnames, key(instance))))
+                        for instance in missing[start : start + 100]
+                    ),
+                )
+                for *values, pk in manager.filter(condition).values_list(
+                    *attnames, "pk"
+                ):
+                    found[tuple(values)] = pk
+            for instance in missing:
+                instance.pk = found.get(key(instance))
+        return [instance.pk for instance in chunk]
+
+    def related_keys(self, column: ManyToManyColumn, value: Any) -> List[Any]:
+        """The values of a many-to-many cell, as ``ManyToManyWidget`` reads."""
+        if value is None or value == "":
+            return []
+        items: Iterable[Any] = (
+            value
+            if isinstance(value, list)
+            else str(value).split(column.resource_field.widget.separator)
+        )
+        return [str(item).strip() for item in items if str(item).strip()]
+
+    def after_write(self, chunk: List[models.Model]) -> None:
+        if not self.many:
+            return
+        keys: List[Any] = self.primary_keys(chunk)
+        for column in self.many:
+            name: str = column.resource_field.column_name
+            owners: Dict[Any, List[Any]] = {
+                pk: self.related_keys(column, self.cells[number][name])
+                for (number, _), pk in zip(self.pending, keys)
+                if pk is not None and name in self.cells[number]
+            }
+            if not owners:
+                continue
+            widget: Any = column.resource_field.widget
+            related: Any = widget.model
+            lookup_field: models.Field = (
+                related._meta.pk
+                if widget.field == "pk"
+                else related._meta.get_field(widget.field)
+            )
+            values: Dict[str, Any] = {}
+            for cell in owners.values():
+                for key in cell:
+                    try:
+                        values[key] = lookup_field.to_python(key)
+                    except ValidationError:
+                        continue
+            found: Dict[Any, Any] = dict(
+                related._default_manager.using(self.using)
+                .filter(**{f"{widget.field}__in": set(values.values())})
+                .values_list(widget.field, "pk")
+            )
+            manager: Any = column.through._default_manager.using(self.using)
+            manager.filter(**{f"{column.owner}__in": list(owners)}).delete()
+            manager.bulk_create(
+                [
+                    column.through(
+                        **{column.owner: pk, column.related: related_pk}
+                    )
+                    for pk, cell in owners.items()
+                    for related_pk in dict.fromkeys(
+                        found[values[key]]
+                        for key in cell
+                        if key in values and values[key] in found
+                    )
+                ],
+                batch_size=self.batch_size,
+            )
+
+    def import_rows(self, rows: Iterable[Dict[str, Any]]) -> ImportResult:
+        iterator: Iterator[Dict[str, Any]] = iter(rows)
+        first: Optional[Dict[str, Any]] = next(iterator, None)
+        if first is None:
+            return self.result
+        # Only columns present in the file are overwritten on conflict.
+        self.columns = set(first)
+        self.upsert(itertools.chain([first], iterator))
+        return self.result
+
+
+def import_stream(
+    resource: ModelResource,
+    stream: TextIO,
+    fmt: str = "csv",
+    batch_size: Optional[int] = None,
+    using: Optional[str] = None,
+    skip_m2m: bool = False,
+) -> ImportResult:
+    """Upsert every row of ``stream`` through ``resource``."""
+    service = ResourceBulkService(
+        resource, batch_size=batch_size, using=using, skip_m2m=skip_m2m
+    )
+    return service.import_rows(read_rows(stream, fmt))
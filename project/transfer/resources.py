@@ -0,0 +1,76 @@
+import os
+from typing import Any, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils.module_loading import import_string
+from import_export.resources import ModelResource, modelresource_factory
+
+FORMATS: Tuple[str, ...] = ("csv", "jsonl")
+
+
+def guess_format(path: str, fmt: Optional[str] = None) -> str:
+    """``fmt`` if given, else the extension of ``path`` (``.ndjson`` too)."""
+    if fmt is None:
+        extension: str = os.path.splitext(path)[1].lstrip(".").lower()
+        fmt = {"ndjson": "jsonl", "json": "jsonl"}.get(extension, extension)
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unknown format '{fmt}'; use one of {', '.join(FORMATS)}."
+        )
+    return fmt
+
+
+def get_resource(spec: str) -> ModelResource:
+    """
+    A resource instance from a dotted path to a ``ModelResource``
+    (``blog.resources.ArticleResource``) or a model label
+    (``blog.Article``), which gets the default resource of the model.
+    """
+    if spec.count(".") == 1:
+        try:
+            model: type[models.Model] = apps.get_model(spec)
+        except (LookupError, ValueError):
+            pass
+        else:
+            return modelresource_factory(model)()
+    try:
+        resource_class: Any = import_string(spec)
+    except ImportError:
+        raise ValueError(
+            f"'{spec}' is neither a model label nor a resource path."
+        ) from None
+    if not (
+        isinstance(resource_class, type)
+        and issubclass(resource_class, ModelResource)
+    ):
+        raise ValueError(f"{spec} is not a ModelResource.")
+    return resource_class()
+
+
+def related_lookups(
+    resource: ModelResource, fields: List[Any]
+) -> Tuple[List[str], List[str]]:
+    """
+    ``select_related`` and ``prefetch_related`` lookups covering the
+    relations ``fields`` read, so exporting a row costs no extra queries.
+    """
+    model: type[models.Model] = resource._meta.model
+    select: List[str] = []
+    prefetch: List[str] = []
+    for field in fields:
+        if not field.attribute:
+            continue
+        name: str = field.attribute.split("__")[0]
+        try:
+            model_field: Any = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Properties, methods and dehydrate_* fields.
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(name)
+        elif model_field.is_relation and name != model_field.attname:
+            # ``author_id`` (the key itself) needs no join, ``author`` does.
+            select.append(name)
+    return select, prefetch
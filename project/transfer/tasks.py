@@ -0,0 +1,72 @@
+import io
+import logging
+import tempfile
+from typing import Optional
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from project.tasks import task
+
+from .export import StreamingExport
+from .imports import import_stream
+from .resources import get_resource, guess_format
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def export_to_storage(
+    spec: str,
+    name: str,
+    fmt: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> str:
+    """
+    Export ``spec`` (a model label or resource path) to ``name`` in the
+    default storage, so the file is reachable from any worker. Returns
+    the name the storage actually used.
+    """
+    export = StreamingExport(
+        get_resource(spec), fmt=guess_format(name, fmt), chunk_size=chunk_size
+    )
+    # Spooled to local disk first: storages upload from a file object.
+    with tempfile.TemporaryFile("w+b") as spool:
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        export.write_to(text)
+        text.flush()
+        spool.seek(0)
+        saved: str = default_storage.save(name, File(spool, name=name))
+        text.detach()
+    logger.info("Exported %d %s rows to %s", export.rows, spec, saved)
+    return saved
+
+
+@task
+def import_from_storage(
+    spec: str,
+    name: str,
+    fmt: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    skip_m2m: bool = False,
+) -> None:
+    """Upsert the rows of ``name`` in the default storage into ``spec``."""
+    with default_storage.open(name, "rb") as stored:
+        stream = io.TextIOWrapper(stored, encoding="utf-8", newline="")
+        result = import_stream(
+            get_resource(spec),
+            stream,
+            fmt=guess_format(name, fmt),
+            batch_size=batch_size,
+            skip_m2m=skip_m2m,
+        )
+        stream.detach()
+    logger.info(
+        "Imported %d of %d %s rows from %s (%d errors)",
+        result.written,
+        result.rows,
+        spec,
+        name,
+        result.error_count,
+        extra={"errors": result.errors},
+    )
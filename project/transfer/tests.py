@@ -0,0 +1,117 @@
+"""
+Round trips through ``export_data`` and ``import_data``, on ``auth.Group``
+and its many-to-many ``permissions``.
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+
+from project.transfer import get_resource, import_stream
+
+
+def snapshot() -> Dict[str, List[str]]:
+    return {
+        group.name: sorted(
+            group.permissions.values_list("codename", flat=True)
+        )
+        for group in Group.objects.prefetch_related("permissions")
+    }
+
+
+@pytest.fixture
+def groups(db: None) -> Dict[str, List[str]]:
+    permissions: List[Permission] = list(Permission.objects.order_by("pk"))
+    for number in range(5):
+        group = Group.objects.create(name=f"group{number}")
+        group.permissions.set(permissions[number : number * 3])
+    return snapshot()
+
+
+def run(*args: Any) -> str:
+    output = io.StringIO()
+    call_command(*args, stdout=output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_round_trip_restores_many_to_many(
+    groups: Dict[str, List[str]], tmp_path: Path, fmt: str
+):
+    path: Path = tmp_path / f"groups.{fmt}"
+    run("export_data", "auth.Group", f"--output={path}")
+    Group.objects.all().delete()
+
+    output: str = run("import_data", "auth.Group", str(path), "--batch-size=2")
+    assert "Imported 5 of 5 rows (0 skipped)." in output
+    assert snapshot() == groups
+    # group0 has none.
+    assert [name for name, codenames in groups.items() if not codenames] == [
+        "group0"
+    ]
+
+
+def test_import_replaces_relations(groups: Dict[str, List[str]]):
+    kept: Permission = Permission.objects.order_by("pk").last()
+    group: Group = Group.objects.get(name="group4")
+    rows: str = "\n".join(
+        [
+            json.dumps(
+                {"id": group.pk, "name": "group4", "permissions": str(kept.pk)}
+            ),
+            json.dumps({"id": 100, "name": "new", "permissions": ""}),
+        ]
+    )
+    result = import_stream(
+        get_resource("auth.Group"), io.StringIO(rows), fmt="jsonl"
+    )
+    assert (result.written, result.error_count) == (2, 0)
+    assert list(group.permissions.all()) == [kept]
+    assert not Group.objects.get(name="new").permissions.exists()
+    # Rows not in the file keep their relations.
+    assert snapshot()["group3"] == groups["group3"]
+
+
+def test_unknown_related_keys_are_left_out(groups: Dict[str, List[str]]):
+    kept: Permission = Permission.objects.order_by("pk").first()
+    group: Group = Group.objects.get(name="group1")
+    rows: str = (
+        f'id,name,permissions\n{group.pk},group1,"{kept.pk}, 999999, x"\n'
+    )
+    result = import_stream(get_resource("auth.Group"), io.StringIO(rows))
+    assert result.error_count == 0
+    assert list(group.permissions.all()) == [kept]
+
+
+def test_queries_do_not_grow_with_rows(
+    groups: Dict[str, List[str]], django_assert_max_num_queries: Any
+):
+    permission: Permission = Permission.objects.first()
+    rows: str = "id,name,permissions\n" + "".join(
+        f"{number},bulk{number},{permission.pk}\n"
+        for number in range(1, 201)
+    )
+    # Per chunk: the upsert, the related keys, delete and insert on the
+    # through table, plus savepoints.
+    with django_assert_max_num_queries(8):
+        result = import_stream(
+            get_resource("auth.Group"), io.StringIO(rows), batch_size=200
+        )
+    assert result.written == 200
+    assert Group.objects.filter(permissions=permission).count() == 200
+
+
+def test_skip_m2m_leaves_relations_alone(
+    groups: Dict[str, List[str]], tmp_path: Path
+):
+    group: Group = Group.objects.get(name="group1")
+    path: Path = tmp_path / "groups.csv"
+    path.write_text(f"id,name,permissions\n{group.pk},renamed,\n")
+    output: str = run("import_data", "auth.Group", str(path), "--skip-m2m")
+    assert "Ignored many-to-many columns: permissions." in output
+    assert snapshot()["renamed"] == groups["group1"]
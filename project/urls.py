@@ -15,20 +15,37 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.apps import apps
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("silk/", include("silk.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
-    ),
 ]
+
+if settings.METRICS_ENABLED:
+    from project.metrics.views import metrics_view
+
+    urlpatterns += [path("metrics", metrics_view, name="metrics")]
+
+# API docs only exist when the profile installs drf_spectacular
+# (API_DOCS_ENABLED).
+if apps.is_installed("drf_spectacular"):
+    from drf_spectacular.views import SpectacularRedocView
+
+    from project.api.schema import CachedSpectacularAPIView
+
+    urlpatterns += [
+        path(
+            "api/schema/", CachedSpectacularAPIView.as_view(), name="schema"
+        ),
+        path(
+            "api/redoc/",
+            SpectacularRedocView.as_view(url_name="schema"),
+            name="redoc",
+        ),
+    ]
+
+if apps.is_installed("silk"):
+    urlpatterns += [path("silk/", include("silk.urls", namespace="silk"))]
@@ -0,0 +1,47 @@
+"""
+Identifies the deployed code, for caches that must not outlive a deploy.
+
+``code_version()`` is ``settings.CODE_VERSION`` (set ``CODE_VERSION`` to
+the commit SHA or image tag in the deploy), else the commit checked out in
+``BASE_DIR``, else the time this process started, which at least changes
+on every restart.
+"""
+
+import functools
+import time
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+_STARTED: int = int(time.time())
+
+
+def _git_commit(base_dir: Path) -> Optional[str]:
+    git_dir: Path = base_dir / ".git"
+    try:
+        head: str = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref: str = head[len("ref: ") :]
+        ref_file: Path = git_dir / ref
+        if ref_file.exists():
+            return ref_file.read_text().strip()
+        # Refs packed by `git gc` live in a single file.
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            if line.endswith(f" {ref}"):
+                return line.split(" ", 1)[0]
+    except OSError:
+        return None
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    configured: str = getattr(settings, "CODE_VERSION", "")
+    if configured:
+        return configured
+    commit: Optional[str] = _git_commit(Path(settings.BASE_DIR))
+    if commit:
+        return commit[:12]
+    return f"started-{_STARTED}"
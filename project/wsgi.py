@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings.local")
+# Servers import this module: default to production, so a deploy that
+# forgets DJANGO_SETTINGS_MODULE never serves DEBUG settings. manage.py
+# (runserver included) picks the local settings before getting here.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings.production")
 
 application = get_wsgi_application()